@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""compares the list and Vector/Matrix code paths of tripp.algebra
+
+    PYTHONPATH=.:tripp python benchmarks/bench_algebra.py
+"""
+from __future__ import print_function
+import random
+import timeit
+from tripp import algebra
+
+VECTOR_SIZE = 10 ** 6
+MATRIX_ROWS, MATRIX_COLS = 10 ** 5, 100
+
+
+def best_of(fn, repeat=3):
+    """the fastest of repeat single runs of fn, in seconds"""
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def compare(name, fn, list_args, array_args):
+    as_lists = best_of(lambda: fn(*list_args))
+    as_arrays = best_of(lambda: fn(*array_args))
+    print("{0:<18}{1:>10.4f}s{2:>10.4f}s{3:>9.1f}x"
+          .format(name, as_lists, as_arrays, as_lists / as_arrays))
+
+
+def main():
+    random.seed(0)
+    v = [random.random() for _ in range(VECTOR_SIZE)]
+    w = [random.random() for _ in range(VECTOR_SIZE)]
+    rows = [[random.random() for _ in range(MATRIX_COLS)]
+            for _ in range(MATRIX_ROWS)]
+    v_, w_, rows_ = algebra.Vector(v), algebra.Vector(w), algebra.Matrix(rows)
+
+    print("{0:<18}{1:>11}{2:>11}{3:>10}"
+          .format("", "list", "Vector", "speedup"))
+    compare("vector_add", algebra.vector_add, (v, w), (v_, w_))
+    compare("scalar_multiply", algebra.scalar_multiply, (3.0, v), (3.0, v_))
+    compare("dot", algebra.dot, (v, w), (v_, w_))
+    compare("squared_distance", algebra.squared_distance, (v, w), (v_, w_))
+    compare("vector_sum", algebra.vector_sum, (rows,), (rows_,))
+    compare("vector_mean", algebra.vector_mean, (rows,), (rows_,))
+    compare("get_column", algebra.get_column, (rows, 7), (rows_, 7))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""compares tripp.probability.inverse_normal_cdf with the bisection
+search it replaced, one value at a time and as an array
+
+    PYTHONPATH=.:tripp python benchmarks/bench_inverse_normal_cdf.py [n]
+"""
+from __future__ import print_function
+import sys
+import time
+import numpy as np
+from tripp import probability
+
+
+def bisection_inverse_normal_cdf(p, tolerance=0.00001):
+    """the previous implementation: binary search on normal_cdf"""
+    low_z = -10.0
+    hi_z = 10.0
+    while hi_z - low_z > tolerance:
+        mid_z = (low_z + hi_z) / 2
+        mid_p = probability.normal_cdf(mid_z)
+        if mid_p < p:
+            low_z = mid_z
+        elif mid_p > p:
+            hi_z = mid_z
+        else:
+            break
+    return mid_z
+
+
+def timed(name, fn, baseline=None):
+    start = time.time()
+    result = fn()
+    elapsed = time.time() - start
+    speedup = "" if baseline is None else "{0:>9.1f}x".format(
+        baseline / elapsed)
+    print("{0:<34}{1:>10.3f}s{2}".format(name, elapsed, speedup))
+    return elapsed, result
+
+
+def main(n):
+    ps = np.random.RandomState(0).uniform(1e-12, 1 - 1e-12, n)
+    values = ps.tolist()
+    print("{0} probabilities".format(n))
+    baseline, bisected = timed(
+        "bisection, per value",
+        lambda: [bisection_inverse_normal_cdf(p) for p in values])
+    timed("closed form, per value",
+          lambda: [probability.inverse_normal_cdf(p) for p in values],
+          baseline)
+    timed("closed form (1e-7), per value",
+          lambda: [probability.inverse_normal_cdf(p, tolerance=1e-7)
+                   for p in values],
+          baseline)
+    _, exact = timed("closed form, array",
+                     lambda: probability.inverse_normal_cdf(ps), baseline)
+    timed("closed form (1e-7), array",
+          lambda: probability.inverse_normal_cdf(ps, tolerance=1e-7),
+          baseline)
+    print("largest bisection error: {0:.2e}"
+          .format(np.max(np.abs(np.array(bisected) - exact))))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
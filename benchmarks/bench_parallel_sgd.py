@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""wall-clock time for tripp.parallel_sgd.minimize_parallel to bring a
+linear regression's loss within 0.1% of the least-squares optimum, at
+1, 2, 4 and 8 workers, lock-free and with periodic averaging
+
+    PYTHONPATH=.:tripp python benchmarks/bench_parallel_sgd.py [num_rows]
+"""
+from __future__ import print_function
+import os
+import sys
+import time
+import numpy as np
+from tripp import multiple_regression
+from tripp import parallel_sgd
+
+WORKERS = [1, 2, 4, 8]
+NUM_FEATURES = 20
+
+
+def problem(num_rows):
+    stream = np.random.RandomState(0)
+    x = np.column_stack([np.ones(num_rows),
+                         stream.normal(size=(num_rows, NUM_FEATURES))])
+    beta = stream.normal(size=NUM_FEATURES + 1)
+    y = x.dot(beta) + stream.normal(scale=0.5, size=num_rows)
+    return x, y
+
+
+def main(num_rows):
+    x, y = problem(num_rows)
+    optimum = multiple_regression.squared_error_batch(
+        x, y, np.linalg.lstsq(x, y)[0])
+    target = 1.001 * optimum
+    print("{0} rows, {1} features, {2} cores; target loss {3:.6g}"
+          .format(num_rows, NUM_FEATURES, os.sysconf('SC_NPROCESSORS_ONLN'),
+                  target))
+
+    for mode, kwargs in [(parallel_sgd.HOGWILD, {}),
+                         (parallel_sgd.AVERAGING, {'sync_every': 64})]:
+        baseline = None
+        for workers in WORKERS:
+            started = time.time()
+            _, report = parallel_sgd.minimize_parallel(
+                multiple_regression.squared_error_batch,
+                multiple_regression.squared_error_batch_gradient,
+                x, y, np.zeros(x.shape[1]), 0.002, workers=workers,
+                mode=mode, batch_size=64, target_value=target, seed=0,
+                full_output=True, **kwargs)
+            elapsed = time.time() - started
+            baseline = baseline or elapsed
+            print("{0:<10}{1:>3} workers{2:>10.3f}s{3:>8.2f}x"
+                  "{4:>4} epochs  loss/optimum {5:.5f}"
+                  .format(mode, workers, elapsed, baseline / elapsed,
+                          report.iterations, report.value / optimum))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2 * 10 ** 6)
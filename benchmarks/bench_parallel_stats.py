@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""times tripp.parallel_stats.summarize at 1, 2, 4 and 8 workers,
+on an in-memory array and on a file with one number per line
+
+    PYTHONPATH=.:tripp python benchmarks/bench_parallel_stats.py [num_values]
+"""
+from __future__ import print_function
+import os
+import sys
+import tempfile
+import timeit
+import numpy as np
+from tripp import parallel_stats
+
+WORKERS = [1, 2, 4, 8]
+
+
+def best_of(fn, repeat=3):
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def scaling(name, data, chunk_size):
+    baseline = None
+    for workers in WORKERS:
+        elapsed = best_of(lambda: parallel_stats.summarize(
+            data, workers=workers, chunk_size=chunk_size))
+        baseline = baseline or elapsed
+        print("{0:<8}{1:>4} workers{2:>10.3f}s{3:>8.2f}x"
+              .format(name, workers, elapsed, baseline / elapsed))
+
+
+def main(num_values):
+    values = np.random.RandomState(0).standard_normal(num_values)
+    print("{0} values, {1} cores".format(num_values,
+                                         os.sysconf('SC_NPROCESSORS_ONLN')))
+    scaling("array", values, num_values // 32)
+
+    handle, path = tempfile.mkstemp(suffix=".txt")
+    try:
+        with os.fdopen(handle, "w") as f:
+            np.savetxt(f, values)
+        scaling("file", path, os.path.getsize(path) // 32)
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4 * 10 ** 6)
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""micro-benchmarks of tripp's numeric hot paths
+
+Every case is run at a sweep of input sizes, each in a fresh child
+process, and reports operations per second and the peak memory the
+case added (setup included). Results are written to a JSON file and
+can be compared with a stored baseline from an earlier run:
+
+    PYTHONPATH=.:tripp python benchmarks/suite.py --save-baseline
+    ... change something ...
+    PYTHONPATH=.:tripp python benchmarks/suite.py --output results.json
+
+The second run exits with status 1 if any case got slower than the
+baseline by more than --threshold (default 10%). Either run exits
+with status 1 if any case failed to run.
+"""
+from __future__ import division, print_function
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import timeit
+import numpy as np
+from tripp import algebra
+from tripp import gradient
+from tripp import probability
+from tripp import stats
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "baseline.json")
+SIZES = [10 ** 2, 10 ** 4, 10 ** 6]
+QUICK_SIZES = [10 ** 2, 10 ** 3]
+
+
+def random_list(size, seed=0):
+    rng = random.Random(seed)
+    return [rng.random() for _ in range(size)]
+
+
+def random_pair(size):
+    return random_list(size, 0), random_list(size, 1)
+
+
+def random_rows(size, num_cols=10):
+    """about size numbers, as rows of num_cols"""
+    rng = random.Random(0)
+    return [[rng.random() for _ in range(num_cols)]
+            for _ in range(max(1, size // num_cols))]
+
+
+def as_vectors(lists):
+    return [algebra.Vector(v) for v in lists]
+
+
+def probabilities(size):
+    return [(i + 0.5) / size for i in range(size)]
+
+
+def apply_to_each(fn):
+    """a benchmark of fn over each of a list of scalars"""
+    return lambda xs: [fn(x) for x in xs]
+
+
+# each case is (name, setup: size -> argument tuple, function to time)
+CASES = [
+    ("algebra.dot", random_pair, algebra.dot),
+    ("algebra.dot[Vector]",
+     lambda n: as_vectors(random_pair(n)), algebra.dot),
+    ("algebra.distance", random_pair, algebra.distance),
+    ("algebra.distance[Vector]",
+     lambda n: as_vectors(random_pair(n)), algebra.distance),
+    ("algebra.vector_sum", lambda n: (random_rows(n),), algebra.vector_sum),
+    ("algebra.vector_sum[Matrix]",
+     lambda n: (algebra.Matrix(random_rows(n)),), algebra.vector_sum),
+    ("stats.variance", lambda n: (random_list(n),), stats.variance),
+    ("stats.correlation", random_pair, stats.correlation),
+    ("stats.quantile", lambda n: (random_list(n), 0.9), stats.quantile),
+    ("probability.normal_cdf",
+     lambda n: ([4 * x - 2 for x in random_list(n)],),
+     apply_to_each(probability.normal_cdf)),
+    ("probability.inverse_normal_cdf",
+     lambda n: (probabilities(n),),
+     apply_to_each(probability.inverse_normal_cdf)),
+    ("gradient.step",
+     lambda n: (random_list(n), random_list(n, 1), -0.01), gradient.step),
+]
+
+
+def _peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def measure(setup, fn, size, min_time=0.2, repeat=3):
+    """ops/sec (best of repeat) and peak memory added, in kilobytes"""
+    rss_before = _peak_rss_kb()
+    args = setup(size)
+    timer = timeit.Timer(lambda: fn(*args))
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 10 ** 6:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    best = min([elapsed] + timer.repeat(repeat - 1, number))
+    return {"ops_per_sec": number / best,
+            "peak_memory_kb": _peak_rss_kb() - rss_before}
+
+
+def _measure_in_child(connection, setup, fn, size, min_time):
+    connection.send(measure(setup, fn, size, min_time))
+    connection.close()
+
+
+def run(cases, sizes, min_time=0.2):
+    """{case[size]: measurements}, each measured in its own process;
+    a case whose process fails is reported as {"failed": exit code}"""
+    results = {}
+    for name, setup, fn in cases:
+        for size in sizes:
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            child = multiprocessing.Process(
+                target=_measure_in_child,
+                args=(sender, setup, fn, size, min_time))
+            child.start()
+            # so that recv sees end of file if the child dies
+            sender.close()
+            key = "{0}[n={1}]".format(name, size)
+            try:
+                measured = receiver.recv()
+            except EOFError:
+                measured = None
+            receiver.close()
+            child.join()
+            if measured is None:
+                results[key] = {"failed": child.exitcode}
+                print("{0:<44}FAILED (exit code {1})".format(
+                    key, child.exitcode))
+                continue
+            results[key] = measured
+            print("{0:<44}{1:>14.1f} ops/s{2:>10} KB".format(
+                key, results[key]["ops_per_sec"],
+                results[key]["peak_memory_kb"]))
+    return results
+
+
+def failures(results):
+    """the keys of the cases that failed to run"""
+    return sorted(key for key, measured in results.items()
+                  if "failed" in measured)
+
+
+def compare(results, baseline, threshold=0.1):
+    """(key, baseline ops/sec, current ops/sec) for every case that
+    is more than threshold slower than in baseline"""
+    regressions = []
+    for key, measured in sorted(results.items()):
+        if "failed" in measured:
+            continue
+        if key in baseline and "failed" not in baseline[key]:
+            before = baseline[key]["ops_per_sec"]
+            after = measured["ops_per_sec"]
+            if after < before * (1 - threshold):
+                regressions.append((key, before, after))
+    return regressions
+
+
+def environment():
+    return {"python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results to the baseline file")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--filter", default="",
+                        help="only run cases whose name contains this")
+    parser.add_argument("--quick", action="store_true",
+                        help="small sizes only, for a smoke test")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    options = parser.parse_args(argv)
+
+    cases = [case for case in CASES if options.filter in case[0]]
+    sizes = QUICK_SIZES if options.quick else SIZES
+    results = run(cases, sizes, options.min_time)
+
+    report = {"environment": environment(), "results": results}
+    path = options.baseline if options.save_baseline else options.output
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    failed = failures(results)
+    if options.save_baseline or not os.path.exists(options.baseline):
+        return 1 if failed else 0
+    with open(options.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, options.threshold)
+    for key, before, after in regressions:
+        print("REGRESSION {0}: {1:.1f} -> {2:.1f} ops/s ({3:+.0%})"
+              .format(key, before, after, after / before - 1))
+    return 1 if regressions or failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
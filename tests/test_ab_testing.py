@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import random
+import unittest
+
+from .context import tripp
+from tripp import ab_testing
+from tripp import hypothesis
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+class TestABTesting(unittest.TestCase):
+
+    def test_z_score_matches_hypothesis(self):
+        """ab_testing -- running z-score equals a_b_test_statistic"""
+        experiment = ab_testing.Experiment()
+        for i in range(1000):
+            experiment.record('A', i % 5 == 0)
+            experiment.record('B', i % 50 < 9)
+        self.assertAlmostEqual(
+            hypothesis.a_b_test_statistic(1000, 200, 1000, 180),
+            experiment.z_score())
+        self.assertEqual(0.0, ab_testing.Experiment().z_score())
+        self.assertEqual(1.0, ab_testing.Experiment().always_valid_p_value())
+
+    def test_posterior(self):
+        """ab_testing -- Beta posterior summary of an arm"""
+        arm = ab_testing.Arm(100, 20)
+        posterior = arm.posterior()
+        self.assertEqual((21, 81), (posterior['alpha'], posterior['beta']))
+        self.assertAlmostEqual(21 / 102.0, posterior['mean'])
+        self.assertTrue(posterior['lower'] < 0.2 < posterior['upper'])
+
+    def test_peeking_is_safe(self):
+        """ab_testing -- always-valid p-value survives repeated peeks"""
+        random.seed(0)
+        naive = valid = 0
+        for _ in range(100):
+            experiment = ab_testing.Experiment()
+            naive_rejected = valid_rejected = False
+            for i in range(1, 2001):
+                experiment.record('AB'[i % 2], random.random() < 0.2)
+                if i % 50 == 0:
+                    naive_rejected |= experiment.p_value() < 0.05
+                    valid_rejected |= experiment.should_stop(0.05)
+            naive += naive_rejected
+            valid += valid_rejected
+        self.assertTrue(naive > 10)
+        self.assertTrue(valid <= 5)
+
+    def test_checking_changes_nothing(self):
+        """ab_testing -- the always-valid p-value ignores when it is read"""
+        random.seed(2)
+        events = [('AB'[i % 2], random.random() < 0.2 + 0.05 * (i % 2))
+                  for i in range(4000)]
+        peeked, unpeeked = ab_testing.Experiment(), ab_testing.Experiment()
+        for arm, clicked in events:
+            peeked.record(arm, clicked)
+            peeked.should_stop()
+            unpeeked.record(arm, clicked)
+        self.assertEqual(peeked.always_valid_p_value(),
+                         unpeeked.always_valid_p_value())
+        self.assertEqual(peeked.snapshot(), unpeeked.snapshot())
+        self.assertTrue(unpeeked.always_valid_p_value() < 1.0)
+
+    def test_detects_real_effect(self):
+        """ab_testing -- sequential test stops on a real difference"""
+        random.seed(1)
+        experiment = ab_testing.Experiment()
+        for _ in range(20000):
+            experiment.record('A', random.random() < 0.20)
+            experiment.record('B', random.random() < 0.25)
+        self.assertTrue(experiment.should_stop(0.01))
+
+    def test_registry_snapshot_and_restore(self):
+        """ab_testing -- registry ingests events and round-trips state"""
+        registry = ab_testing.ExperimentRegistry()
+        registry.add('button')
+        registry.add('banner', control='old', treatment='new')
+        events = ([('button', 'AB'[i % 2], i % 3 == 0) for i in range(30)] +
+                  [('banner', 'new', True), ('banner', 'old', False)])
+        self.assertEqual(32, registry.ingest(iter(events)))
+        state = json.loads(json.dumps(registry.snapshot()))
+        restored = ab_testing.ExperimentRegistry.restore(state)
+        self.assertEqual(registry.summaries(), restored.summaries())
+        self.assertEqual(15, restored.experiments['button'].arms['A'].trials)
+        self.assertEqual([], restored.finished())
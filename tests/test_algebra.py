@@ -5,6 +5,7 @@ import unittest
 
 from .context import tripp
 from tripp import algebra
+import numpy
 
 
 class TestAlgebra(unittest.TestCase):
@@ -82,6 +83,13 @@ class TestAlgebra(unittest.TestCase):
         """algebra -- get column"""
         result = algebra.get_column(self.matrix_a, 1)
 
+        class Table(list):
+            """for testing: rows with an unrelated column method"""
+            def column(self, name):
+                raise AssertionError("not a ColumnStore")
+        self.assertEqual([2, 5], algebra.get_column(Table([[1, 2], [4, 5]]),
+                                                    1))
+
     def test_mk_matrix(self):
         """algebra -- make matrix"""
         is_diagonal = lambda i, j: 1 if i == j else 0
@@ -96,3 +104,77 @@ class TestAlgebra(unittest.TestCase):
             [0, 0, 0, 0, 1]
         ]
         self.assertEqual(expected, identity_m)
+
+    def test_vector_functions_accept_vectors(self):
+        """algebra -- Vector arguments"""
+        a, b = algebra.Vector(self.a), algebra.Vector(self.b)
+        added = algebra.vector_add(a, self.b)
+        self.assertTrue(isinstance(added, algebra.Vector))
+        self.assertEqual([130, 310], added.tolist())
+        self.assertEqual([-4, -10],
+                         algebra.vector_subtract(a, b).tolist())
+        self.assertEqual([567.0, 1350.0],
+                         algebra.scalar_multiply(9, a).tolist())
+        self.assertEqual(28221.0, algebra.dot(a, b))
+        self.assertEqual(116.0, algebra.squared_distance(a, b))
+
+    def test_vector_sum_of_vectors(self):
+        """algebra -- vector sum of Vectors"""
+        vecs = [algebra.Vector(v) for v in (self.c, self.a, self.b)]
+        summed = algebra.vector_sum(iter(vecs))
+        self.assertTrue(isinstance(summed, algebra.Vector))
+        self.assertEqual([230, 410], summed.tolist())
+        self.assertEqual([230, 410],
+                         algebra.vector_sum(algebra.Matrix(vecs)).tolist())
+
+    def test_matrix(self):
+        """algebra -- Matrix rows and columns"""
+        m = algebra.Matrix(self.matrix_a)
+        self.assertEqual((2, 3), algebra.shape(m))
+        self.assertTrue(isinstance(algebra.get_row(m, 1), algebra.Vector))
+        self.assertEqual([2, 5], algebra.get_column(m, 1).tolist())
+        self.assertEqual([2.5, 3.5, 4.5], algebra.vector_mean(m).tolist())
+        self.assertRaises(ValueError, algebra.Matrix, [1, 2, 3])
+
+    def test_transpose(self):
+        """algebra -- transpose"""
+        expected = [[1, 4], [2, 5], [3, 6]]
+        self.assertEqual(expected, algebra.transpose(self.matrix_a))
+        result = algebra.transpose(algebra.Matrix(self.matrix_a),
+                                   block_rows=4)
+        self.assertEqual(expected, result.tolist())
+
+    def test_matvec(self):
+        """algebra -- matrix-vector product"""
+        v = [1, 0, -1]
+        self.assertEqual([-2, -2], algebra.matvec(self.matrix_a, v))
+        result = algebra.matvec(algebra.Matrix(self.matrix_a), v,
+                                block_rows=1)
+        self.assertEqual([-2, -2], result.tolist())
+
+    def test_matrix_multiply(self):
+        """algebra -- matrix multiply"""
+        b = [[1, 0], [0, 1], [1, 1]]
+        expected = [[4, 5], [10, 11]]
+        self.assertEqual(expected,
+                         algebra.matrix_multiply(self.matrix_a, b))
+        result = algebra.matrix_multiply(algebra.Matrix(self.matrix_a), b,
+                                         block_rows=1)
+        self.assertEqual(expected, result.tolist())
+        self.assertRaises(ValueError, algebra.matrix_multiply,
+                          algebra.Matrix(self.matrix_a),
+                          algebra.Matrix(self.matrix_a))
+        self.assertRaises(ValueError, algebra.matrix_multiply,
+                          self.matrix_a, self.matrix_a)
+
+    def test_gram_matrix(self):
+        """algebra -- gram matrix"""
+        expected = [[17, 22, 27], [22, 29, 36], [27, 36, 45]]
+        self.assertEqual(expected, algebra.gram_matrix(self.matrix_a))
+        result = algebra.gram_matrix(algebra.Matrix(self.matrix_a),
+                                     block_rows=1)
+        self.assertEqual(expected, result.tolist())
+        wide = numpy.random.RandomState(0).normal(size=(300, 150))
+        result = algebra.gram_matrix(wide, block_rows=64)
+        self.assertTrue(numpy.allclose(wide.T.dot(wide), result))
+        self.assertTrue((result == result.T).all())
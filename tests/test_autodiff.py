@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import math
+import unittest
+
+from .context import tripp
+from tripp import autodiff
+from tripp import gradient
+from tripp import logistic_regression
+from tripp import multiple_regression
+from tripp import regression
+import numpy
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+def rosenbrock(v):
+    """for testing"""
+    return sum(100 * (v[i + 1] - v[i] ** 2) ** 2 + (1 - v[i]) ** 2
+               for i in range(len(v) - 1))
+
+
+def everything(v):
+    """for testing: one of each operation"""
+    return (autodiff.exp(v).sum() + autodiff.log(v[0]) +
+            autodiff.sqrt(v[1]) * autodiff.tanh(v[2]) +
+            autodiff.dot(autodiff.logistic(v), v) + abs(v[1]) / v[2] +
+            2 ** v[0] - v[1] ** v[0] + (3 - v).sum() +
+            autodiff.logaddexp(v[0], 2 * v[2]) + v.T.dot(v))
+
+
+def central_difference(f, v, h=1e-6):
+    """for testing"""
+    v = numpy.array(v, dtype=float)
+    partials = []
+    for j in range(len(v)):
+        step = numpy.zeros(len(v))
+        step[j] = h
+        partials.append((f(v + step) - f(v - step)) / (2 * h))
+    return partials
+
+
+class TestAutodiff(unittest.TestCase):
+
+    def setUp(self):
+        stream = numpy.random.RandomState(0)
+        self.x = numpy.column_stack([numpy.ones(50),
+                                     stream.normal(size=(50, 2))])
+        self.y = self.x.dot([1.0, 2.0, -1.0]) + stream.normal(0, 0.1, 50)
+
+    def test_matches_finite_differences(self):
+        """autodiff -- gradients of every operation"""
+        v = [0.5, 1.5, 2.5]
+        value, grad = autodiff.value_and_gradient(everything)(v)
+        self.assertAlmostEqual(everything(numpy.array(v)), value)
+        self.assertEqual(list, type(grad))
+        for expected, actual in zip(central_difference(everything, v), grad):
+            self.assertAlmostEqual(expected, actual, places=5)
+
+        self.assertEqual([-215.6, -88.0],
+                         [round(g, 6) for g in
+                          autodiff.gradient(rosenbrock)([-1.2, 1.0])])
+        self.assertEqual(12.0, autodiff.gradient(lambda t: t ** 3)(2.0))
+        self.assertEqual([0.0, 0.0],
+                         autodiff.gradient(lambda t: 1.0)([1.0, 2.0]))
+
+    def test_matches_hand_written_gradients(self):
+        """autodiff -- the models' per-row and batch gradients"""
+        beta = [0.5, 1.0, 0.0]
+        x_i, y_i = self.x[3].tolist(), self.y[3]
+        for expected, actual in zip(
+                multiple_regression.squared_error_gradient(x_i, y_i, beta),
+                autodiff.gradient(multiple_regression.squared_error, 2)(
+                    x_i, y_i, beta)):
+            self.assertAlmostEqual(expected, actual)
+
+        cases = [(multiple_regression.squared_error_batch,
+                  multiple_regression.squared_error_batch_gradient,
+                  self.x, self.y, beta),
+                 (logistic_regression.logistic_loss_batch,
+                  logistic_regression.logistic_loss_batch_gradient,
+                  self.x, (self.y > 0).astype(float), beta),
+                 (regression.squared_error_batch,
+                  regression.squared_error_batch_gradient,
+                  self.x[:, 1], self.y, [0.5, 1.0])]
+        for loss, loss_gradient, x, y, theta in cases:
+            self.assertTrue(numpy.allclose(
+                loss_gradient(x, y, numpy.array(theta)),
+                autodiff.gradient(loss, 2)(x, y, numpy.array(theta))))
+
+    def test_floats_are_refused(self):
+        """autodiff -- math functions can't silently drop the gradient"""
+        self.assertRaises(TypeError, autodiff.gradient(
+            lambda t: math.exp(t[0])), [1.0])
+        self.assertRaises(ValueError, autodiff.gradient(lambda t: t * 2),
+                          [1.0, 2.0])
+
+    def test_minimizers_derive_gradients(self):
+        """autodiff -- minimizers given a loss alone"""
+        theta = gradient.minimize_batch(rosenbrock, None, [-1.2, 1.0],
+                                        method='lbfgs')
+        for actual in theta:
+            self.assertAlmostEqual(1.0, actual, places=3)
+
+        beta = gradient.minimize_minibatch(
+            multiple_regression.squared_error_batch, None, self.x, self.y,
+            [0.0, 0.0, 0.0], 0.1, max_epochs=100, seed=1)
+        for expected, actual in zip([1.0, 2.0, -1.0], beta):
+            self.assertAlmostEqual(expected, actual, places=1)
+
+        x = self.x[:20].tolist()
+        y = [1 + 2 * x_i[1] - x_i[2] for x_i in x]
+        beta = gradient.minimize_stochastic(
+            multiple_regression.squared_error, None, x, y,
+            [0.0, 0.0, 0.0], 0.01)
+        for expected, actual in zip([1.0, 2.0, -1.0], beta):
+            self.assertAlmostEqual(expected, actual, places=1)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+
+from .context import tripp
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'benchmarks'))
+import suite
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+def broken_setup(size):
+    """for testing"""
+    raise RuntimeError("no data")
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_failing_case(self):
+        """benchmarks -- a failing case is reported, not waited on"""
+        cases = [("broken", broken_setup, len),
+                 ("len", lambda n: (range(n),), len)]
+        stderr = sys.stderr
+        with open(os.devnull, "w") as devnull:
+            # the child's traceback
+            sys.stderr = devnull
+            try:
+                results = suite.run(cases, [10], min_time=0.01)
+            finally:
+                sys.stderr = stderr
+        self.assertEqual({"failed": 1}, results["broken[n=10]"])
+        self.assertTrue(results["len[n=10]"]["ops_per_sec"] > 0)
+        self.assertEqual(["broken[n=10]"], suite.failures(results))
+        self.assertEqual([], suite.compare(
+            results, {"broken[n=10]": {"ops_per_sec": 1.0}}))
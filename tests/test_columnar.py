@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import math
+import os
+import shutil
+import tempfile
+import unittest
+
+from .context import tripp
+from tripp import algebra
+from tripp import columnar
+from tripp import stats
+import numpy
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+class TestColumnar(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.directory, "table.csv")
+        self.rows = [[i, 2.5 * i, (i % 7) - 3] for i in range(100)]
+        with open(self.csv_path, "w") as f:
+            f.write("id,price,delta\n")
+            for row in self.rows:
+                f.write(",".join(str(v) for v in row) + "\n")
+        self.store_path = os.path.join(self.directory, "table.store")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        """columnar -- convert_csv and reopen"""
+        columnar.convert_csv(self.csv_path, self.store_path, chunk_rows=30)
+        store = columnar.ColumnStore(self.store_path)
+        self.assertEqual((100, 3), algebra.shape(store))
+        self.assertEqual(["id", "price", "delta"], store.columns)
+        price = algebra.get_column(store, 1)
+        self.assertTrue(isinstance(price, numpy.memmap))
+        self.assertEqual([r[1] for r in self.rows], price.tolist())
+        self.assertEqual([r[2] for r in self.rows], store["delta"].tolist())
+        self.assertEqual(price.tolist(), store[numpy.int64(1)].tolist())
+        self.assertEqual(self.rows[10:12], store.rows(10, 12).tolist())
+
+    def test_selected_columns(self):
+        """columnar -- convert selected columns"""
+        store = columnar.convert_csv(self.csv_path, self.store_path,
+                                     columns=["delta", 0])
+        self.assertEqual(["delta", "id"], store.columns)
+        self.assertEqual(float(self.rows[-1][0]), store.column(1)[-1])
+
+    def test_unparsable_fields_are_nan(self):
+        """columnar -- unparsable fields"""
+        with open(self.csv_path, "a") as f:
+            f.write("100,n/a,4\n")
+        store = columnar.convert_csv(self.csv_path, self.store_path)
+        self.assertTrue(math.isnan(store["price"][100]))
+
+    def test_stats_on_columns(self):
+        """columnar -- stats consume columns directly"""
+        store = columnar.convert_csv(self.csv_path, self.store_path)
+        prices = [r[1] for r in self.rows]
+        self.assertAlmostEqual(stats.mean(prices),
+                               stats.mean(store["price"]))
+        self.assertAlmostEqual(stats.standard_deviation(prices),
+                               stats.standard_deviation(store["price"]))
+        self.assertEqual(stats.median(prices), stats.median(store["price"]))
+
+    def test_munge_scale(self):
+        """columnar -- munge.scale on a column store"""
+        from tripp import munge
+        store = columnar.convert_csv(self.csv_path, self.store_path)
+        means, stddevs = munge.scale(store)
+        expected_means, expected_stddevs = munge.scale(self.rows)
+        for actual, expected in zip(means + stddevs,
+                                    expected_means + expected_stddevs):
+            self.assertAlmostEqual(expected, actual)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import math
+import unittest
+
+from .context import tripp
+from tripp import distributions
+from tripp import hypothesis
+from tripp import probability
+import numpy
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+class TestDistributions(unittest.TestCase):
+
+    def test_normal_matches_probability(self):
+        """distributions -- Normal agrees with the probability functions"""
+        normal = distributions.Normal(1, 2)
+        for x in [-3.0, 0.0, 1.0, 2.5]:
+            self.assertAlmostEqual(probability.normal_pdf(x, 1, 2),
+                                   normal.pdf(x))
+            self.assertAlmostEqual(probability.normal_cdf(x, 1, 2),
+                                   normal.cdf(x))
+            self.assertAlmostEqual(math.log(normal.pdf(x)), normal.logpdf(x))
+        self.assertAlmostEqual(0.975, normal.cdf(normal.ppf(0.975)))
+
+    def test_normal_tails(self):
+        """distributions -- Normal keeps relative accuracy in the tails"""
+        normal = distributions.STANDARD_NORMAL
+        self.assertAlmostEqual(1, normal.sf(10) / 7.6198530241605e-24, 10)
+        self.assertEqual(normal.sf(10), normal.cdf(-10))
+
+    def test_arrays(self):
+        """distributions -- every method maps over arrays"""
+        xs = numpy.array([0.1, 0.25, 0.5, 0.9])
+        for distribution in [distributions.Normal(0.5, 0.2),
+                             distributions.Uniform(0, 2),
+                             distributions.Beta(2, 3)]:
+            for method in ['pdf', 'logpdf', 'cdf', 'sf', 'ppf']:
+                fn = getattr(distribution, method)
+                result = fn(xs)
+                self.assertEqual((4,), result.shape)
+                for x, value in zip(xs, result):
+                    self.assertAlmostEqual(fn(x), value)
+
+    def test_zero_dimensional_arrays(self):
+        """distributions -- a 0-d array gives a plain number"""
+        x = numpy.array(0.25)
+        for distribution in [distributions.Normal(0.5, 0.2),
+                             distributions.Uniform(0, 2),
+                             distributions.Beta(2, 3)]:
+            for method in ['pdf', 'logpdf', 'cdf', 'sf', 'ppf']:
+                self.assertEqual(float, type(getattr(distribution, method)(x)))
+        self.assertEqual(int, type(distributions.Binomial(10, 0.3).ppf(x)))
+
+    def test_uniform(self):
+        """distributions -- Uniform"""
+        uniform = distributions.Uniform(2, 4)
+        self.assertEqual(0.5, uniform.pdf(3))
+        self.assertEqual(0, uniform.pdf(4))
+        self.assertEqual([0, 0.5, 1], uniform.cdf([1, 3, 5]).tolist())
+        self.assertEqual(2.5, uniform.ppf(0.25))
+        self.assertRaises(ValueError, uniform.ppf, 1.5)
+
+    def test_beta_cdf(self):
+        """distributions -- Beta cdf against its closed form"""
+        beta = distributions.Beta(2, 3)
+        for x in [0, 0.01, 0.3, 0.7, 0.99, 1]:
+            expected = 1 - (1 - x) ** 4 - 4 * x * (1 - x) ** 3
+            self.assertAlmostEqual(expected, beta.cdf(x))
+            self.assertAlmostEqual(1 - expected, beta.sf(x))
+        self.assertAlmostEqual(0.3, beta.cdf(beta.ppf(0.3)))
+
+    def test_large_beta_parameters(self):
+        """distributions -- Beta density with huge parameters"""
+        beta = distributions.Beta(1000, 1000)
+        self.assertAlmostEqual(35.678022, beta.pdf(0.5), places=5)
+        self.assertAlmostEqual(35.678022, hypothesis.beta_pdf(0.5, 1000, 1000),
+                               places=5)
+        self.assertEqual(1, hypothesis.beta_pdf(0, 1, 1))
+        self.assertAlmostEqual(1 / 12.0, hypothesis.B(2, 3))
+
+    def test_binomial(self):
+        """distributions -- Binomial"""
+        binomial = distributions.Binomial(1000, 0.5)
+        self.assertAlmostEqual(probability.binomial_pmf(500, 1000, 0.5),
+                               binomial.pdf(500))
+        self.assertEqual(469, binomial.ppf(0.025))
+        self.assertEqual([500, 531], binomial.ppf([0.5, 0.975]).tolist())
+        self.assertAlmostEqual(binomial.cdf(469), binomial.sf(530))
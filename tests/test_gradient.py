@@ -6,8 +6,13 @@ import unittest
 from .context import tripp
 from tripp import gradient
 from tripp import algebra
+from tripp import dimensionality
+from tripp import multiple_regression
+from tripp import regression
+from tripp import telemetry
 from functools import partial
 import random
+import numpy
 import logging
 
 logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
@@ -23,6 +28,21 @@ def derivative(x):
     return 2 * x
 
 
+def rosenbrock(v):
+    """for testing: a long, curved valley with its minimum at 1s"""
+    return sum(100 * (v[i + 1] - v[i] ** 2) ** 2 + (1 - v[i]) ** 2
+               for i in range(len(v) - 1))
+
+
+def rosenbrock_gradient(v):
+    """for testing"""
+    g = [0.0 for _ in v]
+    for i in range(len(v) - 1):
+        g[i] += -400 * v[i] * (v[i + 1] - v[i] ** 2) - 2 * (1 - v[i])
+        g[i + 1] += 200 * (v[i + 1] - v[i] ** 2)
+    return g
+
+
 class TestGradient(unittest.TestCase):
 
     def setUp(self):
@@ -75,3 +95,173 @@ class TestGradient(unittest.TestCase):
             result = f(v)
             negation = gradient.negate(f)
             self.assertEqual(result * -1, negation(v))
+
+    def test_minimize_batch_counts_evaluations(self):
+        """gradient -- fixed steps evaluate each candidate only once"""
+        theta, report = gradient.minimize_batch(
+            gradient.sum_of_squares, gradient.sum_of_squares_gradient,
+            [3.0, -4.0, 5.0], full_output=True)
+        self.assertTrue(gradient.sum_of_squares(theta) < 1e-6)
+        self.assertEqual(report.gradient_evaluations, report.iterations)
+        self.assertEqual(report.function_evaluations,
+                         8 * report.iterations + 1)
+
+    def test_line_searches(self):
+        """gradient -- backtracking and strong Wolfe line searches"""
+        for line_search in [gradient.backtracking_line_search,
+                            gradient.strong_wolfe_line_search]:
+            theta = gradient.minimize_batch(
+                gradient.sum_of_squares, gradient.sum_of_squares_gradient,
+                [3.0, -4.0, 5.0], line_search=line_search)
+            self.assertTrue(gradient.sum_of_squares(theta) < 1e-6)
+
+    def test_failed_line_search(self):
+        """gradient -- a line search that finds no decrease stays put"""
+        objective = gradient._Objective(gradient.sum_of_squares,
+                                        gradient.sum_of_squares_gradient)
+        # uphill, so no step satisfies the Armijo condition
+        self.assertEqual(
+            ([1.0, 2.0], 5.0, [2.0, 4.0]),
+            gradient.backtracking_line_search(objective, [1.0, 2.0], 5.0,
+                                              [2.0, 4.0], [1.0, 1.0]))
+
+        trace = telemetry.Trace()
+        theta = gradient.minimize_batch(
+            gradient.sum_of_squares,
+            lambda v: [-v_i for v_i in gradient.sum_of_squares_gradient(v)],
+            [3.0, -4.0], line_search=gradient.backtracking_line_search,
+            callback=trace)
+        self.assertEqual([3.0, -4.0], theta)
+        self.assertEqual(telemetry.NO_IMPROVEMENT, trace.stop_reason)
+
+    def test_lbfgs(self):
+        """gradient -- L-BFGS on the Rosenbrock function"""
+        theta, report = gradient.minimize_batch(
+            rosenbrock, rosenbrock_gradient, [-1.2, 1.0, -1.2, 1.0],
+            method='lbfgs', full_output=True)
+        for theta_i in theta:
+            self.assertAlmostEqual(1, theta_i, places=3)
+        self.assertTrue(report.function_evaluations < 100)
+        self.assertRaises(ValueError, gradient.minimize_batch,
+                          rosenbrock, rosenbrock_gradient, [0, 0],
+                          method='newton')
+
+    def test_first_principal_component_lbfgs(self):
+        """gradient -- L-BFGS finds the first principal component"""
+        random.seed(1)
+        X = [[3 * random.gauss(0, 1), random.gauss(0, 1)]
+             for _ in range(50)]
+        w = [0.7, -1.3]
+        exact = dimensionality.directional_variance_exact_gradient(X, w)
+        h = 1e-6
+        for j in range(2):
+            nudged = [w_i + (h if i == j else 0) for i, w_i in enumerate(w)]
+            estimate = (dimensionality.directional_variance(X, nudged) -
+                        dimensionality.directional_variance(X, w)) / h
+            self.assertAlmostEqual(1, exact[j] / estimate, places=3)
+        slow = dimensionality.first_principal_component(X)
+        fast = dimensionality.first_principal_component(X, method='lbfgs')
+        self.assertAlmostEqual(1, abs(algebra.dot(slow, fast)), places=4)
+
+    def test_minimize_minibatch(self):
+        """gradient -- mini-batch descent fits a linear model"""
+        stream = numpy.random.RandomState(0)
+        x = numpy.column_stack([numpy.ones(500),
+                                stream.normal(size=(500, 2))])
+        y = x.dot([1.0, 2.0, -3.0]) + stream.normal(scale=0.1, size=500)
+        beta, report = gradient.minimize_minibatch(
+            multiple_regression.squared_error_batch,
+            multiple_regression.squared_error_batch_gradient,
+            x, y, [0.0, 0.0, 0.0], 0.05, seed=1, full_output=True)
+        for expected, actual in zip([1.0, 2.0, -3.0], beta):
+            self.assertAlmostEqual(expected, actual, places=1)
+        self.assertTrue(report.iterations < 100)
+        self.assertEqual(16 * report.iterations, report.gradient_evaluations)
+        again = gradient.minimize_minibatch(
+            multiple_regression.squared_error_batch,
+            multiple_regression.squared_error_batch_gradient,
+            x, y, [0.0, 0.0, 0.0], 0.05, seed=1)
+        self.assertEqual(beta, again)
+
+    def test_learning_rate_schedules(self):
+        """gradient -- learning rate schedules"""
+        self.assertEqual(0.1, gradient.constant_schedule(0.1, 7))
+        self.assertEqual(0.25, gradient.step_decay(1.0, 25))
+        self.assertAlmostEqual(0.9 ** 3,
+                               gradient.exponential_decay(1.0, 3, rate=0.9))
+        self.assertEqual(0.5, gradient.inverse_time_decay(1.0, 10))
+        _, report = gradient.minimize_minibatch(
+            multiple_regression.squared_error_batch,
+            multiple_regression.squared_error_batch_gradient,
+            [[1.0, 0.0], [1.0, 1.0]], [1.0, 3.0], [0.0, 0.0], 0.1,
+            schedule=partial(gradient.step_decay, every=2), max_epochs=7,
+            tolerance=0, full_output=True)
+        self.assertEqual(7, report.iterations)
+
+    def test_minibatch_model_fits(self):
+        """gradient -- mini-batch fits in regression and dimensionality"""
+        stream = numpy.random.RandomState(2)
+        x = stream.normal(size=400)
+        y = 3 * x + 2 + stream.normal(scale=0.1, size=400)
+        alpha, beta = regression.least_squares_fit_minibatch(x, y, seed=3)
+        self.assertAlmostEqual(2, alpha, places=1)
+        self.assertAlmostEqual(3, beta, places=1)
+
+        X = stream.normal(size=(400, 2)) * [5, 1]
+        component = dimensionality.first_principal_component_minibatch(
+            X, seed=4)
+        self.assertAlmostEqual(1, abs(component[0]), places=2)
+
+    def test_maximize_minibatch(self):
+        """gradient -- maximize_minibatch with list and derived gradients"""
+        stream = numpy.random.RandomState(5)
+        x = stream.normal(size=200)
+        y = 3 * x + 2
+        negated = gradient.negate(regression.squared_error_batch)
+        for gradient_fn in [gradient.negate_all(
+                regression.squared_error_batch_gradient), None]:
+            alpha, beta = gradient.maximize_minibatch(
+                negated, gradient_fn, x, y, [0.0, 0.0], 0.1, seed=6)
+            self.assertAlmostEqual(2, alpha, places=2)
+            self.assertAlmostEqual(3, beta, places=2)
+
+    def test_optimizers(self):
+        """gradient -- every optimizer minimizes a sum of squares"""
+        for name in sorted(gradient.OPTIMIZERS):
+            theta, report = gradient.minimize_batch(
+                gradient.sum_of_squares, gradient.sum_of_squares_gradient,
+                [3.0, -4.0], optimizer=name,
+                alpha=0.5 if name == 'adagrad' else 0.05,
+                max_iterations=5000, full_output=True)
+            self.assertTrue(gradient.sum_of_squares(theta) < 1e-4, name)
+            self.assertTrue(isinstance(theta, list))
+        adam = gradient.Adam()
+        self.assertTrue(adam is gradient.get_optimizer(adam))
+        self.assertRaises(ValueError, gradient.get_optimizer, 'newton')
+
+    def test_adaptive_optimizer_on_badly_scaled_features(self):
+        """gradient -- Adam copes with features on different scales"""
+        stream = numpy.random.RandomState(0)
+        x = numpy.column_stack([numpy.ones(300), stream.normal(size=300),
+                                100 * stream.normal(size=300)])
+        y = x.dot([1.0, 2.0, 0.03]) + stream.normal(scale=0.1, size=300)
+        fits = {}
+        for name, alpha_0 in [('sgd', 1e-5), ('adam', 0.05)]:
+            fits[name] = gradient.minimize_minibatch(
+                multiple_regression.squared_error_batch,
+                multiple_regression.squared_error_batch_gradient,
+                x, y, [0.0, 0.0, 0.0], alpha_0, max_epochs=50,
+                optimizer=name, seed=1)
+        for expected, actual in zip([1.0, 2.0, 0.03], fits['adam']):
+            self.assertAlmostEqual(expected, actual, places=1)
+        self.assertTrue(abs(fits['sgd'][1] - 2) > 1)
+
+    def test_estimate_beta_with_optimizer(self):
+        """gradient -- estimate_beta picks an optimizer by name"""
+        random.seed(0)
+        x = [[1, random.random(), random.random()] for _ in range(40)]
+        y = [1 + 2 * x_i[1] - x_i[2] for x_i in x]
+        beta = multiple_regression.estimate_beta(x, y, optimizer='rmsprop',
+                                                 alpha_0=0.01)
+        for expected, actual in zip([1, 2, -1], beta):
+            self.assertAlmostEqual(expected, actual, places=1)
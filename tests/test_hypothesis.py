@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 
 import unittest
+import math
 import random
+import numpy
 from .context import tripp
 from tripp import hypothesis
 import logging
@@ -36,3 +38,83 @@ class TestHypothesis(unittest.TestCase):
         """hypothesis -- a_b_test_statistic"""
         result = hypothesis.a_b_test_statistic(1000, 200, 1000, 180)
         self.assertEqual(round(result, 2), -1.14)
+
+    def test_binomial_two_sided_p_value(self):
+        """hypothesis -- exact two-sided binomial p-value"""
+        self.assertAlmostEqual(
+            0.0620232, hypothesis.binomial_two_sided_p_value(470, 1000), 6)
+        self.assertAlmostEqual(
+            hypothesis.binomial_two_sided_p_value(470, 1000),
+            hypothesis.binomial_two_sided_p_value(530, 1000))
+        # P(X <= 1) + P(X >= 5) for X ~ Binomial(10, 0.3)
+        self.assertAlmostEqual(
+            0.2995767, hypothesis.binomial_two_sided_p_value(1, 10, 0.3), 6)
+        self.assertEqual(1, hypothesis.binomial_two_sided_p_value(3, 10, 0.3))
+        self.assertEqual(0, hypothesis.binomial_two_sided_p_value(1, 10, 0))
+
+    def test_binomial_two_sided_bounds(self):
+        """hypothesis -- exact bounds agree with reject_fairness"""
+        self.assertEqual((469, 531),
+                         hypothesis.binomial_two_sided_bounds(0.95, 1000))
+
+    def test_binomial_power(self):
+        """hypothesis -- exact binomial power grows with the effect"""
+        powers = [hypothesis.binomial_power(1000, 0.5, p_1)
+                  for p_1 in [0.5, 0.52, 0.55, 0.6]]
+        self.assertTrue(powers[0] <= 0.05)
+        self.assertEqual(powers, sorted(powers))
+        mu_1, sigma_1 = hypothesis.normal_approximation_to_binomial(1000,
+                                                                    0.55)
+        approximate = hypothesis.normal_probability_outside(469, 531,
+                                                            mu_1, sigma_1)
+        self.assertAlmostEqual(approximate, powers[2], delta=0.01)
+
+    def test_extreme_value_probability(self):
+        """hypothesis -- exact probability of an extreme count"""
+        self.assertAlmostEqual(
+            hypothesis.binomial_two_sided_p_value(470, 1000),
+            hypothesis.extreme_value_probability(1000, 470, 530))
+
+    def test_batch_p_values(self):
+        """hypothesis -- p-values of an array of statistics"""
+        xs = numpy.array([-40.0, -1.96, 0, 0.5, 1.96, 8.5])
+        expected = [hypothesis.two_sided_p_value(x) for x in xs]
+        result = hypothesis.two_sided_p_values(xs)
+        for e, r in zip(expected, result):
+            self.assertAlmostEqual(e, r)
+        # keeps relative accuracy where 1 - normal_cdf underflows to 0
+        tail = hypothesis.two_sided_p_values([-30.0])[0]
+        self.assertAlmostEqual(1, tail / math.erfc(30 / math.sqrt(2)), 12)
+        for batch, single in [(hypothesis.upper_p_values,
+                               hypothesis.upper_p_value),
+                              (hypothesis.lower_p_values,
+                               hypothesis.lower_p_value)]:
+            result = batch(xs, mu=0.5, sigma=2)
+            for x, r in zip(xs, result):
+                self.assertAlmostEqual(single(x, 0.5, 2), r)
+
+    def test_multiple_testing_adjustments(self):
+        """hypothesis -- bonferroni, holm and benjamini_hochberg"""
+        p_values = [0.01, 0.04, 0.03, 0.005]
+        self.assertEqual([0.04, 0.16, 0.12, 0.02],
+                         hypothesis.bonferroni(p_values).tolist())
+        for expected, result in zip([0.03, 0.06, 0.06, 0.02],
+                                    hypothesis.holm(p_values)):
+            self.assertAlmostEqual(expected, result)
+        for expected, result in zip([0.02, 0.04, 0.04, 0.02],
+                                    hypothesis.benjamini_hochberg(p_values)):
+            self.assertAlmostEqual(expected, result)
+
+    def test_adjustments_on_many_hypotheses(self):
+        """hypothesis -- adjustments rank from strictest to loosest"""
+        stream = numpy.random.RandomState(0)
+        statistics = stream.normal(size=100000)
+        statistics[:500] += 6
+        p_values = hypothesis.two_sided_p_values(statistics)
+        rejections = [(adjust(p_values) < 0.05).sum()
+                      for adjust in [hypothesis.bonferroni, hypothesis.holm,
+                                     hypothesis.benjamini_hochberg]]
+        self.assertTrue(rejections[0] <= rejections[1] < rejections[2])
+        false_rejections = (hypothesis.benjamini_hochberg(p_values)[500:] <
+                            0.05).sum()
+        self.assertTrue(false_rejections <= 0.1 * rejections[2])
@@ -5,6 +5,8 @@ import unittest
 
 from .context import tripp
 from tripp import munge
+from tripp import stats
+from tripp import algebra
 import logging
 import csv
 import dateutil.parser
@@ -135,3 +137,15 @@ class TestMunge(unittest.TestCase):
                     8,
                     9]
         self.assertEqual(expected, result[0])
+
+    def test_correlation_matrix(self):
+        """munge -- correlation_matrix"""
+        data = munge.make_random_matrix()
+        result = munge.correlation_matrix(data)
+        self.assertEqual(4, len(result))
+        for i in range(4):
+            for j in range(4):
+                expected = stats.correlation(algebra.get_column(data, i),
+                                             algebra.get_column(data, j))
+                self.assertAlmostEqual(expected, result[i][j])
+        self.assertEqual([], munge.correlation_matrix([]))
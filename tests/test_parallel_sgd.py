@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from .context import tripp
+from tripp import logistic_regression
+from tripp import multiple_regression
+from tripp import parallel_sgd
+import numpy
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+class TestParallelSGD(unittest.TestCase):
+
+    def setUp(self):
+        stream = numpy.random.RandomState(0)
+        self.x = numpy.column_stack([numpy.ones(2000),
+                                     stream.normal(size=(2000, 2))])
+        self.y = (self.x.dot([1.0, 2.0, -3.0]) +
+                  stream.normal(scale=0.1, size=2000))
+        self.labels = (stream.rand(2000) <
+                       1 / (1 + numpy.exp(-self.x.dot([0.5, 2.0, -1.0]))))
+
+    def assert_fits(self, beta, expected=(1.0, 2.0, -3.0), places=1):
+        for e, b in zip(expected, beta):
+            self.assertAlmostEqual(e, b, places=places)
+
+    def test_hogwild(self):
+        """parallel_sgd -- lock-free updates from two workers"""
+        beta, report = parallel_sgd.minimize_parallel(
+            multiple_regression.squared_error_batch,
+            multiple_regression.squared_error_batch_gradient,
+            self.x, self.y, [0.0, 0.0, 0.0], 0.05, workers=2, seed=1,
+            full_output=True)
+        self.assert_fits(beta)
+        self.assertTrue(isinstance(beta, list))
+        self.assertEqual(2 * 32 * report.iterations,
+                         report.gradient_evaluations)
+
+    def test_averaging_is_reproducible(self):
+        """parallel_sgd -- periodic averaging gives the same answer
+        for the same seed"""
+        fits = [parallel_sgd.minimize_parallel(
+            multiple_regression.squared_error_batch,
+            multiple_regression.squared_error_batch_gradient,
+            self.x, self.y, [0.0, 0.0, 0.0], 0.05, workers=2,
+            mode=parallel_sgd.AVERAGING, sync_every=4, seed=2)
+            for _ in range(2)]
+        self.assert_fits(fits[0])
+        self.assertEqual(fits[0], fits[1])
+
+    def test_target_value(self):
+        """parallel_sgd -- stops once the loss reaches the target"""
+        _, report = parallel_sgd.minimize_parallel(
+            multiple_regression.squared_error_batch,
+            multiple_regression.squared_error_batch_gradient,
+            self.x, self.y, [0.0, 0.0, 0.0], 0.05, workers=1,
+            target_value=100, seed=3, full_output=True)
+        self.assertTrue(report.value <= 100)
+        self.assertEqual(1, report.iterations)
+        self.assertRaises(ValueError, parallel_sgd.minimize_parallel,
+                          multiple_regression.squared_error_batch,
+                          multiple_regression.squared_error_batch_gradient,
+                          self.x, self.y, [0.0, 0.0, 0.0], mode='locked')
+
+    def test_estimate_beta_parallel(self):
+        """parallel_sgd -- linear and logistic regression fits"""
+        self.assert_fits(multiple_regression.estimate_beta_parallel(
+            self.x, self.y, workers=2, alpha_0=0.05, seed=4))
+        beta = logistic_regression.estimate_beta_parallel(
+            self.x, self.labels, workers=2, alpha_0=0.1, seed=5)
+        self.assert_fits(beta, [0.5, 2.0, -1.0], places=0)
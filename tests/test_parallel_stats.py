@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from .context import tripp
+from tripp import parallel_stats
+from tripp import stats
+import numpy
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+class TestParallelStats(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.values = [random.randint(0, 100) for _ in range(1001)]
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "values.csv")
+        with open(self.path, "w") as f:
+            f.write("id,value\n")
+            for i, value in enumerate(self.values):
+                f.write("{0},{1}\n".format(i, value))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def check(self, summary):
+        self.assertEqual(len(self.values), summary.count)
+        self.assertAlmostEqual(stats.mean(self.values), summary.mean())
+        self.assertAlmostEqual(stats.variance(self.values),
+                               summary.variance())
+        self.assertEqual(stats.data_range(self.values),
+                         summary.data_range())
+        self.assertEqual(sorted(stats.mode(self.values)),
+                         sorted(summary.mode()))
+
+    def test_summarize_list_in_one_process(self):
+        """parallel_stats -- list, one worker"""
+        self.check(parallel_stats.summarize(self.values, workers=1,
+                                            chunk_size=100,
+                                            count_values=True))
+
+    def test_summarize_array_in_pool(self):
+        """parallel_stats -- array, worker pool"""
+        self.check(parallel_stats.summarize(numpy.array(self.values),
+                                            workers=2, chunk_size=128,
+                                            count_values=True))
+
+    def test_summarize_file(self):
+        """parallel_stats -- delimited file"""
+        summary = parallel_stats.summarize(self.path, workers=2,
+                                           chunk_size=500, column=1,
+                                           skip_header=True,
+                                           count_values=True)
+        self.check(summary)
+        self.check(parallel_stats.summarize(unicode(self.path), workers=1,
+                                            column=1, skip_header=True,
+                                            count_values=True))
+
+    def test_file_chunks_start_at_line_breaks(self):
+        """parallel_stats -- file_chunks"""
+        chunks = parallel_stats.file_chunks(self.path, 64, skip_header=True)
+        self.assertEqual(len("id,value\n"), chunks[0][0])
+        self.assertEqual(os.path.getsize(self.path), chunks[-1][1])
+        values = [v for start, stop in chunks
+                  for v in parallel_stats.read_chunk(self.path, start, stop,
+                                                     column=1)]
+        self.assertEqual(self.values, values)
+
+    def test_convenience_functions(self):
+        """parallel_stats -- mean, standard_deviation and mode"""
+        self.assertAlmostEqual(stats.mean(self.values),
+                               parallel_stats.mean(self.values, workers=1))
+        self.assertAlmostEqual(stats.standard_deviation(self.values),
+                               parallel_stats.standard_deviation(
+                                   self.values, workers=1, chunk_size=10))
+        self.assertRaises(ValueError,
+                          parallel_stats.summarize(self.values,
+                                                   workers=1).mode)
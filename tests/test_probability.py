@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import logging
+import math
 import unittest
+import numpy
+from fractions import Fraction
 
 from tripp import probability
 
@@ -128,3 +131,112 @@ class TestProbability(unittest.TestCase):
             result = round(probability.inverse_normal_cdf(p), significant_digit)
             expected = round(expected_inverse_normals[i], significant_digit)
             self.assertEqual(result, expected)
+
+    def test_inverse_normal_cdf_is_accurate(self):
+        """probability -- inverse normal cdf to double precision"""
+        self.assertAlmostEqual(-5.199337582187471,
+                               probability.inverse_normal_cdf(0.0000001),
+                               places=10)
+        self.assertAlmostEqual(1.6448536269514729,
+                               probability.inverse_normal_cdf(0.95),
+                               places=14)
+        self.assertEqual(float('-inf'), probability.inverse_normal_cdf(0))
+        self.assertRaises(ValueError, probability.inverse_normal_cdf, 1.5)
+        self.assertRaises(ValueError, probability.inverse_normal_cdf,
+                          float('nan'))
+        self.assertRaises(ValueError, probability.inverse_normal_cdf,
+                          numpy.array([0.5, float('nan')]))
+
+    def test_inverse_normal_cdf_single_precision(self):
+        """probability -- inverse normal cdf with a looser tolerance"""
+        for p in [0.00001, 0.05, 0.45, 0.999]:
+            self.assertAlmostEqual(probability.inverse_normal_cdf(p),
+                                   probability.inverse_normal_cdf(
+                                       p, tolerance=1e-6),
+                                   places=6)
+
+    def test_inverse_normal_cdf_rescales(self):
+        """probability -- inverse normal cdf with mu and sigma"""
+        x = probability.inverse_normal_cdf(0.975, mu=500, sigma=15.8)
+        self.assertAlmostEqual(0.975, probability.normal_cdf(x, 500, 15.8))
+
+    def test_inverse_normal_cdf_of_array(self):
+        """probability -- inverse normal cdf of an array"""
+        ps = numpy.array([0, 1e-300, 0.00001, 0.05, 0.5, 0.85, 0.9999999, 1])
+        result = probability.inverse_normal_cdf(ps, mu=1, sigma=2)
+        expected = [probability.inverse_normal_cdf(p, mu=1, sigma=2)
+                    for p in ps]
+        self.assertEqual(expected, result.tolist())
+        coarse = probability.inverse_normal_cdf(ps, tolerance=1e-6)
+        self.assertTrue(numpy.allclose(coarse[1:-1],
+                                       (result[1:-1] - 1) / 2, rtol=1e-6))
+
+    def test_binomial_pmf_matches_exact_values(self):
+        """probability -- binomial pmf against exact fractions"""
+        for k, n, p in [(3, 10, 0.3), (0, 10, 0.3), (10, 10, 0.3),
+                        (530, 1000, 0.5), (5, 1000, 0.5), (100, 3000, 0.01)]:
+            exact = (Fraction(math.factorial(n),
+                              math.factorial(k) * math.factorial(n - k)) *
+                     Fraction(p) ** k * Fraction(1 - p) ** (n - k))
+            self.assertAlmostEqual(1, probability.binomial_pmf(k, n, p) /
+                                   float(exact), places=12)
+
+    def test_binomial_pmf_sums_to_one(self):
+        """probability -- binomial pmf is a distribution"""
+        for n, p in [(1, 0.5), (40, 0.37), (5000, 0.999), (20, 0), (20, 1)]:
+            total = probability.binomial_pmf(numpy.arange(n + 1), n, p).sum()
+            self.assertAlmostEqual(1, total, places=12)
+        self.assertEqual(0, probability.binomial_pmf(11, 10, 0.5))
+        self.assertEqual(0, probability.binomial_pmf(-1, 10, 0.5))
+
+    def test_log_factorial(self):
+        """probability -- log factorial from the table and beyond it"""
+        self.assertEqual(0, probability.log_factorial(0))
+        for n in [2, 15, 16, 170, 65535, 65536, 10 ** 7]:
+            self.assertAlmostEqual(1, probability.log_factorial(n) /
+                                   math.lgamma(n + 1), places=14)
+        self.assertRaises(ValueError, probability.log_factorial, -1)
+        self.assertRaises(ValueError, probability.log_factorial,
+                          numpy.array([3, -2]))
+
+    def test_binomial_cdf_and_sf(self):
+        """probability -- binomial cdf and sf against summed pmfs"""
+        n, p = 300, 0.37
+        pmf = probability.binomial_pmf(numpy.arange(n + 1), n, p)
+        for k in [-1, 0, 20, 110, 111, 150, 299, 300]:
+            below = pmf[:k + 1].sum()
+            above = pmf[k + 1:].sum()
+            self.assertAlmostEqual(below, probability.binomial_cdf(k, n, p))
+            self.assertAlmostEqual(above, probability.binomial_sf(k, n, p))
+            if above:
+                self.assertAlmostEqual(1, probability.binomial_sf(k, n, p) /
+                                       above, places=10)
+
+    def test_binomial_cdf_is_vectorized(self):
+        """probability -- binomial cdf over arrays of k and n"""
+        ks = numpy.array([5, 50, 500])
+        ns = numpy.array([10, 100, 1000])
+        result = probability.binomial_cdf(ks, ns, 0.5)
+        expected = [probability.binomial_cdf(k, n, 0.5)
+                    for k, n in zip(ks, ns)]
+        self.assertEqual(expected, result.tolist())
+        self.assertEqual((3,), probability.binomial_log_pmf(ks, ns, 0.5).shape)
+
+        # both sides of the mode, and both ends, in one call
+        ks = numpy.array([[-1, 0, 20, 111], [150, 299, 300, 301]])
+        n, p = 300, 0.37
+        cdf = probability.binomial_cdf(ks, n, p)
+        sf = probability.binomial_sf(ks, n, p)
+        self.assertEqual((2, 4), cdf.shape)
+        for k, c, s in zip(ks.ravel(), cdf.ravel(), sf.ravel()):
+            self.assertEqual(probability.binomial_cdf(k, n, p), c)
+            self.assertAlmostEqual(1, c + s)
+
+    def test_binomial_cdf_of_large_n(self):
+        """probability -- binomial tails with ten million trials"""
+        n = 10 ** 7
+        two_sigma = int(math.sqrt(n))
+        lo = probability.binomial_cdf(n // 2 - two_sigma, n, 0.5)
+        self.assertAlmostEqual(probability.normal_cdf(-2), lo, places=3)
+        hi = probability.binomial_sf(n // 2 + two_sigma - 1, n, 0.5)
+        self.assertAlmostEqual(1, lo / hi, places=10)
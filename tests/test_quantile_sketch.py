@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+import random
+
+from .context import tripp
+from tripp.quantile_sketch import KLLSketch
+from tripp import stats
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+def rank_error(sorted_values, value, p):
+    """how far value's rank is from the p-th percentile's, as a fraction"""
+    n = len(sorted_values)
+    rank = len([v for v in sorted_values if v <= value]) - 1
+    return abs(rank - int(p * n)) / float(n)
+
+
+class TestKLLSketch(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.values = [random.gauss(0, 1) for _ in range(20000)]
+        self.sorted_values = sorted(self.values)
+        self.ps = [0.01, 0.25, 0.5, 0.75, 0.99]
+
+    def test_small_streams_are_exact(self):
+        """quantile_sketch -- exact below capacity"""
+        sketch = KLLSketch(range(50))
+        self.assertEqual(1, len(sketch.compactors))
+        self.assertEqual([0, 25, 49], sketch.quantiles([0, 0.5, 0.99]))
+        self.assertEqual(20, sketch.rank(19))
+
+    def test_quantiles_within_error_bound(self):
+        """quantile_sketch -- rank error"""
+        sketch = KLLSketch(iter(self.values), seed=1)
+        self.assertEqual(20000, sketch.count)
+        self.assertTrue(sum(len(c) for c in sketch.compactors) < 3 * 200)
+        for p, q in zip(self.ps, sketch.quantiles(self.ps)):
+            self.assertTrue(rank_error(self.sorted_values, q, p) < 3 / 200.0)
+
+    def test_merge_serialized_sketches(self):
+        """quantile_sketch -- merge and to_bytes"""
+        shards = [KLLSketch(self.values[i::3], seed=i) for i in range(3)]
+        merged = KLLSketch(seed=3)
+        for shard in shards:
+            merged.merge(KLLSketch.from_bytes(shard.to_bytes()))
+        self.assertEqual(20000, merged.count)
+        self.assertEqual(self.sorted_values[0], merged.min)
+        self.assertEqual(self.sorted_values[-1], merged.max)
+        for p, q in zip(self.ps, merged.quantiles(self.ps)):
+            self.assertTrue(rank_error(self.sorted_values, q, p) < 3 / 200.0)
+
+    def test_from_bytes_rejects_garbage(self):
+        """quantile_sketch -- from_bytes"""
+        self.assertRaises(ValueError, KLLSketch.from_bytes, b'x' * 40)
+
+    def test_stats_approximate(self):
+        """quantile_sketch -- stats approximate switch"""
+        median = stats.median(iter(self.values), approximate=True)
+        self.assertTrue(rank_error(self.sorted_values, median, 0.5) < 0.015)
+        sketch = KLLSketch(self.values)
+        self.assertEqual(sketch.quantile(0.9),
+                         stats.quantile(sketch, 0.9, approximate=True))
+        iqr = stats.interquartile_range(sketch, approximate=True)
+        self.assertAlmostEqual(stats.interquartile_range(self.values),
+                               iqr, places=1)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from .context import tripp
+from tripp import resampling
+import numpy
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+def column_means(sample):
+    return sample.mean(axis=0)
+
+
+def difference_of_medians(x, y):
+    return numpy.median(x) - numpy.median(y)
+
+
+class TestResampling(unittest.TestCase):
+
+    def setUp(self):
+        stream = numpy.random.RandomState(0)
+        self.skewed = stream.exponential(size=200)
+        self.x = stream.normal(0.5, 1, 60)
+        self.y = stream.normal(0, 1, 60)
+
+    def test_bootstrap_is_reproducible(self):
+        """resampling -- a seed fixes the replicates, whatever the pool"""
+        serial = resampling.bootstrap(self.skewed, column_means, 300,
+                                      workers=1, seed=7)
+        pooled = resampling.bootstrap(self.skewed, column_means, 300,
+                                      workers=2, seed=7)
+        self.assertEqual(serial.values.tolist(), pooled.values.tolist())
+        self.assertEqual((300,), pooled.seconds.shape)
+        self.assertAlmostEqual(self.skewed.mean(), serial.estimate)
+        self.assertAlmostEqual(self.skewed.mean(), serial.values.mean(), 1)
+
+    def test_percentile_interval(self):
+        """resampling -- percentile interval covers the estimate"""
+        (lo, hi), replicates = resampling.confidence_interval(
+            self.skewed, column_means, 1000, method='percentile',
+            workers=1, seed=1)
+        self.assertTrue(lo < replicates.estimate < hi)
+        self.assertEqual((lo, hi),
+                         resampling.percentile_interval(replicates.values))
+
+    def test_bca_interval(self):
+        """resampling -- BCa leans toward the long tail of skewed data"""
+        percentile, _ = resampling.confidence_interval(
+            self.skewed, column_means, 2000, method='percentile',
+            workers=1, seed=1)
+        bca, replicates = resampling.confidence_interval(
+            self.skewed, column_means, 2000, method='bca', workers=1, seed=1)
+        self.assertTrue(bca[0] < replicates.estimate < bca[1])
+        self.assertTrue(bca[0] > percentile[0])
+        self.assertTrue(bca[1] > percentile[1])
+
+    def test_interval_of_vector_statistic(self):
+        """resampling -- intervals for each element of a statistic"""
+        data = numpy.column_stack([self.x, self.y])
+        (lo, hi), _ = resampling.confidence_interval(data, column_means, 500,
+                                                     workers=1, seed=2)
+        self.assertEqual((2,), lo.shape)
+        self.assertTrue(numpy.all(lo < data.mean(axis=0)))
+        self.assertTrue(numpy.all(data.mean(axis=0) < hi))
+
+    def test_jackknife(self):
+        """resampling -- leave-one-out values"""
+        data = numpy.array([1.0, 2.0, 3.0, 6.0])
+        self.assertEqual([11 / 3.0, 10 / 3.0, 3.0, 2.0],
+                         resampling.jackknife(data, column_means,
+                                              workers=1).tolist())
+
+    def test_permutation_test(self):
+        """resampling -- permutation test of a real and a null effect"""
+        progress = []
+        result = resampling.permutation_test(
+            self.x, self.y, num_permutations=999, workers=2, seed=3,
+            batch_size=200, progress=lambda done, total:
+                progress.append((done, total)))
+        self.assertTrue(result.p_value < 0.05)
+        self.assertEqual((5, 5), progress[-1])
+        self.assertEqual((999,), result.seconds.shape)
+        null = resampling.permutation_test(self.x, self.x,
+                                           difference_of_medians, 199,
+                                           workers=1, seed=3)
+        self.assertEqual(1, null.p_value)
+        self.assertRaises(ValueError, resampling.permutation_test,
+                          self.x, self.y, alternative='sideways')
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from .context import tripp
+from tripp import simulation
+from tripp import hypothesis
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+def coin_flips(stream, size):
+    """for testing: heads with probability 0.3"""
+    return stream.bernoulli(0.3, size)
+
+
+def rare_event(stream, size):
+    """for testing: happens with probability 0.001"""
+    return stream.bernoulli(0.001, size)
+
+
+class TestSimulation(unittest.TestCase):
+
+    def test_estimate(self):
+        """simulation -- estimate and standard error"""
+        estimate = simulation.simulate(coin_flips, 50000, workers=1,
+                                       batch_size=4096, seed=1)
+        self.assertEqual(50000, estimate.trials)
+        expected_error = (0.3 * 0.7 / 50000) ** 0.5
+        self.assertAlmostEqual(expected_error, estimate.standard_error,
+                               places=4)
+        self.assertTrue(abs(estimate.value - 0.3) <
+                        4 * estimate.standard_error)
+
+    def test_same_seed_same_answer_in_pool(self):
+        """simulation -- results do not depend on workers"""
+        serial = simulation.simulate(coin_flips, 20000, workers=1,
+                                     batch_size=1000, seed=3)
+        pooled = simulation.simulate(coin_flips, 20000, workers=2,
+                                     batch_size=1000, seed=3)
+        self.assertEqual(serial.trials, pooled.trials)
+        self.assertAlmostEqual(serial.value, pooled.value)
+
+    def test_early_stopping(self):
+        """simulation -- target_error"""
+        estimate = simulation.simulate(coin_flips, 10 ** 7, workers=2,
+                                       batch_size=1000, seed=0,
+                                       target_error=0.005)
+        self.assertTrue(estimate.standard_error <= 0.005)
+        self.assertTrue(estimate.trials < 20000)
+
+    def test_early_stopping_on_rare_event(self):
+        """simulation -- target_error waits for a rare event"""
+        estimate = simulation.simulate(rare_event, 10 ** 6, workers=1,
+                                       batch_size=100, seed=0,
+                                       target_error=0.01)
+        self.assertTrue(estimate.value > 0)
+        self.assertTrue(0 < estimate.standard_error <= 0.01)
+        self.assertTrue(estimate.trials >= 200)
+
+    def test_count_extreme_values(self):
+        """simulation -- hypothesis.count_extreme_values"""
+        fraction = hypothesis.count_extreme_values(seed=0)
+        # P(|heads - 500| >= 30) for 1000 fair flips is about 0.062
+        self.assertAlmostEqual(0.062, fraction, delta=0.003)
+
+    def test_false_rejection_rate(self):
+        """simulation -- hypothesis.false_rejection_rate"""
+        estimate = hypothesis.false_rejection_rate(100000, seed=0)
+        self.assertAlmostEqual(0.05, estimate.value, delta=0.005)
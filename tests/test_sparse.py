@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from .context import tripp
+from tripp import algebra
+from tripp import naive_bayes
+from tripp.sparse import SparseVector, CSRMatrix
+from tripp import sparse
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+class TestSparse(unittest.TestCase):
+
+    def setUp(self):
+        self.v_dense = [0, 2.0, 0, 0, 3.0, 0, 1.0]
+        self.w_dense = [1.0, 0, 0, 4.0, 5.0, 0, 0]
+        self.v = SparseVector.from_dense(self.v_dense)
+        self.w = SparseVector.from_dict({4: 5.0, 0: 1.0, 3: 4.0}, 7)
+
+    def test_construction(self):
+        """sparse -- canonical form"""
+        self.assertEqual([1, 4, 6], self.v.indices.tolist())
+        self.assertEqual(3, self.w.nnz)
+        self.assertEqual([0, 3, 4], self.w.indices.tolist())
+        repeated = SparseVector([5, 1, 5, 2], [1.0, 2.0, 3.0, 0.0], 6)
+        self.assertEqual(SparseVector([1, 5], [2.0, 4.0], 6), repeated)
+        self.assertEqual(self.v_dense, self.v.to_dense().tolist())
+        self.assertRaises(IndexError, SparseVector, [7], [1.0], 7)
+
+    def test_is_sparse(self):
+        """sparse -- only this module's types take the sparse paths"""
+        self.assertTrue(algebra.is_sparse(self.v))
+        self.assertTrue(algebra.is_sparse(CSRMatrix.from_rows([self.v])))
+
+        class Counted(list):
+            """for testing: a list that happens to have an nnz"""
+            nnz = 2
+        counted = Counted([[1.0, 2.0], [3.0, 4.0]])
+        self.assertFalse(algebra.is_sparse(counted))
+        self.assertEqual([5.0, 11.0], algebra.matvec(counted, [1.0, 2.0]))
+
+    def test_dot(self):
+        """sparse -- dot"""
+        self.assertEqual(15.0, algebra.dot(self.v, self.w))
+        self.assertEqual(15.0, algebra.dot(self.v, self.w_dense))
+        self.assertEqual(15.0, algebra.dot(self.w_dense, self.v))
+        self.assertEqual(0.0, algebra.dot(self.v, SparseVector([], [], 7)))
+        self.assertRaises(ValueError, algebra.dot, self.v, [1, 2])
+
+    def test_vector_add_and_subtract(self):
+        """sparse -- vector_add and vector_subtract"""
+        expected = algebra.vector_add(self.v_dense, self.w_dense)
+        added = algebra.vector_add(self.v, self.w)
+        self.assertTrue(isinstance(added, SparseVector))
+        self.assertEqual(expected, added.to_dense().tolist())
+        self.assertEqual(expected,
+                         algebra.vector_add(self.w_dense, self.v).tolist())
+        expected = algebra.vector_subtract(self.v_dense, self.w_dense)
+        self.assertEqual(expected, algebra.vector_subtract(
+            self.v, self.w).to_dense().tolist())
+        self.assertEqual(expected, algebra.vector_subtract(
+            self.v_dense, self.w).tolist())
+        cancelled = algebra.vector_subtract(self.v, self.v)
+        self.assertEqual(0, cancelled.nnz)
+
+    def test_scalar_multiply(self):
+        """sparse -- scalar_multiply"""
+        result = algebra.scalar_multiply(2, self.v)
+        self.assertEqual([4.0, 6.0, 2.0], result.values.tolist())
+        self.assertEqual(0, algebra.scalar_multiply(0, self.v).nnz)
+
+    def test_squared_distance(self):
+        """sparse -- squared_distance"""
+        expected = algebra.squared_distance(self.v_dense, self.w_dense)
+        self.assertEqual(expected, algebra.squared_distance(self.v, self.w))
+        self.assertEqual(expected,
+                         algebra.squared_distance(self.v, self.w_dense))
+        self.assertEqual(expected,
+                         algebra.squared_distance(self.w_dense, self.v))
+
+    def test_csr_matrix(self):
+        """sparse -- CSRMatrix"""
+        m = CSRMatrix.from_rows([self.v, SparseVector([], [], 7),
+                                 self.w_dense])
+        self.assertEqual((3, 7), m.shape)
+        self.assertEqual(6, m.nnz)
+        self.assertEqual(self.w_dense, m[2].to_dense().tolist())
+        self.assertEqual(self.v, algebra.get_row(m, 0))
+        x = [1, 2, 3, 4, 5, 6, 7]
+        expected = [algebra.dot(self.v_dense, x), 0,
+                    algebra.dot(self.w_dense, x)]
+        self.assertEqual(expected, algebra.matvec(m, x).tolist())
+        self.assertEqual([15.0, 0, 42.0], m.matvec(self.w).tolist())
+
+    def test_text_features(self):
+        """sparse -- count vectors of tokenized messages"""
+        messages = ["Get rich quick", "quick brown fox", "rich fox"]
+        tokens = [naive_bayes.tokenize(m) for m in messages]
+        vocabulary = sparse.build_vocabulary(tokens)
+        self.assertEqual(5, len(vocabulary))
+        rows = [sparse.count_vector(t, vocabulary) for t in tokens]
+        self.assertEqual(1, algebra.dot(rows[0], rows[2]))
+        unknown = sparse.count_vector(["zebra"], vocabulary)
+        self.assertEqual(0, unknown.nnz)
@@ -6,6 +6,8 @@ import unittest
 from .context import tripp
 from tripp import stats
 import logging
+import numpy
+import random
 
 logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
 
@@ -119,3 +121,99 @@ class TestStats(unittest.TestCase):
         """stats -- correlation"""
         result = stats.correlation(self.friends, self.daily_minutes)
         self.assertEqual(0.2474, round(result, 4))
+
+    def test_moments(self):
+        """stats -- Moments"""
+        moments = stats.Moments(iter(self.friends))
+        self.assertEqual(len(self.friends), moments.count)
+        self.assertEqual(7.33333, round(moments.mean, 5))
+        self.assertEqual(81.54, round(moments.variance, 2))
+        self.assertEqual(9.03, round(moments.standard_deviation, 2))
+        self.assertEqual(6.38, round(moments.skew, 2))
+
+    def test_moments_merge(self):
+        """stats -- Moments.merge"""
+        whole = stats.Moments(self.daily_minutes)
+        merged = stats.Moments(self.daily_minutes[:17]).merge(
+            stats.Moments(self.daily_minutes[17:]))
+        self.assertEqual(whole.count, merged.count)
+        self.assertAlmostEqual(whole.mean, merged.mean)
+        self.assertAlmostEqual(whole.variance, merged.variance)
+        self.assertAlmostEqual(whole.skew, merged.skew)
+
+    def test_co_moments_merge(self):
+        """stats -- CoMoments.merge"""
+        pairs = zip(self.friends, self.daily_minutes)
+        merged = stats.CoMoments(pairs[:50]).merge(
+            stats.CoMoments(iter(pairs[50:])))
+        self.assertEqual(22.4254, round(merged.covariance, 4))
+        self.assertEqual(0.2474, round(merged.correlation, 4))
+
+    def test_co_moments_skew(self):
+        """stats -- CoMoments keeps the skew of each stream"""
+        pairs = zip(self.friends, self.daily_minutes)
+        co_moments = stats.CoMoments(pairs)
+        self.assertAlmostEqual(stats.Moments(self.friends).skew,
+                               co_moments.x.skew)
+        self.assertAlmostEqual(stats.Moments(self.daily_minutes).skew,
+                               co_moments.y.skew)
+        merged = stats.CoMoments(pairs[:50]).x.merge(
+            stats.Moments(self.friends[50:]))
+        self.assertAlmostEqual(co_moments.x.skew, merged.skew)
+
+    def test_generator_input(self):
+        """stats -- mean and variance of a generator"""
+        self.assertEqual(7.33333,
+                         round(stats.mean(f for f in self.friends), 5))
+        self.assertEqual(81.54,
+                         round(stats.variance(f for f in self.friends), 2))
+
+    def test_quantiles(self):
+        """stats -- quantiles"""
+        ps = [0.0, 0.10, 0.25, 0.5, 0.75, 0.99]
+        result = stats.quantiles(self.daily_minutes, ps)
+        expected = [sorted(self.daily_minutes)[int(p * 204)] for p in ps]
+        self.assertEqual(expected, result)
+
+    def test_select_matches_sorting(self):
+        """stats -- select"""
+        random.seed(0)
+        values = [random.randint(0, 50) for _ in range(1000)]
+        sorted_values = sorted(values)
+        for k in [0, 1, 499, 500, 998, 999]:
+            self.assertEqual(sorted_values[k], stats.select(values, k))
+            self.assertEqual(sorted_values[k],
+                             stats.select(numpy.array(values), k))
+        self.assertEqual(sorted(values[:17])[16],
+                         stats.select(sorted(values[:17]), 16))
+        self.assertRaises(IndexError, stats.select, values, 1000)
+
+    def test_median_of_even_length(self):
+        """stats -- median of an even number of values"""
+        self.assertEqual(35, stats.median(self.longer_sequence))
+
+    def test_covariance_matrix(self):
+        """stats -- covariance_matrix"""
+        columns = [self.friends, self.daily_minutes,
+                   [1] * len(self.friends)]
+        rows = zip(*columns)
+        result = stats.CovarianceMatrix(iter(rows), block_rows=7, tile=2)
+        covariances = result.covariance()
+        self.assertEqual(len(rows), result.count)
+        self.assertAlmostEqual(stats.variance(self.friends),
+                               covariances[0][0])
+        self.assertAlmostEqual(22.4254, covariances[0][1], places=4)
+        self.assertAlmostEqual(22.4254, covariances[1][0], places=4)
+        self.assertEqual(0, covariances[2][1])
+        correlations = result.correlation()
+        self.assertEqual([1, 1, 0], correlations.diagonal().tolist())
+        self.assertAlmostEqual(0.2474, correlations[1][0], places=4)
+        self.assertEqual([0, 0, 0], correlations[2].tolist())
+
+    def test_covariance_matrix_merge(self):
+        """stats -- CovarianceMatrix.merge"""
+        rows = zip(self.friends, self.daily_minutes)
+        merged = stats.CovarianceMatrix(rows[:100]).merge(
+            stats.CovarianceMatrix(numpy.array(rows[100:])))
+        expected = stats.covariance_matrix(rows)
+        self.assertTrue(numpy.allclose(expected, merged.covariance()))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from .context import tripp
+from tripp import columnar
+from tripp import dimensionality
+from tripp import multiple_regression
+from tripp import streaming
+from tripp.variates import RandomStream
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.directory, "table.csv")
+        random.seed(0)
+        self.rows = []
+        for _ in range(60):
+            x_1, x_2 = random.random(), random.random()
+            self.rows.append([x_1, x_2, 1 + 2 * x_1 - x_2])
+        with open(self.csv_path, "w") as f:
+            f.write("x_1,x_2,y\n")
+            for row in self.rows:
+                f.write(",".join(repr(v) for v in row) + "\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def source(self, **kwargs):
+        return streaming.Source.from_csv(self.csv_path, chunk_rows=7,
+                                         skip_header=True, **kwargs)
+
+    def test_rows_in_order(self):
+        """streaming -- a source reads every row, in chunks"""
+        source = self.source(y_column=2, intercept=True)
+        rows = list(source)
+        self.assertEqual([[1.0] + row[:2] for row in self.rows],
+                         [x_i for x_i, _ in rows])
+        self.assertEqual([row[2] for row in self.rows],
+                         [y_i for _, y_i in rows])
+        self.assertEqual(rows, list(source))
+        chunks = list(streaming.csv_chunks(self.csv_path, 7,
+                                           skip_header=True))
+        self.assertEqual(9, len(chunks))
+        self.assertEqual((4, 3), chunks[-1].shape)
+
+    def test_store_chunks(self):
+        """streaming -- a source over a column store"""
+        store_path = os.path.join(self.directory, "table.store")
+        columnar.convert_csv(self.csv_path, store_path, chunk_rows=25)
+        source = streaming.Source.from_store(
+            columnar.ColumnStore(store_path), chunk_rows=16, x_columns=[0, 1])
+        self.assertEqual([(row[:2], None) for row in self.rows], list(source))
+
+    def test_shuffle_buffer(self):
+        """streaming -- buffered shuffles are permutations, and seeded"""
+        items = range(100)
+        for buffer_size in [1, 10, 1000]:
+            shuffled = list(streaming.shuffle_buffer(iter(items), buffer_size,
+                                                     RandomStream(1)))
+            self.assertEqual(items, sorted(shuffled))
+        self.assertNotEqual(items, shuffled)
+
+        source = self.source(y_column=2, buffer_size=10, seed=3)
+        first, second = list(source.shuffled()), list(source.shuffled())
+        self.assertNotEqual(first, second)
+        self.assertEqual(sorted(first), sorted(list(source)))
+        self.assertEqual(first, list(source.shuffled(0)))
+        self.assertEqual(first + second, list(source.passes(2)))
+
+    def test_read_ahead(self):
+        """streaming -- background reads keep order and raise errors"""
+        self.assertEqual(range(50), list(streaming.read_ahead(iter(range(50)),
+                                                              depth=3)))
+
+        def broken():
+            yield 1
+            raise IOError("disk went away")
+        self.assertRaises(IOError, list, streaming.read_ahead(broken()))
+
+        # a consumer that stops early releases the reading thread
+        reader = streaming.read_ahead(iter(range(1000)), depth=1)
+        self.assertEqual(0, next(reader))
+        reader.close()
+
+    def test_estimate_beta(self):
+        """streaming -- estimate_beta from a file"""
+        random.seed(0)
+        source = self.source(y_column=2, intercept=True, seed=5)
+        beta = multiple_regression.estimate_beta(source, None,
+                                                 optimizer='rmsprop',
+                                                 alpha_0=0.01)
+        for expected, actual in zip([1, 2, -1], beta):
+            self.assertAlmostEqual(expected, actual, places=1)
+
+    def test_first_principal_component(self):
+        """streaming -- first_principal_component_sgd from a file"""
+        with open(self.csv_path, "w") as f:
+            for i in range(20):
+                t = 3 * (i - 10)
+                f.write("{0},{1}\n".format(t, 0.5 * t + (-1) ** i))
+        source = streaming.Source.from_csv(self.csv_path, chunk_rows=8,
+                                           seed=2)
+        w = dimensionality.first_principal_component_sgd(source)
+        self.assertAlmostEqual(1, abs(w[0] / w[1]) / 2, places=1)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import random
+import unittest
+from StringIO import StringIO
+
+from .context import tripp
+from tripp import gradient
+from tripp import multiple_regression
+from tripp import telemetry
+import numpy
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+def rosenbrock(v):
+    """for testing"""
+    return 100 * (v[1] - v[0] ** 2) ** 2 + (1 - v[0]) ** 2
+
+
+class TestTelemetry(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.x = [[1, random.random(), random.random()] for _ in range(20)]
+        self.y = [1 + 2 * x_i[1] - x_i[2] for x_i in self.x]
+
+    def test_batch_trace(self):
+        """telemetry -- minimize_batch reports every iteration"""
+        trace = telemetry.Trace()
+        theta, report = gradient.minimize_batch(
+            rosenbrock, None, [-1.2, 1.0], method='lbfgs', full_output=True,
+            callback=trace)
+        self.assertEqual(telemetry.CONVERGED, trace.stop_reason)
+        self.assertEqual(report.iterations, len(trace))
+        last = trace.iterations[-1]
+        self.assertEqual((report.function_evaluations,
+                          report.gradient_evaluations),
+                         (last.function_evaluations,
+                          last.gradient_evaluations))
+        values = trace.values()
+        self.assertTrue(all(b <= a for a, b in zip(values, values[1:])))
+        self.assertTrue(trace.iterations[0].gradient_norm > 200)
+        self.assertTrue(all(i.step_size > 0 for i in trace.iterations[:-1]))
+
+        untraced = gradient.minimize_batch(rosenbrock, None, [-1.2, 1.0],
+                                           method='lbfgs')
+        self.assertEqual(untraced, theta)
+
+        trace = telemetry.Trace()
+        gradient.minimize_batch(rosenbrock, None, [-1.2, 1.0],
+                                optimizer='adam', alpha=0.1,
+                                max_iterations=5, callback=trace)
+        self.assertEqual(telemetry.MAX_ITERATIONS, trace.stop_reason)
+        self.assertEqual([0.1] * 5, [i.step_size for i in trace.iterations])
+
+    def test_stochastic_trace(self):
+        """telemetry -- minimize_stochastic reports every pass"""
+        iterations = []
+        gradient.minimize_stochastic(
+            multiple_regression.squared_error,
+            multiple_regression.squared_error_gradient,
+            self.x, self.y, [0.0, 0.0, 0.0], 0.01, callback=iterations.append)
+        self.assertEqual(list(range(1, len(iterations) + 1)),
+                         [i.iteration for i in iterations])
+        self.assertEqual([20 * i.iteration for i in iterations],
+                         [i.gradient_evaluations for i in iterations])
+        self.assertTrue(iterations[-1].value < iterations[0].value)
+        self.assertTrue(iterations[-1].step_size < 0.01)
+
+        trace = telemetry.Trace()
+        gradient.minimize_minibatch(
+            multiple_regression.squared_error_batch, None,
+            numpy.array(self.x), numpy.array(self.y), [0.0, 0.0, 0.0], 0.1,
+            batch_size=5, max_epochs=7, seed=1, callback=trace)
+        self.assertEqual(telemetry.MAX_ITERATIONS, trace.stop_reason)
+        self.assertEqual(28, trace.iterations[-1].gradient_evaluations)
+
+    def test_export(self):
+        """telemetry -- traces as JSON and CSV"""
+        trace = telemetry.Trace()
+        gradient.minimize_batch(rosenbrock, None, [-1.2, 1.0],
+                                max_iterations=3, callback=trace)
+        f = StringIO()
+        trace.write_json(f)
+        exported = json.loads(f.getvalue())
+        self.assertEqual('max_iterations', exported['stop_reason'])
+        self.assertEqual([1, 2, 3], [i['iteration']
+                                     for i in exported['iterations']])
+        self.assertAlmostEqual(trace.seconds, exported['seconds'])
+
+        f = StringIO()
+        trace.write_csv(f)
+        rows = list(csv.DictReader(StringIO(f.getvalue())))
+        self.assertEqual(3, len(rows))
+        self.assertEqual(trace.values(), [float(row['value'])
+                                          for row in rows])
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import unittest
+
+from .context import tripp
+from tripp import variates
+from tripp.variates import RandomStream
+import numpy
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+
+def draw_normals(key):
+    seed, stream = key
+    return RandomStream(seed, stream).normal(size=5).tolist()
+
+
+class TestVariates(unittest.TestCase):
+
+    def test_streams_are_reproducible(self):
+        """variates -- same (seed, stream), same draws"""
+        a = RandomStream(42, 3).binomial(1000, 0.5, size=10)
+        b = RandomStream(42, 3).binomial(1000, 0.5, size=10)
+        self.assertEqual(a.tolist(), b.tolist())
+
+    def test_streams_are_distinct(self):
+        """variates -- different streams, different draws"""
+        draws = [RandomStream(42, i).uniform(size=4).tolist()
+                 for i in range(3)]
+        draws += [child.uniform(size=4).tolist()
+                  for child in RandomStream(42, 0).spawn(3)]
+        self.assertEqual(len(draws), len(set(map(tuple, draws))))
+
+    def test_streams_across_processes(self):
+        """variates -- streams reproduce in worker processes"""
+        keys = [(7, i) for i in range(4)]
+        pool = multiprocessing.Pool(2)
+        try:
+            in_pool = pool.map(draw_normals, keys)
+        finally:
+            pool.close()
+            pool.join()
+        self.assertEqual([draw_normals(key) for key in keys], in_pool)
+
+    def test_distributions(self):
+        """variates -- moments of bulk draws"""
+        stream = RandomStream(0)
+        n = 200000
+        flips = stream.bernoulli(0.3, n)
+        self.assertEqual(set([0, 1]), set(flips.tolist()))
+        self.assertAlmostEqual(0.3, flips.mean(), places=2)
+        self.assertTrue(stream.bernoulli(0.3) in (0, 1))
+        self.assertEqual(1, stream.bernoulli(1.0))
+        heads = stream.binomial(1000, 0.5, n)
+        self.assertAlmostEqual(500, heads.mean(), delta=0.2)
+        self.assertAlmostEqual(250, heads.var(), delta=5)
+        normals = stream.normal(3, 2, n)
+        self.assertAlmostEqual(3, normals.mean(), places=1)
+        self.assertAlmostEqual(2, normals.std(), places=1)
+        betas = stream.beta(2, 6, n)
+        self.assertAlmostEqual(0.25, betas.mean(), places=2)
+
+    def test_module_functions_share_a_default_stream(self):
+        """variates -- module-level functions"""
+        variates.seed(5)
+        first = variates.normal(size=3).tolist()
+        variates.seed(5)
+        self.assertEqual(first, variates.normal(size=3).tolist())
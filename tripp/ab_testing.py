@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+import logging
+import math
+import distributions
+import hypothesis
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# streaming A/B tests
+#
+# Each arm keeps only its counts, so an event costs O(1) and every
+# statistic is computed from the counts when asked for. Peeking at
+# the ordinary p-value inflates false positives; the always-valid
+# p-value comes from a mixture sequential probability ratio test
+# (Johari et al., "Always Valid Inference", 2017) and may be checked
+# as often as you like. It is the running minimum over every event,
+# so it is kept up to date as events are recorded, and checking it
+# changes nothing.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+class Arm(object):
+    """click / no-click counts for one variant"""
+    __slots__ = ('trials', 'successes')
+
+    def __init__(self, trials=0, successes=0):
+        self.trials = trials
+        self.successes = successes
+
+    def record(self, clicked):
+        self.trials += 1
+        if clicked:
+            self.successes += 1
+
+    def estimated_parameters(self):
+        return hypothesis.estimated_parameters(self.trials, self.successes)
+
+    def posterior(self, alpha=1, beta=1, probability=0.95):
+        """Beta posterior of the click rate, starting from a
+        Beta(alpha, beta) prior, with a central credible interval"""
+        posterior = distributions.Beta(alpha + self.successes,
+                                       beta + self.trials - self.successes)
+        tail = (1 - probability) / 2
+        return {'alpha': posterior.alpha,
+                'beta': posterior.beta,
+                'mean': posterior.mean,
+                'lower': posterior.ppf(tail),
+                'upper': posterior.ppf(1 - tail)}
+
+
+class Experiment(object):
+    """an A/B test of a control arm against a treatment arm;
+    tau is the standard deviation of the mixing prior on the
+    difference in click rates used by the sequential test"""
+
+    def __init__(self, control='A', treatment='B', tau=0.05, prior=(1, 1)):
+        self.control = control
+        self.treatment = treatment
+        self.tau = tau
+        self.prior = prior
+        self.arms = {control: Arm(), treatment: Arm()}
+        self._always_valid_p_value = 1.0
+
+    def record(self, arm, clicked):
+        self.arms[arm].record(clicked)
+        difference = self._difference()
+        if difference is not None:
+            theta, variance = difference
+            tau2 = self.tau ** 2
+            log_likelihood_ratio = (
+                0.5 * math.log(variance / (variance + tau2)) +
+                tau2 * theta ** 2 / (2 * variance * (variance + tau2)))
+            self._always_valid_p_value = min(
+                self._always_valid_p_value,
+                math.exp(-min(log_likelihood_ratio, 700)))
+
+    def _difference(self):
+        """estimated treatment - control difference and its variance,
+        or None while either variance is still zero"""
+        a, b = self.arms[self.control], self.arms[self.treatment]
+        if not a.trials or not b.trials:
+            return None
+        p_a, sigma_a = a.estimated_parameters()
+        p_b, sigma_b = b.estimated_parameters()
+        variance = sigma_a ** 2 + sigma_b ** 2
+        if variance == 0:
+            return None
+        return p_b - p_a, variance
+
+    def z_score(self):
+        """hypothesis.a_b_test_statistic, from the running counts"""
+        if self._difference() is None:
+            return 0.0
+        a, b = self.arms[self.control], self.arms[self.treatment]
+        return hypothesis.a_b_test_statistic(a.trials, a.successes,
+                                             b.trials, b.successes)
+
+    def p_value(self):
+        """fixed-horizon two-sided p-value; only valid when looked at
+        once, at a sample size chosen in advance"""
+        return hypothesis.two_sided_p_value(self.z_score())
+
+    def always_valid_p_value(self):
+        """mixture-SPRT p-value: the chance it ever drops below alpha
+        under the null is at most alpha, however often it is checked"""
+        return self._always_valid_p_value
+
+    def should_stop(self, alpha=0.05):
+        return self.always_valid_p_value() <= alpha
+
+    def summary(self):
+        alpha, beta = self.prior
+        arms = {}
+        for name, arm in self.arms.items():
+            arms[name] = dict(arm.posterior(alpha, beta),
+                              trials=arm.trials, successes=arm.successes)
+        return {'z_score': self.z_score(),
+                'p_value': self.p_value(),
+                'always_valid_p_value': self.always_valid_p_value(),
+                'arms': arms}
+
+    def snapshot(self):
+        """the whole state, as plain data"""
+        return {'control': self.control,
+                'treatment': self.treatment,
+                'tau': self.tau,
+                'prior': list(self.prior),
+                'counts': dict((name, [arm.trials, arm.successes])
+                               for name, arm in self.arms.items()),
+                'always_valid_p_value': self._always_valid_p_value}
+
+    @classmethod
+    def restore(cls, state):
+        experiment = cls(state['control'], state['treatment'],
+                         state['tau'], tuple(state['prior']))
+        for name, (trials, successes) in state['counts'].items():
+            experiment.arms[name] = Arm(trials, successes)
+        experiment._always_valid_p_value = state['always_valid_p_value']
+        return experiment
+
+
+class ExperimentRegistry(object):
+    """many concurrent experiments, fed by a stream of
+    (experiment, arm, clicked) events"""
+
+    def __init__(self, tau=0.05, prior=(1, 1)):
+        self.tau = tau
+        self.prior = prior
+        self.experiments = {}
+
+    def add(self, name, control='A', treatment='B'):
+        experiment = Experiment(control, treatment, self.tau, self.prior)
+        self.experiments[name] = experiment
+        return experiment
+
+    def handle(self, event):
+        """record one (experiment, arm, clicked) event; a callback
+        that can be driven by any event loop"""
+        name, arm, clicked = event
+        self.experiments[name].record(arm, clicked)
+
+    def ingest(self, events):
+        """record every event from an iterable; returns how many"""
+        count = 0
+        for count, event in enumerate(events, 1):
+            self.handle(event)
+        return count
+
+    def summary(self, name):
+        return self.experiments[name].summary()
+
+    def summaries(self):
+        return dict((name, experiment.summary())
+                    for name, experiment in self.experiments.items())
+
+    def finished(self, alpha=0.05):
+        """names of the experiments whose sequential test has rejected"""
+        return sorted(name for name, experiment in self.experiments.items()
+                      if experiment.should_stop(alpha))
+
+    def snapshot(self):
+        return {'tau': self.tau,
+                'prior': list(self.prior),
+                'experiments': dict(
+                    (name, experiment.snapshot())
+                    for name, experiment in self.experiments.items())}
+
+    @classmethod
+    def restore(cls, state):
+        registry = cls(state['tau'], tuple(state['prior']))
+        for name, experiment in state['experiments'].items():
+            registry.experiments[name] = Experiment.restore(experiment)
+        return registry
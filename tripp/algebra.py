@@ -1,27 +1,107 @@
 # -*- coding: utf-8 -*-
 import math
 import logging
+import numpy as np
+import autodiff
+import columnar
+import sparse
 
 logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
 
 
+class Vector(np.ndarray):
+    """a contiguous array of floats that every function
+    in this module accepts (and returns) in place of a list"""
+    def __new__(cls, values, dtype=float):
+        if not isinstance(values, (list, tuple, np.ndarray)):
+            values = list(values)
+        v = np.ascontiguousarray(values, dtype=dtype)
+        if v.ndim != 1:
+            raise ValueError("a Vector must be one-dimensional")
+        return v.view(cls)
+
+
+class Matrix(np.ndarray):
+    """a contiguous, row-major array of floats;
+    its rows and columns come back as Vectors"""
+    def __new__(cls, rows, dtype=float):
+        if not isinstance(rows, (list, tuple, np.ndarray)):
+            rows = list(rows)
+        a = np.ascontiguousarray(rows, dtype=dtype)
+        if a.ndim != 2:
+            raise ValueError("a Matrix must be two-dimensional")
+        return a.view(cls)
+
+    def __getitem__(self, index):
+        item = np.ndarray.__getitem__(self, index)
+        if isinstance(item, np.ndarray) and item.ndim == 1:
+            return item.view(Vector)
+        return item
+
+    def __array_wrap__(self, out, context=None):
+        """reductions over a Matrix give Vectors or plain numbers"""
+        if out.ndim == 0:
+            return out[()]
+        if out.ndim == 1:
+            return out.view(Vector)
+        return np.ndarray.__array_wrap__(self, out, context)
+
+
+def is_array(v):
+    """true for Vectors, Matrices and any other numpy array"""
+    return isinstance(v, np.ndarray)
+
+
+def is_sparse(v):
+    """true for sparse.SparseVector and sparse.CSRMatrix"""
+    return isinstance(v, (sparse.SparseVector, sparse.CSRMatrix))
+
+
 def vector_add(v, w):
     """adds corresponding vectors"""
+    if is_sparse(v):
+        return v.add(w)
+    if is_sparse(w):
+        return w.add(v)
+    if is_array(v) or is_array(w):
+        return np.add(v, w)
     return [v_i + w_i for v_i, w_i in zip(v, w)]
 
 
 def vector_subtract(v, w):
     """subtracts corresponding elements"""
+    if is_sparse(v):
+        return v.add(w, -1)
+    if is_sparse(w):
+        return scalar_multiply(-1, w.add(v, -1))
+    if is_array(v) or is_array(w):
+        return np.subtract(v, w)
     return [v_i - w_i for v_i, w_i in zip(v, w)]
 
 
 def vector_sum(vectors):
     """sums all corresponding elements"""
-    return reduce(vector_add, vectors)
+    if is_array(vectors):
+        return vectors.sum(axis=0)
+    vectors = iter(vectors)
+    total = next(vectors, None)
+    if total is None:
+        raise TypeError("vector_sum() of an empty sequence")
+    if not is_array(total):
+        return reduce(vector_add, vectors, total)
+    # accumulate in place rather than allocating a new array per vector
+    total = np.array(total, dtype=float)
+    for v in vectors:
+        total += v
+    return total.view(Vector)
 
 
 def scalar_multiply(c, v):
     """c is a number, v is a vector"""
+    if is_sparse(v):
+        return v.scale(c)
+    if is_array(v):
+        return np.multiply(c, v)
     return [c * v_i for v_i in v]
 
 
@@ -36,6 +116,14 @@ def vector_mean(vectors):
 
 def dot(v, w):
     """v_1 * w_1 + ... + v_n * w_n"""
+    if is_sparse(v):
+        return v.dot(w)
+    if is_sparse(w):
+        return w.dot(v)
+    if is_array(v) or is_array(w):
+        if autodiff.is_variable(v) or autodiff.is_variable(w):
+            return autodiff.dot(v, w)
+        return np.dot(v, w)
     return sum(v_i * w_i for v_i, w_i in zip(v, w))
 
 
@@ -50,6 +138,13 @@ def magnitude(v):
 
 def squared_distance(v, w):
     """(v_1 - w_1) ** 2 + ... + (v_n - w_n) ** 2"""
+    if is_sparse(v):
+        return v.squared_distance(w)
+    if is_sparse(w):
+        return w.squared_distance(v)
+    if is_array(v) or is_array(w):
+        difference = np.subtract(v, w)
+        return np.dot(difference, difference)
     return sum_of_squares(vector_subtract(v, w))
 
 
@@ -60,6 +155,9 @@ def distance(v, w):
 
 def shape(a):
     """the shape of a matrix"""
+    _shape = getattr(a, 'shape', None)
+    if isinstance(_shape, tuple) and len(_shape) == 2:
+        return _shape
     _rows = len(a)
     _cols = len(a[0]) if a else 0
     return _rows, _cols
@@ -72,6 +170,10 @@ def get_row(a, i):
 
 def get_column(a, j):
     """the column of a matrix"""
+    if isinstance(a, columnar.ColumnStore):
+        return a.column(j)
+    if is_array(a):
+        return a[:, j]
     return [a_i[j] for a_i in a]
 
 
@@ -81,3 +183,105 @@ def mk_matrix(rows, cols, entry_fn):
     return [[entry_fn(i, j)
              for j in range(cols)]
             for i in range(rows)]
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# matrix products
+#
+# Array arguments are processed a block of rows at a time,
+# so that each block (plus the output it feeds) fits in cache
+# and arrays that are memory-mapped are paged in once, in order.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+BLOCK_BYTES = 2 ** 18
+GRAM_TILE = 64
+
+
+def _block_rows(num_cols, block_rows=None):
+    """how many rows of num_cols floats make up one block"""
+    if block_rows is not None:
+        return max(1, block_rows)
+    return max(1, BLOCK_BYTES // (8 * max(1, num_cols)))
+
+
+def _row_blocks(num_rows, rows_per_block):
+    """generates (start, stop) for consecutive blocks of rows"""
+    for start in range(0, num_rows, rows_per_block):
+        yield start, min(start + rows_per_block, num_rows)
+
+
+def transpose(a, block_rows=None):
+    """the matrix whose (i, j)th entry is the (j, i)th entry of a"""
+    if not is_array(a):
+        return [list(column) for column in zip(*a)]
+    num_rows, num_cols = a.shape
+    result = np.empty((num_cols, num_rows), dtype=np.result_type(a, float))
+    # copy square tiles so both reads and writes stay local
+    tile = int(math.sqrt(_block_rows(1, block_rows)))
+    for i, i_end in _row_blocks(num_rows, tile):
+        for j, j_end in _row_blocks(num_cols, tile):
+            result[j:j_end, i:i_end] = a[i:i_end, j:j_end].T
+    return result.view(Matrix)
+
+
+def matvec(a, v, block_rows=None):
+    """the vector whose ith element is dot(get_row(a, i), v)"""
+    if is_sparse(a):
+        return a.matvec(v)
+    if not (is_array(a) or is_array(v)):
+        return [dot(a_i, v) for a_i in a]
+    a, v = np.asarray(a), np.asarray(v)
+    result = np.empty(a.shape[0], dtype=np.result_type(a, v, float))
+    for start, stop in _row_blocks(a.shape[0],
+                                   _block_rows(a.shape[1], block_rows)):
+        result[start:stop] = np.dot(a[start:stop], v)
+    return result.view(Vector)
+
+
+def matrix_multiply(a, b, block_rows=None):
+    """the rows(a) x cols(b) matrix whose (i, j)th entry
+    is the dot product of row i of a and column j of b"""
+    if not (is_array(a) or is_array(b)):
+        if a and len(a[0]) != len(b):
+            raise ValueError("cannot multiply {0} by {1}"
+                             .format(shape(a), shape(b)))
+        # transpose b once instead of copying a column per entry
+        b_columns = transpose(b)
+        return [[dot(a_i, b_j) for b_j in b_columns] for a_i in a]
+    a, b = np.asarray(a), np.asarray(b)
+    if a.shape[1] != b.shape[0]:
+        raise ValueError("cannot multiply {0} by {1}"
+                         .format(a.shape, b.shape))
+    result = np.empty((a.shape[0], b.shape[1]),
+                      dtype=np.result_type(a, b, float))
+    for start, stop in _row_blocks(a.shape[0],
+                                   _block_rows(a.shape[1], block_rows)):
+        result[start:stop] = np.dot(a[start:stop], b)
+    return result.view(Matrix)
+
+
+def gram_matrix(a, block_rows=None):
+    """the cols x cols matrix transpose(a) * a,
+    whose (i, j)th entry is the dot product of columns i and j;
+    only the upper triangle is computed, and the lower one mirrors it"""
+    if not is_array(a):
+        columns = transpose(a)
+        num_cols = len(columns)
+        result = [[0] * num_cols for _ in range(num_cols)]
+        for i in range(num_cols):
+            for j in range(i, num_cols):
+                result[i][j] = result[j][i] = dot(columns[i], columns[j])
+        return result
+    num_rows, num_cols = a.shape
+    result = np.zeros((num_cols, num_cols), dtype=np.result_type(a, float))
+    for start, stop in _row_blocks(num_rows,
+                                   _block_rows(num_cols, block_rows)):
+        block = np.asarray(a[start:stop])
+        # a strip of GRAM_TILE columns against those from its diagonal on
+        for i, i_end in _row_blocks(num_cols, GRAM_TILE):
+            result[i:i_end, i:] += np.dot(block[:, i:i_end].T, block[:, i:])
+    upper = np.triu(result)
+    result = upper + np.triu(upper, 1).T
+    return result.view(Matrix)
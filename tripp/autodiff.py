@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""reverse-mode automatic differentiation
+
+A Tape records each operation on Variables as it is evaluated,
+along with a rule carrying the gradient of the result back to its
+operands. One backward sweep over the tape then gives the gradient of
+a function at a few times the cost of evaluating it, however many
+coordinates there are. Values may be numbers or numpy arrays, so a
+loss written over a whole batch of rows is differentiated at once."""
+from functools import partial
+import numpy as np
+
+
+class Tape(object):
+    """the Variables of one evaluation, in the order they were computed"""
+
+    def __init__(self):
+        self.variables = []
+
+    def variable(self, value):
+        """an input Variable"""
+        return Variable(value, self)
+
+    def gradient(self, output, wrt):
+        """the gradient of the scalar Variable output with respect to
+        the Variable wrt"""
+        if np.ndim(output.value) != 0:
+            raise ValueError("can only differentiate a scalar output")
+        gradients = [None] * len(self.variables)
+        gradients[output.index] = 1.0
+        owned = set()
+        # only variables computed after wrt can depend on it
+        for v in reversed(self.variables[wrt.index:output.index + 1]):
+            g = gradients[v.index]
+            if g is None:
+                continue
+            for parent, rule in zip(v.parents, v.rules):
+                _accumulate(gradients, owned, parent, rule(g))
+        if gradients[wrt.index] is None:
+            return np.zeros(np.shape(wrt.value))
+        return gradients[wrt.index]
+
+
+class _Slot(object):
+    """the gradient of an indexed part of an array"""
+    __slots__ = ['index', 'gradient']
+
+    def __init__(self, index, gradient):
+        self.index = index
+        self.gradient = gradient
+
+
+def _accumulate(gradients, owned, parent, contribution):
+    i = parent.index
+    if isinstance(contribution, _Slot):
+        # add in place, into an array only this sweep refers to
+        if i not in owned:
+            total = np.zeros(np.shape(parent.value))
+            if gradients[i] is not None:
+                total += gradients[i]
+            gradients[i] = total
+            owned.add(i)
+        if isinstance(contribution.index, (int, long, slice)):
+            gradients[i][contribution.index] += contribution.gradient
+        else:
+            # repeated indexes must each add their share
+            np.add.at(gradients[i], contribution.index,
+                      contribution.gradient)
+    elif gradients[i] is None:
+        gradients[i] = contribution
+    else:
+        gradients[i] = gradients[i] + contribution
+        if isinstance(gradients[i], np.ndarray):
+            owned.add(i)
+
+
+def is_variable(x):
+    return hasattr(x, 'tape')
+
+
+def _value(x):
+    return x.value if is_variable(x) else x
+
+
+def _unbroadcast(gradient, shape):
+    """gradient summed down to shape, undoing numpy's broadcasting"""
+    if np.shape(gradient) == shape:
+        return gradient
+    gradient = np.asarray(gradient)
+    while gradient.ndim > len(shape):
+        gradient = gradient.sum(axis=0)
+    for axis, size in enumerate(shape):
+        if size == 1 and gradient.shape[axis] != 1:
+            gradient = gradient.sum(axis=axis, keepdims=True)
+    return gradient
+
+
+def _record(value, *operands):
+    """value, as a Variable computed from the (operand, rule) pairs;
+    each rule maps the gradient of value to that of its operand"""
+    traced = [(x, rule) for x, rule in operands if is_variable(x)]
+    return Variable(value, traced[0][0].tape,
+                    [x for x, _ in traced], [rule for _, rule in traced])
+
+
+def _binary(a, b, value, rule_a, rule_b):
+    shape_a, shape_b = np.shape(_value(a)), np.shape(_value(b))
+    return _record(value,
+                   (a, lambda g: _unbroadcast(rule_a(g), shape_a)),
+                   (b, lambda g: _unbroadcast(rule_b(g), shape_b)))
+
+
+def add(a, b):
+    return _binary(a, b, _value(a) + _value(b), lambda g: g, lambda g: g)
+
+
+def subtract(a, b):
+    return _binary(a, b, _value(a) - _value(b), lambda g: g, lambda g: -g)
+
+
+def multiply(a, b):
+    a_value, b_value = _value(a), _value(b)
+    return _binary(a, b, a_value * b_value,
+                   lambda g: g * b_value, lambda g: g * a_value)
+
+
+def divide(a, b):
+    a_value, b_value = _value(a), np.asarray(_value(b), dtype=float)
+    value = a_value / b_value
+    return _binary(a, b, value,
+                   lambda g: g / b_value, lambda g: -g * value / b_value)
+
+
+def power(a, b):
+    a_value, b_value = _value(a), _value(b)
+    value = a_value ** b_value
+    return _binary(a, b, value,
+                   lambda g: g * b_value * a_value ** (b_value - 1),
+                   lambda g: g * value * np.log(a_value))
+
+
+def dot(a, b):
+    """np.dot of vectors and matrices, any of which may be Variables"""
+    a_value, b_value = np.asarray(_value(a)), np.asarray(_value(b))
+    value = np.dot(a_value, b_value)
+    if not (is_variable(a) or is_variable(b)):
+        return value
+    if b_value.ndim == 1:
+        rule_a = lambda g: np.multiply.outer(g, b_value)
+        rule_b = lambda g: np.dot(g, a_value)
+    elif a_value.ndim == 1:
+        rule_a = lambda g: np.dot(b_value, g)
+        rule_b = lambda g: np.multiply.outer(a_value, g)
+    else:
+        rule_a = lambda g: np.dot(g, b_value.T)
+        rule_b = lambda g: np.dot(a_value.T, g)
+    return _record(value, (a, rule_a), (b, rule_b))
+
+
+def _elementwise(function, derivative):
+    """function of numbers or arrays, extended to Variables;
+    derivative(x, value) is d function(x) / dx"""
+    def f(x):
+        if not is_variable(x):
+            return function(x)
+        value = function(x.value)
+        return _record(value, (x, lambda g: g * derivative(x.value, value)))
+    f.__name__ = function.__name__
+    return f
+
+
+exp = _elementwise(np.exp, lambda x, value: value)
+log = _elementwise(np.log, lambda x, value: 1 / x)
+sqrt = _elementwise(np.sqrt, lambda x, value: 0.5 / value)
+tanh = _elementwise(np.tanh, lambda x, value: 1 - value ** 2)
+
+
+def _logistic(x):
+    return 1 / (1 + np.exp(-x))
+
+logistic = _elementwise(_logistic, lambda x, value: value * (1 - value))
+
+
+def logaddexp(a, b):
+    """log(exp(a) + exp(b)), without overflow"""
+    a_value, b_value = _value(a), _value(b)
+    value = np.logaddexp(a_value, b_value)
+    if not (is_variable(a) or is_variable(b)):
+        return value
+    return _binary(a, b, value,
+                   lambda g: g * np.exp(a_value - value),
+                   lambda g: g * np.exp(b_value - value))
+
+
+class Variable(object):
+    """a number or array computed on a Tape; supports arithmetic,
+    indexing, iteration, sum and dot. Converting one to a float
+    raises TypeError rather than silently losing its gradient, so use
+    the functions of this module in place of those of math."""
+
+    # numpy arrays defer to our operators rather than broadcasting
+    # over us as an object
+    __array_priority__ = 100
+
+    def __init__(self, value, tape, parents=(), rules=()):
+        self.value = value
+        self.tape = tape
+        self.parents = parents
+        self.rules = rules
+        self.index = len(tape.variables)
+        tape.variables.append(self)
+
+    def __repr__(self):
+        return "Variable({0!r})".format(self.value)
+
+    @property
+    def shape(self):
+        return np.shape(self.value)
+
+    @property
+    def T(self):
+        return _record(np.transpose(self.value), (self, np.transpose))
+
+    def __float__(self):
+        raise TypeError("a Variable has no float value; use the functions "
+                        "of autodiff in place of those of math")
+
+    def __len__(self):
+        return len(self.value)
+
+    def __getitem__(self, index):
+        return _record(self.value[index],
+                       (self, lambda g: _Slot(index, g)))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def sum(self, axis=None):
+        shape = self.shape
+
+        def rule(g):
+            if axis is not None:
+                g = np.expand_dims(g, axis)
+            return g * np.ones(shape)
+        return _record(np.sum(self.value, axis), (self, rule))
+
+    def dot(self, other):
+        return dot(self, other)
+
+    def __add__(self, other):
+        return add(self, other)
+
+    def __radd__(self, other):
+        return add(other, self)
+
+    def __sub__(self, other):
+        return subtract(self, other)
+
+    def __rsub__(self, other):
+        return subtract(other, self)
+
+    def __mul__(self, other):
+        return multiply(self, other)
+
+    def __rmul__(self, other):
+        return multiply(other, self)
+
+    def __div__(self, other):
+        return divide(self, other)
+
+    def __rdiv__(self, other):
+        return divide(other, self)
+
+    __truediv__ = __div__
+    __rtruediv__ = __rdiv__
+
+    def __pow__(self, other):
+        return power(self, other)
+
+    def __rpow__(self, other):
+        return power(other, self)
+
+    def __neg__(self):
+        return _record(-self.value, (self, lambda g: -g))
+
+    def __abs__(self):
+        return _record(abs(self.value),
+                       (self, lambda g: g * np.sign(self.value)))
+
+    def __lt__(self, other):
+        return self.value < _value(other)
+
+    def __le__(self, other):
+        return self.value <= _value(other)
+
+    def __gt__(self, other):
+        return self.value > _value(other)
+
+    def __ge__(self, other):
+        return self.value >= _value(other)
+
+
+def _value_and_gradient(f, argnum, *args):
+    args = list(args)
+    theta = args[argnum]
+    tape = Tape()
+    wrt = args[argnum] = tape.variable(np.array(theta, dtype=float))
+    output = f(*args)
+    if is_variable(output):
+        value, gradient = output.value, tape.gradient(output, wrt)
+    else:
+        value, gradient = output, np.zeros(np.shape(wrt.value))
+    if isinstance(theta, list):
+        gradient = np.asarray(gradient).tolist()
+    elif np.ndim(theta) == 0:
+        gradient = float(gradient)
+    return value, gradient
+
+
+def _gradient(f, argnum, *args):
+    return _value_and_gradient(f, argnum, *args)[1]
+
+
+def value_and_gradient(f, argnum=0):
+    """a function of the same arguments as f that returns f's value
+    and its gradient with respect to argument argnum (a number, list
+    or array; the gradient has the same type). f must compute its
+    result from that argument with arithmetic, indexing and the
+    functions of this module. The returned function pickles whenever
+    f does, so it can be sent to worker processes."""
+    return partial(_value_and_gradient, f, argnum)
+
+
+def gradient(f, argnum=0):
+    """the gradient of f with respect to argument argnum, as a function
+    of the same arguments as f (see value_and_gradient)"""
+    return partial(_gradient, f, argnum)
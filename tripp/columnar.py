@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""numeric tables stored column by column in memory-mapped files
+
+A CSV is converted once, with convert_csv, into a directory holding
+one raw binary file per column plus a small JSON description;
+ColumnStore reopens it without reading any data, and each column is
+a read-only numpy memmap that is paged in only when it is used."""
+import csv
+import json
+import numbers
+import os
+import numpy as np
+
+_META = "meta.json"
+_VERSION = 1
+
+
+def _to_float(value):
+    """the float value of a CSV field; nan if it doesn't parse"""
+    try:
+        return float(value)
+    except ValueError:
+        return float('nan')
+
+
+def _column_path(path, j):
+    return os.path.join(path, "{0}.bin".format(j))
+
+
+def convert_csv(csv_path, store_path, columns=None, delimiter=',',
+                header=True, dtype='float64', chunk_rows=65536):
+    """converts (the named or numbered columns of) a CSV file into a
+    column store at store_path, reading chunk_rows rows at a time;
+    fields that don't parse as numbers are stored as nan"""
+    dtype = np.dtype(dtype)
+    if not os.path.isdir(store_path):
+        os.makedirs(store_path)
+
+    with open(csv_path, 'rb') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        names = next(reader) if header else None
+        first = None
+        if names is None:
+            first = next(reader, None)
+            names = [str(j) for j in range(len(first) if first else 0)]
+        if columns is None:
+            positions = range(len(names))
+        else:
+            positions = [c if isinstance(c, int) else names.index(c)
+                         for c in columns]
+
+        outputs = [open(_column_path(store_path, j), 'wb')
+                   for j in range(len(positions))]
+        num_rows = 0
+        try:
+            chunk = [first] if first else []
+            for row in reader:
+                chunk.append(row)
+                if len(chunk) == chunk_rows:
+                    num_rows += _write_chunk(chunk, positions, outputs, dtype)
+                    chunk = []
+            num_rows += _write_chunk(chunk, positions, outputs, dtype)
+        finally:
+            for output in outputs:
+                output.close()
+
+    meta = {"version": _VERSION,
+            "columns": [names[p] for p in positions],
+            "dtype": dtype.str,
+            "num_rows": num_rows}
+    with open(os.path.join(store_path, _META), 'w') as f:
+        json.dump(meta, f)
+    return ColumnStore(store_path)
+
+
+def _write_chunk(rows, positions, outputs, dtype):
+    """appends each column of rows to its file; returns len(rows)"""
+    if not rows:
+        return 0
+    for position, output in zip(positions, outputs):
+        values = np.array([_to_float(row[position]) for row in rows],
+                          dtype=dtype)
+        values.tofile(output)
+    return len(rows)
+
+
+class ColumnStore(object):
+    """a read-only table whose columns are memory-mapped arrays;
+    algebra.shape, algebra.get_column, stats and munge.scale
+    accept it in place of a list of rows"""
+    def __init__(self, path):
+        with open(os.path.join(path, _META)) as f:
+            meta = json.load(f)
+        if meta.get("version") != _VERSION:
+            raise ValueError("unsupported column store version: {0}"
+                             .format(meta.get("version")))
+        self.path = path
+        self.columns = [str(name) for name in meta["columns"]]
+        self.dtype = np.dtype(str(meta["dtype"]))
+        self.num_rows = meta["num_rows"]
+        self._mapped = {}
+
+    @property
+    def shape(self):
+        return self.num_rows, len(self.columns)
+
+    def __len__(self):
+        return self.num_rows
+
+    def column(self, j):
+        """column j (a position or a name) as a read-only memmap;
+        no data is read until its elements are used"""
+        if isinstance(j, numbers.Integral):
+            j = int(j)
+        else:
+            j = self.columns.index(j)
+        if j not in self._mapped:
+            if self.num_rows == 0:
+                self._mapped[j] = np.zeros(0, dtype=self.dtype)
+            else:
+                self._mapped[j] = np.memmap(_column_path(self.path, j),
+                                            dtype=self.dtype, mode='r',
+                                            shape=(self.num_rows,))
+        return self._mapped[j]
+
+    def __getitem__(self, j):
+        return self.column(j)
+
+    def rows(self, start=0, stop=None):
+        """rows [start, stop) as a (copied) 2-d array"""
+        stop = self.num_rows if stop is None else stop
+        return np.column_stack([self.column(j)[start:stop]
+                                for j in range(len(self.columns))])
@@ -1,5 +1,6 @@
 import algebra
 import gradient
+import streaming
 from functools import partial
 
 
@@ -30,25 +31,82 @@ def directional_variance_gradient(X, w):
                               for x_i in X)
 
 
-def first_principal_component(X):
-    """the direction that maximizes the directional_variance function"""
+def directional_variance_exact_gradient(X, w):
+    """the gradient of directional_variance with respect to w itself;
+    directional_variance_gradient differentiates with respect to the
+    direction, which fixed steps tolerate but line searches don't"""
+    mag = algebra.magnitude(w)
+    d = direction(w)
+    projections = [algebra.dot(x_i, d) for x_i in X]
+    along_rows = algebra.vector_sum(algebra.scalar_multiply(2 * p_i / mag,
+                                                            x_i)
+                                    for p_i, x_i in zip(projections, X))
+    along_w = algebra.scalar_multiply(
+        2 * sum(p_i ** 2 for p_i in projections) / mag, d)
+    return algebra.vector_subtract(along_rows, along_w)
+
+
+def first_principal_component(X, line_search=None,
+                              method='gradient_descent'):
+    """the direction that maximizes the directional_variance function;
+    line_search and method are as for gradient.minimize_batch"""
     guess = [1 for _ in X[0]]
+    if line_search is None and method == 'gradient_descent':
+        gradient_fn = directional_variance_gradient
+    else:
+        gradient_fn = directional_variance_exact_gradient
     unscaled_maximizer = gradient.maximize_batch(
         partial(directional_variance, X),
-        partial(directional_variance_gradient, X),
-        guess
+        partial(gradient_fn, X),
+        guess,
+        line_search=line_search,
+        method=method
     )
     return direction(unscaled_maximizer)
 
 
 def first_principal_component_sgd(X):
     """there is no 'y' value, so we pass in a vector of Nones
-    and functions that ignore that input"""
-    guess = [1 for _ in X[0]]
+    and functions that ignore that input; X may be a
+    streaming.Source, whose rows are streamed instead"""
+    if streaming.is_source(X):
+        guess = [1 for _ in X.first()[0]]
+        ys = None
+    else:
+        guess = [1 for _ in X[0]]
+        ys = [None for _ in X]
     unscaled_maximizer = gradient.maximize_stochastic(
         lambda x, _, w: directional_variance_i(x, w),
         lambda x, _, w: directional_variance_gradient_i(x, w),
         X,
-        [None for _ in X],
+        ys,
         guess)
     return direction(unscaled_maximizer)
+
+
+def directional_variance_batch(X, _, w):
+    """directional_variance over an array of rows X"""
+    projections = X.dot(direction(w))
+    return projections.dot(projections)
+
+
+def directional_variance_batch_gradient(X, _, w):
+    """the sum of directional_variance_gradient_i over an array of rows"""
+    return 2 * X.T.dot(X.dot(direction(w)))
+
+
+def first_principal_component_minibatch(X, alpha_0=0.01, batch_size=32,
+                                        max_epochs=100, seed=None):
+    """first_principal_component_sgd, a vectorized batch at a time"""
+    guess = [1 for _ in X[0]]
+    unscaled_maximizer = gradient.maximize_minibatch(
+        directional_variance_batch,
+        directional_variance_batch_gradient,
+        X,
+        None,
+        guess,
+        alpha_0,
+        batch_size=batch_size,
+        max_epochs=max_epochs,
+        seed=seed)
+    return direction(unscaled_maximizer)
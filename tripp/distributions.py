@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+import logging
+import math
+import numpy as np
+import probability
+
+logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# frozen distributions
+#
+# Each object fixes its parameters once and precomputes whatever
+# constants its density needs, so repeated evaluation only pays for
+# the part that depends on x. pdf, logpdf, cdf, sf and ppf accept a
+# number or a numpy array and return the same.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+_LOG_SQRT_TWO_PI = 0.5 * math.log(2 * math.pi)
+_SQRT_TWO = math.sqrt(2)
+
+# Cody's rational approximations to the normal tail ("Rational Chebyshev
+# Approximations for the Error Function", 1969), as arranged in R's pnorm
+_CODY_CENTRAL = ([2.2352520354606839287, 161.02823106855587881,
+                  1067.6894854603709582, 18154.981253343561249,
+                  0.065682337918207449113],
+                 [47.20258190468824187, 976.09855173777669322,
+                  10260.932208618978205, 45507.789335026729956])
+_CODY_MIDDLE = ([0.39894151208813466764, 8.8831497943883759412,
+                 93.506656132177855979, 597.27027639480026226,
+                 2494.5375852903726711, 6848.1904505362823326,
+                 11602.651437647350124, 9842.7148383839780218,
+                 1.0765576773720192317e-8],
+                [22.266688044328115691, 235.38790178262499861,
+                 1519.377599407554805, 6485.558298266760755,
+                 18615.571640885098091, 34900.952721145977266,
+                 38912.003286093271411, 19685.429676859990727])
+_CODY_TAIL = ([0.21589853405795699, 0.1274011611602473639,
+               0.022235277870649807, 0.001421619193227893466,
+               2.9112874951168792e-5, 0.02307344176494017303],
+              [1.28426009614491121, 0.468238212480865118,
+               0.0659881378689285515, 0.00378239633202758244,
+               7.29751555083966205e-5])
+
+
+def _is_number(x):
+    """cheaper than np.ndim for the common scalar call"""
+    return isinstance(x, (int, float))
+
+
+def _as_array(x):
+    return np.asarray(x, dtype=float)
+
+
+def _result(x):
+    """a plain float for scalar input, the array otherwise"""
+    return float(x) if np.ndim(x) == 0 else x
+
+
+def _cody_sum(coefficients, x):
+    """Cody's nested form of the numerator and denominator"""
+    numerator, denominator = coefficients
+    top, bottom = numerator[-1] * x, x
+    for a, b in zip(numerator[:-2], denominator[:-1]):
+        top = (top + a) * x
+        bottom = (bottom + b) * x
+    return (top + numerator[-2]) / (bottom + denominator[-1])
+
+
+def _gaussian_factor(y):
+    """exp(-y * y / 2), split to keep the rounding of y * y out of it"""
+    rounded = np.trunc(y * 16) / 16
+    return (np.exp(-rounded * rounded / 2) *
+            np.exp(-(y - rounded) * (y + rounded) / 2))
+
+
+def normal_tail(y):
+    """P(Z > y) for a standard normal Z and an array of y >= 0,
+    to about 1e-13 relative accuracy all the way to underflow"""
+    y = _as_array(y)
+    result = np.zeros_like(y)
+
+    with np.errstate(invalid='ignore'):
+        central = y <= 0.67448975
+        middle = ~central & (y <= math.sqrt(32))
+    y_c = y[central]
+    result[central] = 0.5 - y_c * _cody_sum(_CODY_CENTRAL, y_c * y_c)
+
+    y_m = y[middle]
+    result[middle] = _gaussian_factor(y_m) * _cody_sum(_CODY_MIDDLE, y_m)
+
+    tail = ~central & ~middle & np.isfinite(y)
+    y_t = y[tail]
+    inverse_square = 1 / (y_t * y_t)
+    result[tail] = (_gaussian_factor(y_t) / y_t *
+                    (1 / math.sqrt(2 * math.pi) - inverse_square *
+                     _cody_sum(_CODY_TAIL, inverse_square)))
+    result[np.isnan(y)] = np.nan
+    return result
+
+
+def log_beta_function(alpha, beta):
+    """log B(alpha, beta), finite even where B itself overflows"""
+    return math.lgamma(alpha) + math.lgamma(beta) - math.lgamma(alpha + beta)
+
+
+def _continued_fraction(a, b, x, max_iterations=300, epsilon=1e-15):
+    """the continued fraction for the incomplete beta function
+    (modified Lentz's method), over arrays"""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1, a - 1
+    c = np.ones_like(x)
+    d = 1 - qab * x / qap
+    d = 1 / np.where(np.abs(d) < tiny, tiny, d)
+    h = d.copy()
+    for m in range(1, max_iterations + 1):
+        m2 = 2 * m
+        for numerator in (m * (b - m) * x / ((qam + m2) * (a + m2)),
+                          -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))):
+            d = 1 + numerator * d
+            d = 1 / np.where(np.abs(d) < tiny, tiny, d)
+            c = 1 + numerator / c
+            c = np.where(np.abs(c) < tiny, tiny, c)
+            delta = d * c
+            h *= delta
+        if np.all(np.abs(delta - 1) < epsilon):
+            break
+    return h
+
+
+def regularized_incomplete_beta(x, alpha, beta):
+    """I_x(alpha, beta), the cdf of a Beta(alpha, beta) at x"""
+    x = np.clip(_as_array(x), 0, 1)
+    result = np.where(x < 1, 0.0, 1.0)
+    inside = (x > 0) & (x < 1)
+    xi = x[inside]
+    log_front = (alpha * np.log(xi) + beta * np.log1p(-xi) -
+                 log_beta_function(alpha, beta))
+    # the fraction converges quickly on the near side of the mean
+    direct = xi < (alpha + 1) / (alpha + beta + 2)
+    values = np.empty_like(xi)
+    values[direct] = (np.exp(log_front[direct]) / alpha *
+                      _continued_fraction(alpha, beta, xi[direct]))
+    values[~direct] = 1 - (np.exp(log_front[~direct]) / beta *
+                           _continued_fraction(beta, alpha, 1 - xi[~direct]))
+    result[inside] = values
+    return _result(result)
+
+
+class _Distribution(object):
+
+    def pdf(self, x):
+        return _result(np.exp(self.logpdf(x)))
+
+    def sf(self, x):
+        """P(X > x)"""
+        return _result(1 - _as_array(self.cdf(x)))
+
+    def _check_probability(self, p):
+        p = _as_array(p)
+        if np.any((p < 0) | (p > 1)):
+            raise ValueError("probabilities must lie in [0, 1]")
+        return p
+
+
+class Normal(_Distribution):
+    """Normal(mu, sigma)"""
+
+    def __init__(self, mu=0, sigma=1):
+        if sigma <= 0:
+            raise ValueError("sigma must be positive")
+        self.mu = mu
+        self.sigma = sigma
+        self.mean = mu
+        self.variance = sigma ** 2
+        self._log_normalizer = math.log(sigma) + _LOG_SQRT_TWO_PI
+        self._normalizer = 1 / (sigma * math.sqrt(2 * math.pi))
+        self._scale = sigma * _SQRT_TWO
+
+    def __repr__(self):
+        return "Normal(mu={0}, sigma={1})".format(self.mu, self.sigma)
+
+    def pdf(self, x):
+        if _is_number(x):
+            z = (x - self.mu) / self.sigma
+            return self._normalizer * math.exp(-z * z / 2)
+        z = (_as_array(x) - self.mu) / self.sigma
+        return _result(self._normalizer * np.exp(-z * z / 2))
+
+    def logpdf(self, x):
+        z = (_as_array(x) - self.mu) / self.sigma
+        return _result(-z * z / 2 - self._log_normalizer)
+
+    def cdf(self, x):
+        # erfc keeps full relative accuracy far into the lower tail
+        if _is_number(x):
+            return math.erfc((self.mu - x) / self._scale) / 2
+        z = (_as_array(x) - self.mu) / self.sigma
+        tail = normal_tail(np.abs(z))
+        with np.errstate(invalid='ignore'):
+            return _result(np.where(z < 0, tail, 1 - tail))
+
+    def sf(self, x):
+        if _is_number(x):
+            return math.erfc((x - self.mu) / self._scale) / 2
+        z = (_as_array(x) - self.mu) / self.sigma
+        tail = normal_tail(np.abs(z))
+        with np.errstate(invalid='ignore'):
+            return _result(np.where(z > 0, tail, 1 - tail))
+
+    def ppf(self, p):
+        if _is_number(p):
+            return probability.inverse_normal_cdf(p, self.mu, self.sigma)
+        return _result(probability.inverse_normal_cdf(
+            self._check_probability(p), self.mu, self.sigma))
+
+
+class Uniform(_Distribution):
+    """Uniform(lo, hi), on the half-open interval [lo, hi)"""
+
+    def __init__(self, lo=0, hi=1):
+        if hi <= lo:
+            raise ValueError("hi must be greater than lo")
+        self.lo = lo
+        self.hi = hi
+        self.mean = (lo + hi) / 2
+        self.variance = (hi - lo) ** 2 / 12
+        self._width = hi - lo
+        self._density = 1 / self._width
+        self._log_density = -math.log(self._width)
+
+    def __repr__(self):
+        return "Uniform(lo={0}, hi={1})".format(self.lo, self.hi)
+
+    def _inside(self, x):
+        return (x >= self.lo) & (x < self.hi)
+
+    def pdf(self, x):
+        x = _as_array(x)
+        return _result(np.where(self._inside(x), self._density, 0.0))
+
+    def logpdf(self, x):
+        x = _as_array(x)
+        return _result(np.where(self._inside(x), self._log_density, -np.inf))
+
+    def cdf(self, x):
+        x = _as_array(x)
+        return _result(np.clip((x - self.lo) / self._width, 0, 1))
+
+    def sf(self, x):
+        x = _as_array(x)
+        return _result(np.clip((self.hi - x) / self._width, 0, 1))
+
+    def ppf(self, p):
+        return _result(self.lo + self._width * self._check_probability(p))
+
+
+class Beta(_Distribution):
+    """Beta(alpha, beta), on [0, 1]"""
+
+    def __init__(self, alpha, beta):
+        if alpha <= 0 or beta <= 0:
+            raise ValueError("alpha and beta must be positive")
+        self.alpha = alpha
+        self.beta = beta
+        self.mean = alpha / (alpha + beta)
+        self.variance = (alpha * beta /
+                         ((alpha + beta) ** 2 * (alpha + beta + 1)))
+        self._log_normalizer = log_beta_function(alpha, beta)
+
+    def __repr__(self):
+        return "Beta(alpha={0}, beta={1})".format(self.alpha, self.beta)
+
+    def logpdf(self, x):
+        x = _as_array(x)
+        result = np.full(x.shape, -np.inf)
+        inside = (x >= 0) & (x <= 1)
+        xi = x[inside]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # an exponent of zero contributes nothing, even at log(0)
+            log_x = np.where(self.alpha == 1, 0.0,
+                             (self.alpha - 1) * np.log(xi))
+            log_1mx = np.where(self.beta == 1, 0.0,
+                               (self.beta - 1) * np.log1p(-xi))
+        result[inside] = log_x + log_1mx - self._log_normalizer
+        return _result(result)
+
+    def cdf(self, x):
+        return regularized_incomplete_beta(x, self.alpha, self.beta)
+
+    def sf(self, x):
+        return regularized_incomplete_beta(1 - _as_array(x),
+                                           self.beta, self.alpha)
+
+    def ppf(self, p, tolerance=1e-12):
+        """by bisection on the cdf, for every element of p at once"""
+        p = self._check_probability(p)
+        lo, hi = np.zeros_like(p), np.ones_like(p)
+        while np.any(hi - lo > tolerance):
+            mid = (lo + hi) / 2
+            below = _as_array(self.cdf(mid)) < p
+            lo = np.where(below, mid, lo)
+            hi = np.where(below, hi, mid)
+        return _result((lo + hi) / 2)
+
+
+class Binomial(_Distribution):
+    """Binomial(n, p), the number of successes in n trials;
+    pdf and logpdf are the probability mass at integer k"""
+
+    def __init__(self, n, p):
+        if not 0 <= p <= 1:
+            raise ValueError("p must lie in [0, 1]")
+        self.n = n
+        self.p = p
+        self.mean = n * p
+        self.variance = n * p * (1 - p)
+
+    def __repr__(self):
+        return "Binomial(n={0}, p={1})".format(self.n, self.p)
+
+    def logpdf(self, k):
+        return _result(probability.binomial_log_pmf(k, self.n, self.p))
+
+    def pdf(self, k):
+        return _result(probability.binomial_pmf(k, self.n, self.p))
+
+    pmf = pdf
+    logpmf = logpdf
+
+    def cdf(self, k):
+        return _result(probability.binomial_cdf(k, self.n, self.p))
+
+    def sf(self, k):
+        return _result(probability.binomial_sf(k, self.n, self.p))
+
+    def ppf(self, q):
+        """the smallest k with cdf(k) >= q, for every element of q"""
+        q = self._check_probability(q)
+        lo = np.zeros(q.shape, dtype=int)
+        hi = np.full(q.shape, self.n, dtype=int)
+        while np.any(lo < hi):
+            mid = (lo + hi) // 2
+            enough = _as_array(self.cdf(mid)) >= q
+            lo = np.where(enough, lo, mid + 1)
+            hi = np.where(enough, mid, hi)
+        return int(lo) if lo.ndim == 0 else lo
+
+
+STANDARD_NORMAL = Normal()
@@ -1,6 +1,14 @@
+from collections import namedtuple
 import random
 import logging
+import time
+import numpy as np
 import algebra
+import autodiff
+import streaming
+import telemetry
+from telemetry import Iteration
+from variates import RandomStream
 
 logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
 
@@ -17,8 +25,8 @@ def difference_quotient(f, x, h):
 
 def step(v, direction, step_size):
     """move step_size in the direction from v"""
-    return [v_i + step_size * direction_i
-            for v_i, direction_i in zip(v, direction)]
+    return algebra.vector_add(v, algebra.scalar_multiply(step_size,
+                                                         direction))
 
 
 def sum_of_squares_gradient(v):
@@ -38,28 +46,314 @@ def safe(f):
     return safe_f
 
 
-def minimize_batch(target_fn, gradient_fn, theta_0, tolerance=0.0000001):
-    """use gradient descent to find theta
-    that minimizes target function"""
-    step_sizes = [100, 10, 1, 0.1, 0.01, 0.001, 0.0001, 0.00001]
+STEP_SIZES = [100, 10, 1, 0.1, 0.01, 0.001, 0.0001, 0.00001]
+
+Report = namedtuple('Report', ['value', 'iterations',
+                               'function_evaluations',
+                               'gradient_evaluations'])
 
-    theta = theta_0
-    target_fn = safe(target_fn)
-    value = target_fn(theta)
 
-    while True:
-        _gradient = gradient_fn(theta)
-        next_thetas = [step(theta, _gradient, -step_size)
-                       for step_size in step_sizes]
+class _Objective(object):
+    """target_fn and gradient_fn, counting how often each is called"""
 
-        # choose the one that minimizes the error function
-        next_theta = min(next_thetas, key=target_fn)
-        next_value = target_fn(next_theta)
+    def __init__(self, target_fn, gradient_fn):
+        self.target_fn = safe(target_fn)
+        self.gradient_fn = gradient_fn
+        self.function_evaluations = 0
+        self.gradient_evaluations = 0
 
+    def value(self, theta):
+        self.function_evaluations += 1
+        return self.target_fn(theta)
+
+    def gradient(self, theta):
+        self.gradient_evaluations += 1
+        return self.gradient_fn(theta)
+
+
+class _Counted(object):
+    """f, counting how often it is called"""
+
+    def __init__(self, f):
+        self.f = f
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.f(*args)
+
+
+class _Summed(_Counted):
+    """gradient_fn, also keeping the total of the gradients it returns"""
+
+    def __init__(self, gradient_fn):
+        super(_Summed, self).__init__(gradient_fn)
+        self.total = 0.0
+
+    def __call__(self, *args):
+        gradient = super(_Summed, self).__call__(*args)
+        self.total = self.total + np.asarray(gradient, dtype=float)
+        return gradient
+
+
+def _norm(v):
+    return float(np.sqrt(np.dot(v, v)))
+
+
+def _step_size(theta, next_theta, direction):
+    """the multiple of direction that took theta to next_theta"""
+    length = _norm(np.asarray(direction, dtype=float))
+    if length == 0:
+        return 0.0
+    return _norm(np.subtract(next_theta, theta)) / length
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# line searches: given theta, its value and gradient, and a descent
+# direction, each returns the next theta, its value, and its
+# gradient (or None when the search didn't need it); the Armijo
+# searches return theta itself when no step decreases the value
+# enough
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+def fixed_step_search(objective, theta, value, gradient, direction,
+                      step_sizes=STEP_SIZES):
+    """the best of a fixed list of step sizes"""
+    candidates = [step(theta, direction, step_size)
+                  for step_size in step_sizes]
+    values = [objective.value(candidate) for candidate in candidates]
+    best = values.index(min(values))
+    return candidates[best], values[best], None
+
+
+def backtracking_line_search(objective, theta, value, gradient, direction,
+                             initial_step=1.0, shrink=0.5, c1=1e-4,
+                             max_steps=50):
+    """shrink the step until it decreases the value by at least c1
+    times what the slope promises (the Armijo condition), giving up
+    after max_steps"""
+    slope = algebra.dot(gradient, direction)
+    step_size = initial_step
+    for _ in range(max_steps):
+        next_theta = step(theta, direction, step_size)
+        next_value = objective.value(next_theta)
+        if next_value <= value + c1 * step_size * slope:
+            return next_theta, next_value, None
+        step_size *= shrink
+    return theta, value, gradient
+
+
+def strong_wolfe_line_search(objective, theta, value, gradient, direction,
+                             initial_step=1.0, c1=1e-4, c2=0.9,
+                             max_steps=20):
+    """a step that decreases the value enough (Armijo) and flattens
+    the slope enough (curvature); Nocedal and Wright, algorithm 3.5"""
+    slope_0 = algebra.dot(gradient, direction)
+
+    def evaluate(step_size):
+        next_theta = step(theta, direction, step_size)
+        next_value = objective.value(next_theta)
+        if next_value == float('inf'):
+            return next_theta, next_value, None, float('nan')
+        next_gradient = objective.gradient(next_theta)
+        return (next_theta, next_value, next_gradient,
+                algebra.dot(next_gradient, direction))
+
+    def zoom(lo, hi):
+        """lo and hi are (step, theta, value, gradient, slope),
+        and lo has the lower value"""
+        for _ in range(max_steps):
+            step_size = (lo[0] + hi[0]) / 2.0
+            point = (step_size,) + evaluate(step_size)
+            if point[2] > value + c1 * step_size * slope_0 or \
+                    point[2] >= lo[2]:
+                hi = point
+            else:
+                if abs(point[4]) <= -c2 * slope_0:
+                    return point
+                if point[4] * (hi[0] - lo[0]) >= 0:
+                    hi = lo
+                lo = point
+        return lo
+
+    previous = (0.0, theta, value, gradient, slope_0)
+    step_size = initial_step
+    for i in range(max_steps):
+        point = (step_size,) + evaluate(step_size)
+        if point[2] > value + c1 * step_size * slope_0 or \
+                (i > 0 and point[2] >= previous[2]):
+            point = zoom(previous, point)
+            break
+        if abs(point[4]) <= -c2 * slope_0:
+            break
+        if point[4] >= 0:
+            point = zoom(point, previous)
+            break
+        previous, step_size = point, step_size * 2
+    return point[1], point[2], point[3]
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# search directions
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+def _steepest_descent(gradient, history):
+    return algebra.scalar_multiply(-1, gradient)
+
+
+def _lbfgs_direction(gradient, history):
+    """the two-loop recursion: -H gradient, for the inverse Hessian
+    estimate H built from the recent (s, y, 1 / y.s) updates; with no
+    history yet, a unit-length steepest descent step"""
+    if not history:
+        magnitude = algebra.magnitude(gradient)
+        return algebra.scalar_multiply(-1.0 / (magnitude or 1), gradient)
+    q = gradient
+    alphas = []
+    for s, y, rho in reversed(history):
+        alpha = rho * algebra.dot(s, q)
+        q = algebra.vector_subtract(q, algebra.scalar_multiply(alpha, y))
+        alphas.append(alpha)
+    s, y, _ = history[-1]
+    q = algebra.scalar_multiply(algebra.dot(s, y) /
+                                float(algebra.dot(y, y)), q)
+    for (s, y, rho), alpha in zip(history, reversed(alphas)):
+        beta = rho * algebra.dot(y, q)
+        q = algebra.vector_add(q, algebra.scalar_multiply(alpha - beta, s))
+    return algebra.scalar_multiply(-1, q)
+
+
+def minimize_batch(target_fn, gradient_fn, theta_0, tolerance=0.0000001,
+                   line_search=None, method='gradient_descent', memory=10,
+                   optimizer=None, alpha=0.01, max_iterations=None,
+                   full_output=False, callback=None):
+    """use gradient descent to find theta
+    that minimizes target function
+
+    method is 'gradient_descent' or 'lbfgs'. line_search picks the
+    step along each direction: fixed_step_search (the default for
+    gradient descent), backtracking_line_search or
+    strong_wolfe_line_search (the default for lbfgs). Values and
+    gradients are never computed twice for the same theta. An
+    optimizer (or its name in OPTIMIZERS) replaces the search with its
+    own steps at learning rate alpha. With full_output, returns theta
+    and a Report of the evaluation counts. Without a gradient_fn, the
+    gradient of target_fn is found by autodiff. callback, if given,
+    is called with a telemetry.Iteration after every iteration."""
+    if gradient_fn is None:
+        gradient_fn = autodiff.gradient(target_fn)
+    if method not in ('gradient_descent', 'lbfgs'):
+        raise ValueError("unknown method: {0}".format(method))
+    if line_search is None:
+        line_search = (fixed_step_search if method == 'gradient_descent'
+                       else strong_wolfe_line_search)
+    search_direction = (_steepest_descent if method == 'gradient_descent'
+                        else _lbfgs_direction)
+
+    objective = _Objective(target_fn, gradient_fn)
+    if optimizer is not None:
+        return _minimize_with_optimizer(objective, theta_0, tolerance,
+                                        get_optimizer(optimizer), alpha,
+                                        max_iterations, full_output, callback)
+    theta = theta_0
+    value = objective.value(theta)
+    _gradient = None
+    history = []
+    iterations = 0
+    stop_reason = telemetry.MAX_ITERATIONS
+
+    while max_iterations is None or iterations < max_iterations:
+        if callback is not None:
+            started = time.time()
+        iterations += 1
+        if _gradient is None:
+            _gradient = objective.gradient(theta)
+        direction = search_direction(_gradient, history)
+        if algebra.dot(_gradient, direction) >= 0:
+            # not downhill, so the curvature estimate is no use
+            history = []
+            direction = _steepest_descent(_gradient, history)
+
+        next_theta, next_value, next_gradient = line_search(
+            objective, theta, value, _gradient, direction)
+        if callback is not None:
+            callback(Iteration(iterations, next_value,
+                               _step_size(theta, next_theta, direction),
+                               _norm(np.asarray(_gradient, dtype=float)),
+                               objective.function_evaluations,
+                               objective.gradient_evaluations,
+                               time.time() - started))
+
+        if next_theta is theta:
+            # the line search found no step that helps
+            stop_reason = telemetry.NO_IMPROVEMENT
+            break
         if abs(value - next_value) < tolerance:
-            return theta
-        else:
-            theta, value = next_theta, next_value
+            stop_reason = telemetry.CONVERGED
+            break
+
+        if method == 'lbfgs':
+            if next_gradient is None:
+                next_gradient = objective.gradient(next_theta)
+            s = algebra.vector_subtract(next_theta, theta)
+            y = algebra.vector_subtract(next_gradient, _gradient)
+            curvature = algebra.dot(y, s)
+            if curvature > 0:
+                history = (history + [(s, y, 1.0 / curvature)])[-memory:]
+        theta, value, _gradient = next_theta, next_value, next_gradient
+
+    if callback is not None:
+        telemetry.notify_stopped(callback, stop_reason)
+    if full_output:
+        return theta, Report(value, iterations,
+                             objective.function_evaluations,
+                             objective.gradient_evaluations)
+    return theta
+
+
+def _minimize_with_optimizer(objective, theta_0, tolerance, optimizer,
+                             alpha, max_iterations, full_output, callback):
+    theta = np.array(theta_0, dtype=float)
+    optimizer.reset(theta)
+    value = objective.value(theta)
+    iterations = 0
+    stop_reason = telemetry.MAX_ITERATIONS
+    while max_iterations is None or iterations < max_iterations:
+        if callback is not None:
+            started = time.time()
+        iterations += 1
+        previous_theta = theta.copy()
+        _gradient = np.asarray(objective.gradient(theta), dtype=float)
+        optimizer.update(theta, _gradient, alpha)
+        next_value = objective.value(theta)
+        if callback is not None:
+            callback(Iteration(iterations, next_value, alpha,
+                               _norm(_gradient),
+                               objective.function_evaluations,
+                               objective.gradient_evaluations,
+                               time.time() - started))
+        if abs(value - next_value) < tolerance:
+            theta = previous_theta
+            stop_reason = telemetry.CONVERGED
+            break
+        value = next_value
+
+    if callback is not None:
+        telemetry.notify_stopped(callback, stop_reason)
+
+    if isinstance(theta_0, list):
+        theta = theta.tolist()
+    if full_output:
+        return theta, Report(value, iterations,
+                             objective.function_evaluations,
+                             objective.gradient_evaluations)
+    return theta
 
 
 def negate(f):
@@ -72,11 +366,18 @@ def negate_all(f):
     return lambda *args, **kwargs: [-y for y in f(*args, **kwargs)]
 
 
-def maximize_batch(target_fn, gradient_fn, theta_0, tolerance=0.0000001):
+def _negate_gradient(gradient_fn):
+    """negate_all(gradient_fn), or None to have it found by autodiff"""
+    return None if gradient_fn is None else negate_all(gradient_fn)
+
+
+def maximize_batch(target_fn, gradient_fn, theta_0, tolerance=0.0000001,
+                   **kwargs):
     return minimize_batch(negate(target_fn),
-                          negate_all(gradient_fn),
+                          _negate_gradient(gradient_fn),
                           theta_0,
-                          tolerance)
+                          tolerance,
+                          **kwargs)
 
 
 def in_random_order(data):
@@ -87,22 +388,49 @@ def in_random_order(data):
         yield data[i]
 
 
-def minimize_stochastic(target_fn, gradient_fn, x, y, theta_0, alpha_0=0.01):
+def minimize_stochastic(target_fn, gradient_fn, x, y, theta_0, alpha_0=0.01,
+                        optimizer=None, callback=None):
     """whenever we stop getting improvements,
-    we'll decrease the size and eventually quit"""
-    data = zip(x, y)
+    we'll decrease the size and eventually quit;
+    optimizer (an optimizer or its name in OPTIMIZERS) replaces
+    the plain gradient step; x may instead be a streaming.Source
+    of (x_i, y_i) rows (with y None), which is read from disk on
+    every pass rather than held in memory. Without a gradient_fn, the
+    gradient of target_fn(x_i, y_i, theta) is found by autodiff.
+    callback, if given, is called with a telemetry.Iteration after
+    every pass over the data."""
+    if gradient_fn is None:
+        gradient_fn = autodiff.gradient(target_fn, 2)
+    if callback is not None:
+        # count the calls, and total the gradients of each pass
+        target_fn, gradient_fn = _Counted(target_fn), _Summed(gradient_fn)
+        iterations = 0
+    if streaming.is_source(x):
+        data, random_order = x, x.shuffled
+    else:
+        data = zip(x, y)
+        random_order = lambda: in_random_order(data)
     theta = theta_0
     alpha = alpha_0
     min_theta, min_value = None, float("inf")
     iterations_with_no_improvement = 0
+    if optimizer is not None:
+        optimizer = get_optimizer(optimizer)
+        theta = np.array(theta_0, dtype=float)
+        optimizer.reset(theta)
 
     while iterations_with_no_improvement < 100:
+        if callback is not None:
+            started = time.time()
+            gradient_fn.total = 0.0
         value = sum(target_fn(x_i, y_i, theta) for x_i, y_i in data)
 
         if value < min_value:
             # if we've found a new minimum, remember it
             # and go back to the original step value
             min_theta, min_value = theta, value
+            if optimizer is not None:
+                min_theta = theta.copy()
             iterations_with_no_improvement = 0
             alpha = alpha_0
         else:
@@ -111,16 +439,276 @@ def minimize_stochastic(target_fn, gradient_fn, x, y, theta_0, alpha_0=0.01):
             iterations_with_no_improvement += 1
             alpha *= 0.9
 
-        for x_i, y_i in in_random_order(data):
+        for x_i, y_i in random_order():
             gradient_i = gradient_fn(x_i, y_i, theta)
+            if optimizer is not None:
+                optimizer.update(theta, np.asarray(gradient_i, dtype=float),
+                                 alpha)
+                continue
             theta = algebra.vector_subtract(theta,
                                             algebra.scalar_multiply(alpha,
                                                                     gradient_i))
 
+        if callback is not None:
+            iterations += 1
+            callback(Iteration(iterations, value, alpha,
+                               _norm(gradient_fn.total), target_fn.calls,
+                               gradient_fn.calls, time.time() - started))
+
+    if callback is not None:
+        telemetry.notify_stopped(callback, telemetry.NO_IMPROVEMENT)
+    if optimizer is not None and isinstance(theta_0, list):
+        return min_theta.tolist()
     return min_theta
 
 
-def maximize_stochastic(target_fn, gradient_fn, x, y, theta_0, alpha_0=0.01):
+def maximize_stochastic(target_fn, gradient_fn, x, y, theta_0, alpha_0=0.01,
+                        optimizer=None, callback=None):
     return minimize_stochastic(negate(target_fn),
-                               negate_all(gradient_fn),
-                               x, y, theta_0, alpha_0)
+                               _negate_gradient(gradient_fn),
+                               x, y, theta_0, alpha_0, optimizer, callback)
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# mini-batch gradient descent
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+def constant_schedule(alpha_0, epoch):
+    return alpha_0
+
+
+def step_decay(alpha_0, epoch, drop=0.5, every=10):
+    """alpha_0, cut by drop every so many epochs"""
+    return alpha_0 * drop ** (epoch // every)
+
+
+def exponential_decay(alpha_0, epoch, rate=0.95):
+    return alpha_0 * rate ** epoch
+
+
+def inverse_time_decay(alpha_0, epoch, rate=0.1):
+    return alpha_0 / (1.0 + rate * epoch)
+
+
+def minimize_minibatch(target_fn, gradient_fn, x, y, theta_0, alpha_0=0.01,
+                       batch_size=32, max_epochs=100, schedule=None,
+                       tolerance=0.0000001, patience=10, seed=None,
+                       optimizer=None, full_output=False, callback=None):
+    """stochastic gradient descent, a batch of rows at a time
+
+    target_fn(x_batch, y_batch, theta) is the total loss over a batch
+    and gradient_fn(x_batch, y_batch, theta) the sum of its gradients,
+    where x_batch is an array of rows and y_batch an array of targets
+    (or None when y is None). Each step moves theta by the mean
+    gradient of a batch, times the learning rate
+    schedule(alpha_0, epoch) (constant_schedule by default), through
+    optimizer (an optimizer or its name in OPTIMIZERS; sgd by default). Stops
+    after max_epochs, or once patience epochs in a row fail to lower
+    the total loss by more than tolerance; returns the best theta.
+    Without a gradient_fn, the gradient is found by autodiff.
+    callback, if given, is called with a telemetry.Iteration after
+    every epoch."""
+    if gradient_fn is None:
+        gradient_fn = autodiff.gradient(target_fn, 2)
+    schedule = schedule or constant_schedule
+    x = np.asarray(x, dtype=float)
+    y = None if y is None else np.asarray(y, dtype=float)
+    theta = np.array(theta_0, dtype=float)
+    optimizer = get_optimizer(optimizer or 'sgd')
+    optimizer.reset(theta)
+    stream = RandomStream(seed)
+    n = len(x)
+
+    best_theta, best_value = theta.copy(), target_fn(x, y, theta)
+    function_evaluations, gradient_evaluations = 1, 0
+    epochs_without_improvement = 0
+    epoch = 0
+    while epoch < max_epochs and epochs_without_improvement < patience:
+        if callback is not None:
+            started = time.time()
+            total_gradient = 0.0
+        alpha = schedule(alpha_0, epoch)
+        order = stream.permutation(n)
+        for start in range(0, n, batch_size):
+            batch = order[start:start + batch_size]
+            gradient_b = gradient_fn(x[batch],
+                                     None if y is None else y[batch], theta)
+            optimizer.update(theta, np.asarray(gradient_b) / len(batch),
+                             alpha)
+            gradient_evaluations += 1
+            if callback is not None:
+                total_gradient = total_gradient + np.asarray(gradient_b)
+        epoch += 1
+
+        value = target_fn(x, y, theta)
+        function_evaluations += 1
+        if value < best_value - tolerance:
+            best_theta, best_value = theta.copy(), value
+            epochs_without_improvement = 0
+        else:
+            epochs_without_improvement += 1
+        if callback is not None:
+            callback(Iteration(epoch, value, alpha, _norm(total_gradient),
+                               function_evaluations, gradient_evaluations,
+                               time.time() - started))
+
+    if callback is not None:
+        telemetry.notify_stopped(
+            callback, telemetry.NO_IMPROVEMENT
+            if epochs_without_improvement >= patience
+            else telemetry.MAX_ITERATIONS)
+
+    if isinstance(theta_0, list):
+        best_theta = best_theta.tolist()
+    if full_output:
+        return best_theta, Report(best_value, epoch, function_evaluations,
+                                  gradient_evaluations)
+    return best_theta
+
+
+def maximize_minibatch(target_fn, gradient_fn, x, y, theta_0, alpha_0=0.01,
+                       **kwargs):
+    return minimize_minibatch(negate(target_fn),
+                              _negate_gradient(gradient_fn),
+                              x, y, theta_0, alpha_0, **kwargs)
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# optimizers: each turns a gradient into an update of theta, in
+# place, keeping its per-parameter state in arrays allocated once
+# by reset(theta); alpha is the learning rate for this step
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+class SGD(object):
+    """plain gradient descent: theta -= alpha * gradient"""
+
+    def reset(self, theta):
+        self._scratch = np.zeros_like(theta)
+
+    def update(self, theta, gradient, alpha):
+        np.multiply(gradient, alpha, out=self._scratch)
+        theta -= self._scratch
+        return theta
+
+
+class Momentum(SGD):
+    """gradient descent with a velocity that remembers a fraction
+    momentum of the previous steps"""
+
+    def __init__(self, momentum=0.9):
+        self.momentum = momentum
+
+    def reset(self, theta):
+        SGD.reset(self, theta)
+        self._velocity = np.zeros_like(theta)
+
+    def update(self, theta, gradient, alpha):
+        self._velocity *= self.momentum
+        np.multiply(gradient, alpha, out=self._scratch)
+        self._velocity -= self._scratch
+        theta += self._velocity
+        return theta
+
+
+class Nesterov(Momentum):
+    """momentum, with the gradient taken where the velocity is about
+    to carry theta (in Sutskever's reformulation, which only needs the
+    gradient at theta itself)"""
+
+    def update(self, theta, gradient, alpha):
+        theta -= self.momentum * self._velocity
+        Momentum.update(self, theta, gradient, alpha)
+        theta += self.momentum * self._velocity
+        return theta
+
+
+class AdaGrad(SGD):
+    """per-parameter steps, scaled down by each parameter's total
+    squared gradient so far"""
+
+    def __init__(self, epsilon=1e-8):
+        self.epsilon = epsilon
+
+    def reset(self, theta):
+        SGD.reset(self, theta)
+        self._squares = np.zeros_like(theta)
+
+    def _scaled_step(self, gradient, alpha, squares):
+        np.sqrt(squares, out=self._scratch)
+        self._scratch += self.epsilon
+        np.divide(gradient, self._scratch, out=self._scratch)
+        self._scratch *= alpha
+        return self._scratch
+
+    def update(self, theta, gradient, alpha):
+        self._squares += gradient * gradient
+        theta -= self._scaled_step(gradient, alpha, self._squares)
+        return theta
+
+
+class RMSProp(AdaGrad):
+    """AdaGrad with an exponentially decaying average of the squared
+    gradients, so the steps don't shrink forever"""
+
+    def __init__(self, decay=0.9, epsilon=1e-8):
+        self.decay = decay
+        self.epsilon = epsilon
+
+    def update(self, theta, gradient, alpha):
+        self._squares *= self.decay
+        self._squares += (1 - self.decay) * gradient * gradient
+        theta -= self._scaled_step(gradient, alpha, self._squares)
+        return theta
+
+
+class Adam(AdaGrad):
+    """RMSProp with momentum, both bias-corrected for their start
+    at zero (Kingma and Ba, 2015)"""
+
+    def __init__(self, beta_1=0.9, beta_2=0.999, epsilon=1e-8):
+        self.beta_1 = beta_1
+        self.beta_2 = beta_2
+        self.epsilon = epsilon
+
+    def reset(self, theta):
+        AdaGrad.reset(self, theta)
+        self._means = np.zeros_like(theta)
+        self._steps = 0
+
+    def update(self, theta, gradient, alpha):
+        self._steps += 1
+        self._means *= self.beta_1
+        self._means += (1 - self.beta_1) * gradient
+        self._squares *= self.beta_2
+        self._squares += (1 - self.beta_2) * gradient * gradient
+        corrected_alpha = (alpha *
+                           (1 - self.beta_2 ** self._steps) ** 0.5 /
+                           (1 - self.beta_1 ** self._steps))
+        theta -= self._scaled_step(self._means, corrected_alpha,
+                                   self._squares)
+        return theta
+
+
+OPTIMIZERS = {'sgd': SGD,
+              'momentum': Momentum,
+              'nesterov': Nesterov,
+              'adagrad': AdaGrad,
+              'rmsprop': RMSProp,
+              'adam': Adam}
+
+
+def get_optimizer(optimizer, **kwargs):
+    """an optimizer from its name in OPTIMIZERS (with kwargs for its
+    constructor), or optimizer itself if it already is one"""
+    if not isinstance(optimizer, basestring):
+        return optimizer
+    try:
+        return OPTIMIZERS[optimizer.lower()](**kwargs)
+    except KeyError:
+        raise ValueError("unknown optimizer: {0}".format(optimizer))
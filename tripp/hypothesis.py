@@ -1,6 +1,10 @@
 from __future__ import division
 from probability import normal_cdf, inverse_normal_cdf
+from probability import binomial_pmf, binomial_cdf, binomial_sf
 import random
+import numpy as np
+import distributions
+import simulation
 import math
 import logging
 
@@ -76,19 +80,105 @@ def two_sided_p_value(x, mu=0, sigma=1):
         return 2 * normal_probability_below(x, mu, sigma)
 
 
-def count_extreme_values():
-    extreme_value_count = 0
-    for _ in range(100000):
-        num_heads = sum(1 if random.random() < 0.5 else 0
-                        for _ in range(1000))
-        if num_heads >= 530 or num_heads <= 470:
-            extreme_value_count += 1
-    return extreme_value_count / 100000
+def extreme_value_trials(stream, size, num_flips=1000, lo=470, hi=530):
+    """for each of size experiments of num_flips fair coin flips,
+    1 if the number of heads is at most lo or at least hi"""
+    num_heads = stream.binomial(num_flips, 0.5, size)
+    return ((num_heads >= hi) | (num_heads <= lo)).astype(float)
+
+
+def count_extreme_values(num_trials=100000, workers=1, seed=None):
+    """the fraction of 1000-flip experiments with an extreme count"""
+    return simulation.simulate(extreme_value_trials, num_trials,
+                               workers=workers, seed=seed).value
 
 
 upper_p_value = normal_probability_above
 lower_p_value = normal_probability_below
 
+
+def two_sided_p_values(xs, mu=0, sigma=1):
+    """two_sided_p_value of every element of an array, in one pass"""
+    z = np.abs((np.asarray(xs, dtype=float) - mu) / sigma)
+    return np.minimum(1.0, 2 * distributions.normal_tail(z))
+
+
+def upper_p_values(xs, mu=0, sigma=1):
+    """upper_p_value of every element of an array"""
+    return distributions.Normal(mu, sigma).sf(np.asarray(xs, dtype=float))
+
+
+def lower_p_values(xs, mu=0, sigma=1):
+    """lower_p_value of every element of an array"""
+    return distributions.Normal(mu, sigma).cdf(np.asarray(xs, dtype=float))
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# exact binomial tests
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+def _first_true(lo, hi, predicate):
+    """the smallest i in [lo, hi) for which the (monotone) predicate
+    holds, or hi if it never does"""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if predicate(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def binomial_two_sided_p_value(k, n, p=0.5):
+    """exact two-sided p-value of k successes in n trials: the
+    probability of every outcome no more likely than k"""
+    mu = n * p
+    if k == mu:
+        return 1.0
+    # guards against rounding making a tie look less likely
+    threshold = binomial_pmf(k, n, p) * (1 + 1e-7)
+    if k < mu:
+        # the pmf decreases from ceil(mu) up to n
+        start = int(math.ceil(mu))
+        j = _first_true(start, n + 1,
+                        lambda i: binomial_pmf(i, n, p) <= threshold)
+        p_value = binomial_cdf(k, n, p) + binomial_sf(j - 1, n, p)
+    else:
+        # the pmf increases from 0 up to floor(mu)
+        stop = int(math.floor(mu)) + 1
+        j = _first_true(0, stop,
+                        lambda i: binomial_pmf(i, n, p) > threshold) - 1
+        p_value = binomial_cdf(j, n, p) + binomial_sf(k - 1, n, p)
+    return min(1.0, p_value)
+
+
+def binomial_two_sided_bounds(probability, n, p=0.5):
+    """the largest lo and smallest hi such that each tail outside
+    [lo, hi], P(X < lo) and P(X > hi), has probability at most
+    (1 - probability) / 2"""
+    tail_probability = (1 - probability) / 2
+    lo = _first_true(0, n + 1,
+                     lambda k: binomial_cdf(k, n, p) > tail_probability)
+    hi = _first_true(0, n + 1,
+                     lambda k: binomial_sf(k, n, p) <= tail_probability)
+    return lo, hi
+
+
+def binomial_power(n, p_0, p_1, alpha=0.05):
+    """probability that the exact two-sided level-alpha test of p = p_0
+    rejects when the true probability is p_1"""
+    lo, hi = binomial_two_sided_bounds(1 - alpha, n, p_0)
+    return binomial_cdf(lo - 1, n, p_1) + binomial_sf(hi, n, p_1)
+
+
+def extreme_value_probability(num_flips=1000, lo=470, hi=530):
+    """exact probability that a fair coin lands heads at most lo
+    or at least hi times in num_flips flips"""
+    return (binomial_cdf(lo, num_flips, 0.5) +
+            binomial_sf(hi - 1, num_flips, 0.5))
+
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #
 # P-hacking
@@ -107,6 +197,59 @@ def reject_fairness(experiment):
     num_heads = len([flip for flip in experiment if flip])
     return num_heads < 469 or num_heads > 531
 
+
+def false_rejection_trials(stream, size, num_flips=1000):
+    """for each of size fair-coin experiments, 1 if reject_fairness
+    would (wrongly) reject it"""
+    num_heads = stream.binomial(num_flips, 0.5, size)
+    return ((num_heads < 469) | (num_heads > 531)).astype(float)
+
+
+def false_rejection_rate(num_experiments=1000, workers=1, seed=None,
+                         target_error=None):
+    """simulated rate at which reject_fairness rejects a fair coin"""
+    return simulation.simulate(false_rejection_trials, num_experiments,
+                               workers=workers, seed=seed,
+                               target_error=target_error)
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# multiple testing: adjusted p-values, to compare against alpha
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+def bonferroni(p_values):
+    """controls the chance of any false rejection"""
+    p_values = np.asarray(p_values, dtype=float)
+    return np.minimum(1.0, p_values * len(p_values))
+
+
+def holm(p_values):
+    """Holm's step-down method; the same guarantee as bonferroni,
+    but never less powerful"""
+    p_values = np.asarray(p_values, dtype=float)
+    m = len(p_values)
+    order = np.argsort(p_values)
+    adjusted = np.maximum.accumulate(
+        np.minimum(1.0, (m - np.arange(m)) * p_values[order]))
+    result = np.empty_like(adjusted)
+    result[order] = adjusted
+    return result
+
+
+def benjamini_hochberg(p_values):
+    """Benjamini-Hochberg step-up method; controls the expected
+    fraction of rejections that are false"""
+    p_values = np.asarray(p_values, dtype=float)
+    m = len(p_values)
+    order = np.argsort(p_values)
+    scaled = np.minimum(1.0, m * p_values[order] / np.arange(1, m + 1))
+    adjusted = np.minimum.accumulate(scaled[::-1])[::-1]
+    result = np.empty_like(adjusted)
+    result[order] = adjusted
+    return result
+
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #
 # running A/B test
@@ -134,13 +277,14 @@ def a_b_test_statistic(N_A, n_A, N_B, n_B):
 
 def B(alpha, beta):
     """a normalizing constant so that the total probability is 1"""
-    return math.gamma(alpha) * math.gamma(beta) / math.gamma(alpha + beta)
+    return math.exp(distributions.log_beta_function(alpha, beta))
 
 
 def beta_pdf(x, alpha, beta):
+    """evaluated in log space, so large alpha and beta don't overflow"""
     if x < 0 or x > 1:
         return 0
-    return x ** (alpha - 1) * (1 - x) ** (beta - 1) / B(alpha, beta)
+    return distributions.Beta(alpha, beta).pdf(x)
 
 
 if __name__ == '__main__':
@@ -1,5 +1,8 @@
 import math
+import numpy as np
 import algebra
+import autodiff
+import parallel_sgd
 
 
 def logistic(x):
@@ -39,3 +42,24 @@ def logistic_log_gradient(x, y, beta):
     return reduce(algebra.vector_add,
                   [logistic_log_gradient_i(x_i, y_i, beta)
                    for x_i, y_i in zip(x, y)])
+
+
+def logistic_loss_batch(x, y, beta):
+    """the negative log likelihood of arrays of rows x and labels y"""
+    z = algebra.dot(x, beta)
+    return autodiff.logaddexp(0, z).sum() - algebra.dot(y, z)
+
+
+def logistic_loss_batch_gradient(x, y, beta):
+    """the gradient of logistic_loss_batch"""
+    return -x.T.dot(y - 1 / (1 + np.exp(-x.dot(beta))))
+
+
+def estimate_beta_parallel(x, y, workers=None, alpha_0=0.01, **kwargs):
+    """maximum likelihood beta, by SGD shared among worker processes;
+    kwargs as for parallel_sgd.minimize_parallel"""
+    return parallel_sgd.minimize_parallel(logistic_loss_batch,
+                                          logistic_loss_batch_gradient,
+                                          x, y, [0.0 for _ in x[0]],
+                                          alpha_0, workers=workers,
+                                          **kwargs)
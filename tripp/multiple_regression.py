@@ -1,9 +1,11 @@
 from algebra import dot
 import algebra
+import distributions
 import gradient
-import probability
+import parallel_sgd
 import random
 import regression
+import streaming
 from functools import partial
 
 
@@ -23,19 +25,59 @@ def squared_error(x_i, y_i, beta):
 def squared_error_gradient(x_i, y_i, beta):
     """the gradient (with respect to beta)
     corresponding to the ith squared error term"""
-    return [-2 * x_ij * error(x_i, y_i, beta)
-            for x_ij in x_i]
+    return algebra.scalar_multiply(-2 * error(x_i, y_i, beta), x_i)
 
 
-def estimate_beta(x, y):
-    """Find the optimal beta using stochastic gradient descent"""
-    beta_initial = [random.random() for x_i in x[0]]
+def estimate_beta(x, y, optimizer=None, alpha_0=0.001):
+    """Find the optimal beta using stochastic gradient descent;
+    optimizer names one of gradient.OPTIMIZERS, e.g. 'adam';
+    x may be a streaming.Source of (x_i, y_i) rows, with y None"""
+    first_x = x.first()[0] if streaming.is_source(x) else x[0]
+    beta_initial = [random.random() for x_i in first_x]
     return gradient.minimize_stochastic(squared_error,
                                         squared_error_gradient,
                                         x,
                                         y,
                                         beta_initial,
-                                        0.001)
+                                        alpha_0,
+                                        optimizer=optimizer)
+
+
+def squared_error_batch(x, y, beta):
+    """the total squared error over an array of rows x"""
+    errors = y - algebra.dot(x, beta)
+    return algebra.dot(errors, errors)
+
+
+def squared_error_batch_gradient(x, y, beta):
+    """the sum of squared_error_gradient over an array of rows x"""
+    return -2 * x.T.dot(y - x.dot(beta))
+
+
+def estimate_beta_minibatch(x, y, alpha_0=0.001, batch_size=32,
+                            max_epochs=100, seed=None, optimizer=None):
+    """estimate_beta, taking a vectorized step per batch of rows"""
+    beta_initial = [random.random() for x_i in x[0]]
+    return gradient.minimize_minibatch(squared_error_batch,
+                                       squared_error_batch_gradient,
+                                       x,
+                                       y,
+                                       beta_initial,
+                                       alpha_0,
+                                       batch_size=batch_size,
+                                       max_epochs=max_epochs,
+                                       seed=seed,
+                                       optimizer=optimizer)
+
+
+def estimate_beta_parallel(x, y, workers=None, alpha_0=0.001, **kwargs):
+    """estimate_beta, with SGD shared among worker processes;
+    kwargs as for parallel_sgd.minimize_parallel"""
+    return parallel_sgd.minimize_parallel(squared_error_batch,
+                                          squared_error_batch_gradient,
+                                          x, y, [0.0 for _ in x[0]],
+                                          alpha_0, workers=workers,
+                                          **kwargs)
 
 
 def multiple_r_squared(x, y, beta):
@@ -63,11 +105,9 @@ def estimate_sample_beta(sample):
 def p_value(beta_hat_j, sigma_hat_j):
     """if the coefficient is positive, we need to compute twice the
     probability of seeing an even larger value; otherwise twice the
-    probability of seeing a smaller value"""
-    if beta_hat_j > 0:
-        return 2 * (1 - probability.normal_cdf(beta_hat_j / sigma_hat_j))
-    else:
-        return 2 * probability.normal_cdf(beta_hat_j / sigma_hat_j)
+    probability of seeing a smaller value; works on arrays of
+    coefficients too"""
+    return 2 * distributions.STANDARD_NORMAL.sf(abs(beta_hat_j / sigma_hat_j))
 
 
 def ridge_penalty(beta, alpha):
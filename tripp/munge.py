@@ -32,14 +32,12 @@ def random_normal():
 
 def correlation_matrix(data):
     """returns the num_columns x num_columns matrix whose (i, j)th entry
-    is the correlation between columns i and j of data"""
-    _, num_columns = algebra.shape(data)
-
-    def matrix_entry(i, j):
-        return stats.correlation(algebra.get_column(data, i),
-                                 algebra.get_column(data, j))
-
-    return algebra.mk_matrix(num_columns, num_columns, matrix_entry)
+    is the correlation between columns i and j of data;
+    data may also be an iterator of rows"""
+    correlations = stats.CovarianceMatrix(data).correlation()
+    if algebra.is_array(data):
+        return correlations
+    return correlations.tolist()
 
 
 def make_random_matrix():
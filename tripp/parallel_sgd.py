@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""data-parallel stochastic gradient descent: worker processes see
+theta and the data through shared memory, and each runs mini-batch
+SGD over its own shard of the rows"""
+from __future__ import division
+from functools import partial
+import math
+import multiprocessing
+import numpy as np
+import autodiff
+from gradient import Report, constant_schedule
+from variates import RandomStream
+
+HOGWILD = 'hogwild'
+AVERAGING = 'averaging'
+
+# theta and the data, as seen by whichever process is running a shard
+_shared = {}
+
+
+def _share(array):
+    """a shared-memory copy of array, as (buffer, shape)"""
+    array = np.ascontiguousarray(array, dtype=float)
+    raw = multiprocessing.RawArray('d', max(array.size, 1))
+    np.frombuffer(raw)[:array.size] = array.ravel()
+    return raw, array.shape
+
+
+def _attach(buffers):
+    """pool initializer: view each shared buffer as its array"""
+    for name, (raw, shape) in buffers.items():
+        _shared[name] = np.frombuffer(raw)[:int(np.prod(shape))] \
+            .reshape(shape)
+
+
+def _shard(num_rows, workers, worker):
+    return num_rows * worker // workers, num_rows * (worker + 1) // workers
+
+
+def _run_shard(task, gradient_fn, batch_size, seed, mode):
+    """one round of one worker's mini-batches: in place on the shared
+    theta (hogwild), or on a private copy that is returned (averaging)"""
+    worker, workers, epoch, round_number, rounds, alpha = task
+    x, y = _shared['x'], _shared.get('y')
+    theta = _shared['theta']
+    if mode == AVERAGING:
+        theta = theta.copy()
+
+    # each round of an epoch walks on through the same shuffled order
+    key = (epoch, worker)
+    if _shared.get('order_key') != key:
+        start, stop = _shard(len(x), workers, worker)
+        _shared['order_key'] = key
+        _shared['order'] = start + RandomStream(
+            seed, epoch * workers + worker).permutation(stop - start)
+    order = _shared['order']
+    starts = range(0, len(order), batch_size)
+    per_round = int(math.ceil(len(starts) / rounds))
+    for batch_start in starts[round_number * per_round:
+                              (round_number + 1) * per_round]:
+        batch = order[batch_start:batch_start + batch_size]
+        gradient_b = gradient_fn(x[batch],
+                                 None if y is None else y[batch], theta)
+        # no lock: a concurrent update may land between read and write
+        theta -= (alpha / len(batch)) * np.asarray(gradient_b)
+    return theta if mode == AVERAGING else None
+
+
+def minimize_parallel(target_fn, gradient_fn, x, y, theta_0, alpha_0=0.01,
+                      workers=None, mode=HOGWILD, sync_every=None,
+                      batch_size=32, max_epochs=100, schedule=None,
+                      tolerance=0.0000001, patience=10, target_value=None,
+                      seed=None, full_output=False):
+    """gradient.minimize_minibatch, with the rows split into one shard
+    per worker process
+
+    In HOGWILD mode every worker steps the shared theta directly,
+    without locks (Niu et al., 2011); collisions are rare when
+    gradients are sparse, and harmless noise when they are not. In
+    AVERAGING mode each worker steps a private copy, and the copies
+    are averaged back into theta after every sync_every batches per
+    worker (once an epoch by default). gradient_fn must be picklable.
+    Also stops as soon as the loss reaches target_value. Without a
+    gradient_fn, the gradient of target_fn is found by autodiff."""
+    if gradient_fn is None:
+        gradient_fn = autodiff.gradient(target_fn, 2)
+    if mode not in (HOGWILD, AVERAGING):
+        raise ValueError("unknown mode: {0}".format(mode))
+    schedule = schedule or constant_schedule
+    workers = workers or multiprocessing.cpu_count()
+    if seed is None:
+        seed = RandomStream().seed_value
+
+    x = np.ascontiguousarray(x, dtype=float)
+    y = None if y is None else np.ascontiguousarray(y, dtype=float)
+    rounds = 1
+    if mode == AVERAGING and sync_every is not None:
+        batches_per_worker = math.ceil(len(x) / workers / batch_size)
+        rounds = max(1, int(math.ceil(batches_per_worker / sync_every)))
+
+    buffers = {'x': _share(x), 'theta': _share(theta_0)}
+    if y is not None:
+        buffers['y'] = _share(y)
+    run_shard = partial(_run_shard, gradient_fn=gradient_fn,
+                        batch_size=batch_size, seed=seed, mode=mode)
+    _attach(buffers)
+    theta = _shared['theta']
+    pool = None
+    if workers == 1:
+        run = lambda tasks: [run_shard(task) for task in tasks]
+    else:
+        pool = multiprocessing.Pool(workers, _attach, (buffers,))
+        run = lambda tasks: pool.map(run_shard, tasks)
+
+    try:
+        best_theta, best_value = theta.copy(), target_fn(x, y, theta)
+        function_evaluations = 1
+        epochs_without_improvement = 0
+        epoch = 0
+        while epoch < max_epochs and epochs_without_improvement < patience:
+            if target_value is not None and best_value <= target_value:
+                break
+            alpha = schedule(alpha_0, epoch)
+            for round_number in range(rounds):
+                thetas = run([(worker, workers, epoch, round_number, rounds,
+                               alpha) for worker in range(workers)])
+                if mode == AVERAGING:
+                    theta[:] = np.mean(thetas, axis=0)
+            epoch += 1
+
+            value = target_fn(x, y, theta)
+            function_evaluations += 1
+            if value < best_value - tolerance:
+                best_theta, best_value = theta.copy(), value
+                epochs_without_improvement = 0
+            else:
+                epochs_without_improvement += 1
+    finally:
+        _shared.clear()
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    gradient_evaluations = epoch * sum(
+        int(math.ceil((stop - start) / batch_size))
+        for start, stop in (_shard(len(x), workers, worker)
+                            for worker in range(workers)))
+    if isinstance(theta_0, list):
+        best_theta = best_theta.tolist()
+    if full_output:
+        return best_theta, Report(best_value, epoch, function_evaluations,
+                                  gradient_evaluations)
+    return best_theta
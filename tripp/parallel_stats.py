@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""descriptive statistics of large datasets, computed chunk by chunk
+in a pool of worker processes and merged back together"""
+from __future__ import division
+from collections import Counter
+from functools import partial
+import math
+import multiprocessing
+import os
+import algebra
+from stats import Moments
+
+DEFAULT_CHUNK_SIZE = 2 ** 20
+
+
+class Summary(object):
+    """mergeable partial aggregates of a chunk of values:
+    moments, min, max and (optionally) a count of each distinct value"""
+    def __init__(self, values=(), count_values=False):
+        self.moments = Moments()
+        self.min = self.max = None
+        self.counts = Counter() if count_values else None
+        if len(values):
+            self.moments.extend(values)
+            if algebra.is_array(values):
+                self.min, self.max = values.min(), values.max()
+            else:
+                self.min, self.max = min(values), max(values)
+            if count_values:
+                if algebra.is_array(values):
+                    values = values.tolist()
+                self.counts.update(values)
+
+    @property
+    def count(self):
+        return self.moments.count
+
+    def update(self, other):
+        """fold another Summary into this one; returns self"""
+        self.moments = self.moments.merge(other.moments)
+        lows = [x for x in (self.min, other.min) if x is not None]
+        highs = [x for x in (self.max, other.max) if x is not None]
+        self.min = min(lows) if lows else None
+        self.max = max(highs) if highs else None
+        if self.counts is not None:
+            if other.counts is None:
+                raise ValueError("cannot merge a Summary without counts")
+            self.counts.update(other.counts)
+        return self
+
+    def merge(self, other):
+        """a new Summary of the values seen by either self or other"""
+        count_values = self.counts is not None and other.counts is not None
+        return Summary(count_values=count_values).update(self).update(other)
+
+    def mean(self):
+        return self.moments.mean
+
+    def variance(self):
+        return self.moments.variance
+
+    def standard_deviation(self):
+        return math.sqrt(self.variance())
+
+    def data_range(self):
+        return self.max - self.min
+
+    def mode(self):
+        """returns a list, might be mode > 1"""
+        if self.counts is None:
+            raise ValueError("summarize with count_values=True for mode")
+        max_count = max(self.counts.values())
+        return [i for i, count in self.counts.items()
+                if count == max_count]
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# chunking
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+def _slices(num_values, chunk_size):
+    for start in range(0, num_values, chunk_size):
+        yield start, min(start + chunk_size, num_values)
+
+
+def file_chunks(path, chunk_bytes, skip_header=False):
+    """splits a file into (start, stop) byte ranges of about chunk_bytes,
+    each beginning at the start of a line"""
+    size = os.path.getsize(path)
+    boundaries = []
+    with open(path, 'rb') as f:
+        if skip_header:
+            f.readline()
+        position = f.tell()
+        while position < size:
+            boundaries.append(position)
+            f.seek(min(position + chunk_bytes, size))
+            f.readline()  # move on to the next line break
+            position = max(f.tell(), position + 1)
+    return [(start, min(stop, size))
+            for start, stop in zip(boundaries, boundaries[1:] + [size])]
+
+
+def read_chunk(path, start, stop, column=None, delimiter=','):
+    """parses the numbers in bytes [start, stop) of a file, one per line,
+    or from the given column of a delimited file"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        lines = f.read(stop - start).splitlines()
+    if column is None:
+        return [float(line) for line in lines if line.strip()]
+    return [float(line.split(delimiter)[column])
+            for line in lines if line.strip()]
+
+
+def _summarize_slice(values, count_values):
+    return Summary(values, count_values)
+
+
+def _summarize_file_chunk(byte_range, path, column, delimiter,
+                          count_values):
+    start, stop = byte_range
+    return Summary(read_chunk(path, start, stop, column, delimiter),
+                   count_values)
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# the driver
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+def summarize(data, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+              count_values=False, column=None, delimiter=',',
+              skip_header=False):
+    """the Summary of data, which is either a list (or array) of numbers
+    or the path of a file with one number per line (or, with column,
+    a delimited file); chunks of chunk_size values (or bytes, for files)
+    are summarized by workers processes (default: one per core)"""
+    if isinstance(data, basestring):
+        summarize_chunk = partial(_summarize_file_chunk, path=data,
+                                  column=column, delimiter=delimiter,
+                                  count_values=count_values)
+        chunks = file_chunks(data, chunk_size, skip_header)
+    else:
+        summarize_chunk = partial(_summarize_slice,
+                                  count_values=count_values)
+        chunks = (data[start:stop]
+                  for start, stop in _slices(len(data), chunk_size))
+
+    total = Summary(count_values=count_values)
+    if workers == 1:
+        for part in map(summarize_chunk, chunks):
+            total.update(part)
+        return total
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        for part in pool.imap_unordered(summarize_chunk, chunks):
+            total.update(part)
+    finally:
+        pool.close()
+        pool.join()
+    return total
+
+
+def mean(data, **kwargs):
+    return summarize(data, **kwargs).mean()
+
+
+def variance(data, **kwargs):
+    """assumes data has at least 2 elements"""
+    return summarize(data, **kwargs).variance()
+
+
+def standard_deviation(data, **kwargs):
+    return summarize(data, **kwargs).standard_deviation()
+
+
+def data_range(data, **kwargs):
+    return summarize(data, **kwargs).data_range()
+
+
+def mode(data, **kwargs):
+    """returns a list, might be mode > 1"""
+    return summarize(data, count_values=True, **kwargs).mode()
@@ -2,6 +2,7 @@
 import logging
 import math
 import random
+import numpy as np
 
 logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
 
@@ -21,10 +22,12 @@ def uniform_cdf(x):
         return 1
 
 
+_SQRT_TWO_PI = math.sqrt(2 * math.pi)
+
+
 def normal_pdf(x, mu=0, sigma=1):
     """classic bell-shaped distribution"""
-    sqrt_two_pi = math.sqrt(2 * math.pi)
-    return (math.exp(-(x - mu) ** 2 / 2 / sigma ** 2) / (sqrt_two_pi * sigma))
+    return (math.exp(-(x - mu) ** 2 / 2 / sigma ** 2) / (_SQRT_TWO_PI * sigma))
 
 
 def normal_cdf(x, mu=0, sigma=1):
@@ -34,26 +37,128 @@ def normal_cdf(x, mu=0, sigma=1):
     return (1 + math.erf((x - mu) / math.sqrt(2) / sigma)) / 2
 
 
-def inverse_normal_cdf(p, mu=0, sigma=1, tolerance=0.00001):
-    """find approximate inverse using binary search"""
-    # if not standard, compute standard and rescale
-    if mu != 0 or sigma != 1:
-        return mu * sigma * inverse_normal_cdf(p, tolerance=tolerance)
-
-    low_z, low_p = -10.0, 0  # normal_cdf(-10) is very close to 0
-    hi_z, hi_p = 10.0, 1   # normal_cdf(10) is very close to 1
-    while hi_z - low_z > tolerance:
-        mid_z = (low_z + hi_z) / 2  # find the midpoint
-        mid_p = normal_cdf(mid_z)   # and its corresponding cdf
-        if mid_p < p:
-            # midpoint still too low, search above
-            low_z, low_p = mid_z, mid_p
-        elif mid_p > p:
-            # midpoint too high, search below
-            hi_z, hi_p = mid_z, mid_p
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# inverse normal cdf, by Wichura's rational approximations
+# (Algorithm AS 241, Applied Statistics 37, 1988)
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# PPND16: relative accuracy about 1e-16
+_PPND16 = {
+    'central': ([3.3871328727963666080e0, 1.3314166789178437745e+2,
+                 1.9715909503065514427e+3, 1.3731693765509461125e+4,
+                 4.5921953931549871457e+4, 6.7265770927008700853e+4,
+                 3.3430575583588128105e+4, 2.5090809287301226727e+3],
+                [1.0, 4.2313330701600911252e+1,
+                 6.8718700749205790830e+2, 5.3941960214247511077e+3,
+                 2.1213794301586595867e+4, 3.9307895800092710610e+4,
+                 2.8729085735721942674e+4, 5.2264952788528545610e+3]),
+    'intermediate': ([1.42343711074968357734e0, 4.63033784615654529590e0,
+                      5.76949722146069140550e0, 3.64784832476320460504e0,
+                      1.27045825245236838258e0, 2.41780725177450611770e-1,
+                      2.27238449892691845833e-2, 7.74545014278341407640e-4],
+                     [1.0, 2.05319162663775882187e0,
+                      1.67638483018380384940e0, 6.89767334985100004550e-1,
+                      1.48103976427480074590e-1, 1.51986665636164571966e-2,
+                      5.47593808499534494600e-4, 1.05075007164441684324e-9]),
+    'tail': ([6.65790464350110377720e0, 5.46378491116411436990e0,
+              1.78482653991729133580e0, 2.96560571828504891230e-1,
+              2.65321895265761230930e-2, 1.24266094738807843860e-3,
+              2.71155556874348757815e-5, 2.01033439929228813265e-7],
+             [1.0, 5.99832206555887937690e-1,
+              1.36929880922735805310e-1, 1.48753612908506148525e-2,
+              7.86869131145613259100e-4, 1.84631831751005468180e-5,
+              1.42151175831644588870e-7, 2.04426310338993978564e-15]),
+}
+
+# PPND7: relative accuracy about 1e-7, for roughly half the work
+_PPND7 = {
+    'central': ([3.3871327179, 50.434271938, 159.29113202, 59.109374720],
+                [1.0, 17.895169469, 78.757757664, 67.187563600]),
+    'intermediate': ([1.4234372777, 2.7568153900, 1.3067284816,
+                      0.17023821103],
+                     [1.0, 0.73700164250, 0.12021132975]),
+    'tail': ([6.6579051150, 3.0812263860, 0.42868294337, 0.017337203997],
+             [1.0, 0.24197894225, 0.012258202635]),
+}
+
+
+def _coefficients(tolerance):
+    """the cheapest approximation accurate to within tolerance"""
+    if tolerance is not None and tolerance >= 1e-7:
+        return _PPND7
+    return _PPND16
+
+
+def _polynomial(coefficients, x):
+    """c_0 + c_1 * x + c_2 * x ** 2 + ..., by Horner's rule"""
+    result = 0.0
+    for c in reversed(coefficients):
+        result = result * x + c
+    return result
+
+
+def _rational(coefficients, x):
+    numerator, denominator = coefficients
+    return _polynomial(numerator, x) / _polynomial(denominator, x)
+
+
+def inverse_normal_cdf(p, mu=0, sigma=1, tolerance=None):
+    """the x for which normal_cdf(x, mu, sigma) = p, in closed form;
+    a tolerance of 1e-7 or more trades accuracy for speed,
+    and a numpy array of probabilities gives an array of quantiles"""
+    if isinstance(p, np.ndarray):
+        return mu + sigma * _inverse_normal_cdf_array(p, tolerance)
+
+    coefficients = _coefficients(tolerance)
+    if not 0 <= p <= 1:
+        raise ValueError("probability out of range: {0}".format(p))
+    q = p - 0.5
+    if abs(q) <= 0.425:
+        z = q * _rational(coefficients['central'], 0.180625 - q * q)
+    else:
+        r = p if q < 0 else 1 - p
+        if r == 0:
+            z = float('inf')
         else:
-            break
-    return mid_z
+            r = math.sqrt(-math.log(r))
+            if r <= 5:
+                z = _rational(coefficients['intermediate'], r - 1.6)
+            else:
+                z = _rational(coefficients['tail'], r - 5)
+        if q < 0:
+            z = -z
+    return mu + sigma * z
+
+
+def _inverse_normal_cdf_array(p, tolerance=None):
+    """the standard normal quantile of every element of p"""
+    coefficients = _coefficients(tolerance)
+    p = np.asarray(p, dtype=float)
+    # written so that NaN fails too, as it does for a single p
+    if not np.all((p >= 0) & (p <= 1)):
+        raise ValueError("probabilities must lie in [0, 1]")
+    q = p - 0.5
+    z = np.empty_like(p)
+
+    central = np.abs(q) <= 0.425
+    q_central = q[central]
+    z[central] = q_central * _rational(coefficients['central'],
+                                       0.180625 - q_central * q_central)
+
+    outer = ~central
+    with np.errstate(divide='ignore'):
+        r = np.sqrt(-np.log(np.minimum(p[outer], 1 - p[outer])))
+    z_outer = np.empty_like(r)
+    intermediate = r <= 5
+    z_outer[intermediate] = _rational(coefficients['intermediate'],
+                                      r[intermediate] - 1.6)
+    tail = ~intermediate & np.isfinite(r)
+    z_outer[tail] = _rational(coefficients['tail'], r[tail] - 5)
+    z_outer[np.isinf(r)] = np.inf
+    z[outer] = np.where(q[outer] < 0, -z_outer, z_outer)
+    return z
 
 
 def bernoulli_trial(p):
@@ -62,3 +167,165 @@ def bernoulli_trial(p):
 
 def binomial(n, p):
     return sum(bernoulli_trial(p) for _ in range(n))
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# exact binomial probabilities, in log space
+#
+# The pmf follows Loader's saddle-point method ("Fast and Accurate
+# Computation of Binomial Probabilities", 2000), which avoids the
+# cancellation of subtracting huge log-factorials. All functions
+# broadcast over numpy arrays of k, n and p.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+_LOG_SQRT_TWO_PI = 0.5 * math.log(2 * math.pi)
+_LOG_FACTORIAL_TABLE_SIZE = 2 ** 16
+_log_factorial_table = None
+
+# stirlerr(n) = log(n!) - log(sqrt(2 pi n) (n / e) ** n), exactly for n <= 15
+_STIRLERR_TABLE = np.array(
+    [0.0] + [math.lgamma(n + 1) - (n + 0.5) * math.log(n) + n -
+             _LOG_SQRT_TWO_PI for n in range(1, 16)])
+
+
+def _scalar_or_array(result):
+    return result[()] if result.ndim == 0 else result
+
+
+def _stirlerr(n):
+    """the error of Stirling's approximation to log(n!)"""
+    n = np.asarray(n, dtype=float)
+    result = np.empty_like(n)
+    small = n <= 15
+    result[small] = _STIRLERR_TABLE[n[small].astype(int)]
+    large = n[~small]
+    nn = large * large
+    result[~small] = (1 / 12. - (1 / 360. - (1 / 1260. - (1 / 1680. -
+                      1 / 1188. / nn) / nn) / nn) / nn) / large
+    return result
+
+
+def _bd0(x, m):
+    """x * log(x / m) + m - x, without cancellation when x is near m"""
+    x, m = np.broadcast_arrays(np.asarray(x, dtype=float),
+                               np.asarray(m, dtype=float))
+    result = x * np.log(x / m) + m - x
+    near = np.abs(x - m) < 0.1 * (x + m)
+    if np.any(near):
+        xn, mn = x[near], m[near]
+        v = (xn - mn) / (xn + mn)
+        total = (xn - mn) * v
+        term = 2 * xn * v
+        for j in range(1, 1000):
+            term = term * v * v
+            previous, total = total, total + term / (2 * j + 1)
+            if np.all(total == previous):
+                break
+        result[near] = total
+    return result
+
+
+def log_factorial(n):
+    """log(n!), from a cached table for small n
+    and from Stirling's series beyond it"""
+    global _log_factorial_table
+    if _log_factorial_table is None:
+        _log_factorial_table = np.array(
+            [math.lgamma(i + 1) for i in range(_LOG_FACTORIAL_TABLE_SIZE)])
+    n = np.asarray(n, dtype=float)
+    if np.any(n < 0):
+        raise ValueError("log_factorial of a negative number")
+    result = np.empty_like(n)
+    small = n < _LOG_FACTORIAL_TABLE_SIZE
+    result[small] = _log_factorial_table[n[small].astype(int)]
+    large = n[~small]
+    result[~small] = ((large + 0.5) * np.log(large) - large +
+                      _LOG_SQRT_TWO_PI + _stirlerr(large))
+    return _scalar_or_array(result)
+
+
+def binomial_log_pmf(k, n, p):
+    """log P(X = k) for X ~ Binomial(n, p)"""
+    k, n, p = np.broadcast_arrays(np.asarray(k, dtype=float),
+                                  np.asarray(n, dtype=float),
+                                  np.asarray(p, dtype=float))
+    q = 1 - p
+    result = np.full(k.shape, -np.inf)
+    possible = (k >= 0) & (k <= n) & (k == np.floor(k))
+
+    certain = possible & (((p == 0) & (k == 0)) | ((p == 1) & (k == n)))
+    result[certain] = 0.0
+    uncertain = possible & (p > 0) & (p < 1)
+
+    none = uncertain & (k == 0)
+    result[none] = n[none] * np.log1p(-p[none])
+    every = uncertain & (k == n) & (k > 0)
+    result[every] = n[every] * np.log(p[every])
+
+    inner = uncertain & (k > 0) & (k < n)
+    ki, ni, pi, qi = k[inner], n[inner], p[inner], q[inner]
+    exponent = (_stirlerr(ni) - _stirlerr(ki) - _stirlerr(ni - ki) -
+                _bd0(ki, ni * pi) - _bd0(ni - ki, ni * qi))
+    result[inner] = exponent - 0.5 * (math.log(2 * math.pi) + np.log(ki) +
+                                      np.log1p(-ki / ni))
+    return _scalar_or_array(result)
+
+
+def binomial_pmf(k, n, p):
+    """P(X = k) for X ~ Binomial(n, p)"""
+    return np.exp(binomial_log_pmf(k, n, p))
+
+
+def _sums_away_from_mode(start, step, n, p):
+    """for each element, the sum of the pmf from start onward in steps
+    of step (+1 or -1), heading away from the mode, where terms shrink;
+    a block of terms at a time, for every element still adding up"""
+    total = np.zeros(len(start))
+    active = np.arange(len(start))
+    # blocks of about 64k terms in all, at first
+    offset, chunk = 0, min(1024, max(64, 2 ** 16 // max(1, len(start))))
+    while len(active):
+        j = np.arange(offset, offset + chunk)
+        # the pmf is 0 past either end of [0, n]
+        terms = binomial_pmf(start[active, None] + step[active, None] * j,
+                             n[active, None], p[active, None])
+        total[active] += terms.sum(axis=1)
+        active = active[terms[:, -1] > total[active] * 1e-17]
+        offset, chunk = offset + chunk, chunk * 2
+    return total
+
+
+def _binomial_tails(k, n, p):
+    """P(X <= k) and P(X > k) for X ~ Binomial(n, p), summing the pmf
+    only on the side of k away from the mode, and only as far as it
+    takes for the remaining terms to vanish"""
+    k, n, p = np.broadcast_arrays(np.floor(np.asarray(k, dtype=float)),
+                                  np.asarray(n, dtype=float),
+                                  np.asarray(p, dtype=float))
+    shape = k.shape
+    k, n, p = k.ravel(), n.ravel(), p.ravel()
+    cdf = np.where(k < 0, 0.0, 1.0)
+    sf = 1 - cdf
+    inner = (k >= 0) & (k < n)
+    k, n, p = k[inner], n[inner], p[inner]
+    lower = k < np.minimum(n, np.floor((n + 1) * p))
+    step = np.where(lower, -1.0, 1.0)
+    tail = _sums_away_from_mode(np.where(lower, k, k + 1), step, n, p)
+    cdf[inner] = np.where(lower, np.minimum(1.0, tail),
+                          np.maximum(0.0, 1 - tail))
+    sf[inner] = np.where(lower, np.maximum(0.0, 1 - tail),
+                         np.minimum(1.0, tail))
+    return (_scalar_or_array(cdf.reshape(shape)),
+            _scalar_or_array(sf.reshape(shape)))
+
+
+def binomial_cdf(k, n, p):
+    """P(X <= k) for X ~ Binomial(n, p)"""
+    return _binomial_tails(k, n, p)[0]
+
+
+def binomial_sf(k, n, p):
+    """P(X > k) for X ~ Binomial(n, p)"""
+    return _binomial_tails(k, n, p)[1]
@@ -1,3 +1,4 @@
+import gradient
 import stats
 
 
@@ -48,3 +49,32 @@ def squared_error_gradient(x_i, y_i, theta):
     alpha, beta = theta
     return [-2 * error(alpha, beta, x_i, y_i),        # alpha partial derivative
             -2 * error(alpha, beta, x_i, y_i) * x_i]  # beta partial derivative
+
+
+def squared_error_batch(x, y, theta):
+    """the total squared error over arrays x and y"""
+    alpha, beta = theta
+    errors = y - (beta * x + alpha)
+    return errors.dot(errors)
+
+
+def squared_error_batch_gradient(x, y, theta):
+    """the sum of squared_error_gradient over arrays x and y"""
+    alpha, beta = theta
+    errors = y - (beta * x + alpha)
+    return [-2 * errors.sum(), -2 * errors.dot(x)]
+
+
+def least_squares_fit_minibatch(x, y, alpha_0=0.01, batch_size=32,
+                                max_epochs=100, seed=None):
+    """alpha and beta by mini-batch gradient descent, for data too big
+    for least_squares_fit's passes over it"""
+    return tuple(gradient.minimize_minibatch(squared_error_batch,
+                                             squared_error_batch_gradient,
+                                             x,
+                                             y,
+                                             [0.0, 0.0],
+                                             alpha_0,
+                                             batch_size=batch_size,
+                                             max_epochs=max_epochs,
+                                             seed=seed))
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""bootstrap confidence intervals and permutation tests, with the
+replicates spread across a pool of processes that share one copy of
+the data"""
+from __future__ import division
+from collections import namedtuple
+from functools import partial
+import multiprocessing
+import time
+import numpy as np
+import distributions
+import probability
+from variates import RandomStream
+
+Replicates = namedtuple('Replicates', ['estimate', 'values', 'seconds'])
+PermutationTest = namedtuple('PermutationTest',
+                             ['statistic', 'p_value', 'values', 'seconds'])
+
+# the data, as seen by whichever process is computing replicates
+_shared = {}
+
+
+def _attach(raw, shape):
+    """pool initializer: view the shared buffer as the data array"""
+    _shared['data'] = np.frombuffer(raw).reshape(shape)
+
+
+def _batches(num_replicates, batch_size):
+    for batch, start in enumerate(range(0, num_replicates, batch_size)):
+        yield batch, min(batch_size, num_replicates - start)
+
+
+def _timed(replicate, count):
+    """values and wall-clock seconds of count calls to replicate()"""
+    values, seconds = [], []
+    for _ in range(count):
+        started = time.time()
+        values.append(replicate())
+        seconds.append(time.time() - started)
+    return values, seconds
+
+
+def _bootstrap_batch(task, statistic, seed):
+    batch, size = task
+    data = _shared['data']
+    stream = RandomStream(seed, batch)
+    return _timed(lambda: statistic(data[stream.choice(len(data),
+                                                       len(data))]), size)
+
+
+def _jackknife_batch(task, statistic):
+    start, stop = task
+    data = _shared['data']
+    everything = np.arange(len(data))
+    left_out = iter(range(start, stop))
+    return _timed(lambda: statistic(data[everything != next(left_out)]),
+                  stop - start)
+
+
+def _permutation_batch(task, statistic, num_x, seed):
+    batch, size = task
+    pooled = _shared['data']
+    stream = RandomStream(seed, batch)
+
+    def replicate():
+        order = stream.permutation(len(pooled))
+        return statistic(pooled[order[:num_x]], pooled[order[num_x:]])
+    return _timed(replicate, size)
+
+
+def _run(data, jobs, workers=None, progress=None):
+    """runs each (function, tasks) job over the data, in a pool whose
+    processes all read the same shared-memory copy of it; returns the
+    values and per-replicate seconds of each job, in task order.
+    progress(done, total), if given, is called as batches finish"""
+    data = np.ascontiguousarray(data, dtype=float)
+    jobs = [(function, list(tasks)) for function, tasks in jobs]
+    total = sum(len(tasks) for _, tasks in jobs)
+
+    pool = None
+    if workers == 1:
+        _shared['data'] = data
+        run = lambda function, tasks: (function(task) for task in tasks)
+    else:
+        raw = multiprocessing.RawArray('d', data.size)
+        np.frombuffer(raw)[:] = data.ravel()
+        pool = multiprocessing.Pool(workers, _attach, (raw, data.shape))
+        run = pool.imap
+
+    done = 0
+    outcomes = []
+    try:
+        for function, tasks in jobs:
+            values, seconds = [], []
+            for batch_values, batch_seconds in run(function, tasks):
+                values.extend(batch_values)
+                seconds.extend(batch_seconds)
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+            outcomes.append((np.array(values), np.array(seconds)))
+    finally:
+        _shared.pop('data', None)
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return outcomes
+
+
+def _seed(seed):
+    return RandomStream().seed_value if seed is None else seed
+
+
+def bootstrap(data, statistic, num_samples=1000, workers=None, seed=None,
+              batch_size=100, progress=None):
+    """statistic of num_samples bootstrap resamples of the rows of
+    data, each drawn as an array of row indexes
+
+    statistic takes an array of rows and returns a number or an array;
+    it must be picklable (a module-level function, or a partial of
+    one). Batch i of replicates always uses stream (seed, i), so a
+    seed gives the same replicates with any number of workers."""
+    data = np.asarray(data, dtype=float)
+    run_batch = partial(_bootstrap_batch, statistic=statistic,
+                        seed=_seed(seed))
+    [(values, seconds)] = _run(data,
+                               [(run_batch, _batches(num_samples,
+                                                     batch_size))],
+                               workers, progress)
+    return Replicates(statistic(data), values, seconds)
+
+
+def jackknife(data, statistic, workers=None, batch_size=100, progress=None):
+    """statistic of data with each row left out in turn"""
+    data = np.asarray(data, dtype=float)
+    run_batch = partial(_jackknife_batch, statistic=statistic)
+    tasks = [(start, min(start + batch_size, len(data)))
+             for start in range(0, len(data), batch_size)]
+    [(values, _)] = _run(data, [(run_batch, tasks)], workers, progress)
+    return values
+
+
+def percentile_interval(values, confidence=0.95):
+    """the central confidence interval of the bootstrap values"""
+    tail = 100 * (1 - confidence) / 2
+    lo, hi = np.percentile(values, [tail, 100 - tail], axis=0)
+    return lo, hi
+
+
+def bca_interval(values, estimate, jackknife_values, confidence=0.95):
+    """the bias-corrected and accelerated interval (Efron, 1987):
+    percentiles of the bootstrap values, shifted for the median bias
+    of the replicates and scaled for the skew of the jackknife"""
+    values = np.asarray(values, dtype=float)
+    shape = values.shape[1:]
+    values = values.reshape(len(values), -1)
+    estimate = np.asarray(estimate, dtype=float).ravel()
+    jackknife_values = np.asarray(jackknife_values, dtype=float).reshape(
+        len(jackknife_values), -1)
+    num_samples = len(values)
+
+    below = ((values < estimate).sum(axis=0) +
+             (values == estimate).sum(axis=0) / 2) / num_samples
+    below = np.clip(below, 1 / (num_samples + 1),
+                    num_samples / (num_samples + 1))
+    bias = probability.inverse_normal_cdf(below)
+
+    deviations = jackknife_values.mean(axis=0) - jackknife_values
+    spread = (deviations ** 2).sum(axis=0) ** 1.5
+    acceleration = np.where(spread > 0, (deviations ** 3).sum(axis=0) /
+                            (6 * np.where(spread > 0, spread, 1)), 0.0)
+
+    tail = (1 - confidence) / 2
+    bounds = []
+    for z in [probability.inverse_normal_cdf(tail),
+              probability.inverse_normal_cdf(1 - tail)]:
+        shifted = bias + z
+        level = distributions.STANDARD_NORMAL.cdf(
+            bias + shifted / (1 - acceleration * shifted))
+        bounds.append(np.array([np.percentile(values[:, j], 100 * level[j])
+                                for j in range(values.shape[1])]))
+    lo, hi = [bound.reshape(shape)[()] for bound in bounds]
+    return lo, hi
+
+
+def confidence_interval(data, statistic, num_samples=1000, confidence=0.95,
+                        method='bca', workers=None, seed=None,
+                        batch_size=100, progress=None):
+    """a bootstrap confidence interval for statistic(data), by the
+    'percentile' or the 'bca' method; returns (lo, hi) and the
+    Replicates, which include the seconds spent on each one"""
+    if method not in ('percentile', 'bca'):
+        raise ValueError("unknown method: {0}".format(method))
+    data = np.asarray(data, dtype=float)
+    jobs = [(partial(_bootstrap_batch, statistic=statistic, seed=_seed(seed)),
+             _batches(num_samples, batch_size))]
+    if method == 'bca':
+        jobs.append((partial(_jackknife_batch, statistic=statistic),
+                     [(start, min(start + batch_size, len(data)))
+                      for start in range(0, len(data), batch_size)]))
+    outcomes = _run(data, jobs, workers, progress)
+    replicates = Replicates(statistic(data), *outcomes[0])
+
+    if method == 'percentile':
+        interval = percentile_interval(replicates.values, confidence)
+    else:
+        interval = bca_interval(replicates.values, replicates.estimate,
+                                outcomes[1][0], confidence)
+    return interval, replicates
+
+
+# whether each permuted value is at least as extreme as the observed one
+_EXTREME = {'two-sided': lambda values, observed:
+            np.abs(values) >= np.abs(observed),
+            'greater': lambda values, observed: values >= observed,
+            'less': lambda values, observed: values <= observed}
+
+
+def difference_of_means(x, y):
+    return x.mean(axis=0) - y.mean(axis=0)
+
+
+def permutation_test(x, y, statistic=difference_of_means,
+                     num_permutations=9999, alternative='two-sided',
+                     workers=None, seed=None, batch_size=100, progress=None):
+    """how often statistic(x, y) is at least as extreme when the rows
+    of x and y are shuffled between them; alternative is 'two-sided',
+    'greater' or 'less'"""
+    if alternative not in _EXTREME:
+        raise ValueError("unknown alternative: {0}".format(alternative))
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    observed = statistic(x, y)
+    run_batch = partial(_permutation_batch, statistic=statistic,
+                        num_x=len(x), seed=_seed(seed))
+    [(values, seconds)] = _run(np.concatenate([x, y]),
+                               [(run_batch, _batches(num_permutations,
+                                                     batch_size))],
+                               workers, progress)
+    extreme = _EXTREME[alternative](values, observed)
+    p_value = (1 + extreme.sum(axis=0)) / (1 + num_permutations)
+    return PermutationTest(observed, p_value, values, seconds)
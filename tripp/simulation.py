@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Monte Carlo estimates from many independent trials,
+run in vectorized batches across a pool of processes"""
+from __future__ import division
+from collections import namedtuple
+from functools import partial
+import math
+import multiprocessing
+from stats import Moments
+from variates import RandomStream
+
+Estimate = namedtuple('Estimate', ['value', 'standard_error', 'trials'])
+
+
+def _run_batch(task, experiment, seed):
+    """the Moments of one batch of trials, drawn from its own stream"""
+    batch, size = task
+    return Moments(experiment(RandomStream(seed, batch), size))
+
+
+def _batches(trials, batch_size):
+    """(batch number, size) for the batches that make up trials"""
+    for batch, start in enumerate(range(0, trials, batch_size)):
+        yield batch, min(batch_size, trials - start)
+
+
+def _estimate(moments):
+    if moments.count < 2:
+        return Estimate(moments.mean, float('inf'), moments.count)
+    return Estimate(moments.mean,
+                    math.sqrt(moments.variance / moments.count),
+                    moments.count)
+
+
+def simulate(experiment, trials, workers=None, batch_size=10000,
+             seed=None, target_error=None, min_trials=None):
+    """the mean outcome of up to trials runs of experiment, with its
+    Monte Carlo standard error
+
+    experiment(stream, size) runs size trials at once and returns an
+    array of their numeric outcomes (1 or 0 to estimate a probability),
+    drawing its randomness from stream, a variates.RandomStream; it
+    must be picklable (e.g. a module-level function or a partial of
+    one). Batch i always uses stream (seed, i), so a given seed gives
+    the same answer with any number of workers. With target_error,
+    batches stop being added once the standard error falls to it, but
+    only after min_trials (by default, two batches) and once the
+    outcomes have varied: until a rare event has been seen at all, its
+    standard error of 0 is no guide."""
+    if seed is None:
+        seed = RandomStream().seed_value
+    if min_trials is None:
+        min_trials = 2 * batch_size
+    run_batch = partial(_run_batch, experiment=experiment, seed=seed)
+    tasks = _batches(trials, batch_size)
+
+    pool = None
+    if workers == 1:
+        results = (run_batch(task) for task in tasks)
+    else:
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap(run_batch, tasks)
+
+    total = Moments()
+    try:
+        for moments in results:
+            total = total.merge(moments)
+            if target_error is not None and total.count >= min_trials and \
+                    total.variance > 0 and \
+                    _estimate(total).standard_error <= target_error:
+                break
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return _estimate(total)
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""vectors and matrices that store only their nonzero entries,
+so that memory and time scale with the number of nonzeros"""
+from collections import Counter
+import numpy as np
+import algebra
+
+
+def _gather(dense, indices):
+    """dense[i] for each i in indices, without converting all of dense"""
+    if algebra.is_array(dense):
+        return np.asarray(dense, dtype=float)[indices]
+    return np.array([dense[i] for i in indices], dtype=float)
+
+
+class SparseVector(object):
+    """a vector of the given dimension whose nonzero entries are
+    values[k] at position indices[k], with indices sorted ascending"""
+    def __init__(self, indices, values, dimension):
+        indices = np.asarray(indices, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        if len(indices) != len(values):
+            raise ValueError("indices and values differ in length")
+        if len(indices) and (indices[0] < 0 or indices[-1] >= dimension or
+                             np.any(np.diff(indices) <= 0)):
+            indices, values = _canonical(indices, values, dimension)
+        self.indices = indices
+        self.values = values
+        self.dimension = dimension
+
+    @classmethod
+    def from_dict(cls, entries, dimension):
+        """a SparseVector from a dict of {index: value}"""
+        return cls(list(entries.keys()), list(entries.values()), dimension)
+
+    @classmethod
+    def from_dense(cls, v):
+        v = np.asarray(v, dtype=float)
+        indices = np.flatnonzero(v)
+        return cls(indices, v[indices], len(v))
+
+    @property
+    def nnz(self):
+        """the number of stored (nonzero) entries"""
+        return len(self.indices)
+
+    def __len__(self):
+        return self.dimension
+
+    def __repr__(self):
+        return "SparseVector({0}, {1}, {2})".format(
+            self.indices.tolist(), self.values.tolist(), self.dimension)
+
+    def __eq__(self, other):
+        return (isinstance(other, SparseVector) and
+                self.dimension == other.dimension and
+                np.array_equal(self.indices, other.indices) and
+                np.array_equal(self.values, other.values))
+
+    def __ne__(self, other):
+        return not self == other
+
+    def to_dense(self):
+        dense = np.zeros(self.dimension)
+        dense[self.indices] = self.values
+        return dense.view(algebra.Vector)
+
+    def _check_dimension(self, other):
+        if len(other) != self.dimension:
+            raise ValueError("dimensions differ: {0} and {1}"
+                             .format(self.dimension, len(other)))
+
+    def dot(self, other):
+        """v_1 * w_1 + ... + v_n * w_n, over the nonzeros only"""
+        self._check_dimension(other)
+        if not isinstance(other, SparseVector):
+            return float(np.dot(self.values, _gather(other, self.indices)))
+        small, large = sorted([self, other], key=lambda v: v.nnz)
+        if small.nnz == 0:
+            return 0.0
+        # look up the shorter index list in the longer one
+        positions = np.searchsorted(large.indices, small.indices)
+        positions[positions == large.nnz] = 0
+        matched = large.indices[positions] == small.indices
+        return float(np.dot(small.values[matched],
+                            large.values[positions[matched]]))
+
+    def scale(self, c):
+        """c * self"""
+        if c == 0:
+            return SparseVector([], [], self.dimension)
+        return SparseVector(self.indices, c * self.values, self.dimension)
+
+    def add(self, other, c=1):
+        """self + c * other: sparse if other is sparse, dense otherwise"""
+        self._check_dimension(other)
+        if not isinstance(other, SparseVector):
+            result = c * np.asarray(other, dtype=float)
+            result[self.indices] += self.values
+            return result.view(algebra.Vector)
+        indices, values = _canonical(
+            np.concatenate([self.indices, other.indices]),
+            np.concatenate([self.values, c * other.values]),
+            self.dimension)
+        return SparseVector(indices, values, self.dimension)
+
+    def squared_distance(self, other):
+        """(v_1 - w_1) ** 2 + ... + (v_n - w_n) ** 2"""
+        if isinstance(other, SparseVector):
+            difference = self.add(other, -1)
+            return float(np.dot(difference.values, difference.values))
+        self._check_dimension(other)
+        # only the positions where self is nonzero differ from |other|^2
+        dense = np.asarray(other, dtype=float)
+        gathered = dense[self.indices]
+        return float(np.dot(dense, dense) - np.dot(gathered, gathered) +
+                     algebra.squared_distance(gathered, self.values))
+
+
+def _canonical(indices, values, dimension):
+    """sorts the entries by index, sums repeated indices
+    and drops entries that are zero"""
+    if len(indices) and (indices.min() < 0 or indices.max() >= dimension):
+        raise IndexError("index out of range for dimension {0}"
+                         .format(dimension))
+    unique, inverse = np.unique(indices, return_inverse=True)
+    summed = np.bincount(inverse, weights=values, minlength=len(unique))
+    nonzero = summed != 0
+    return unique[nonzero], summed[nonzero]
+
+
+class CSRMatrix(object):
+    """a matrix in compressed sparse row form: the nonzeros of row i
+    are data[indptr[i]:indptr[i + 1]], in the columns given by
+    indices[indptr[i]:indptr[i + 1]]"""
+    def __init__(self, indptr, indices, data, num_cols):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=float)
+        self.num_cols = num_cols
+        row_lengths = np.diff(self.indptr)
+        self._row_ids = np.repeat(np.arange(len(row_lengths)), row_lengths)
+
+    @classmethod
+    def from_rows(cls, rows, num_cols=None):
+        """stacks SparseVectors (or dense rows) into a CSRMatrix"""
+        rows = [row if isinstance(row, SparseVector)
+                else SparseVector.from_dense(row)
+                for row in rows]
+        if num_cols is None:
+            num_cols = rows[0].dimension if rows else 0
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([row.nnz for row in rows])
+        if rows:
+            indices = np.concatenate([row.indices for row in rows])
+            data = np.concatenate([row.values for row in rows])
+        else:
+            indices, data = [], []
+        return cls(indptr, indices, data, num_cols)
+
+    @property
+    def shape(self):
+        return len(self.indptr) - 1, self.num_cols
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __getitem__(self, i):
+        """row i, as a SparseVector sharing this matrix's storage"""
+        if not -len(self) <= i < len(self):
+            raise IndexError("row index out of range")
+        i %= len(self)
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        row = SparseVector([], [], self.num_cols)
+        row.indices = self.indices[start:stop]
+        row.values = self.data[start:stop]
+        return row
+
+    def matvec(self, v):
+        """the vector whose ith element is the dot of row i and v"""
+        if isinstance(v, SparseVector):
+            v = v.to_dense()
+        products = self.data * _gather(v, self.indices) if self.nnz else []
+        result = np.bincount(self._row_ids, weights=products,
+                             minlength=len(self))
+        return result.view(algebra.Vector)
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# text features
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+def build_vocabulary(documents):
+    """{word: column} for every word in an iterable of token collections
+    (such as the sets naive_bayes.tokenize returns)"""
+    words = set()
+    for tokens in documents:
+        words.update(tokens)
+    return {word: i for i, word in enumerate(sorted(words))}
+
+
+def count_vector(tokens, vocabulary):
+    """a SparseVector counting each token found in vocabulary"""
+    counts = Counter(vocabulary[token] for token in tokens
+                     if token in vocabulary)
+    return SparseVector.from_dict(counts, len(vocabulary))
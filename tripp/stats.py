@@ -1,36 +1,434 @@
 # -*- coding: utf-8 -*-
 from __future__ import division
 from collections import Counter
+from itertools import islice
 import algebra
 import math
 import logging
+import numpy as np
+from quantile_sketch import KLLSketch
 
 logging.basicConfig(level=logging.INFO, format="%(lineno)d\t%(message)s")
 
 
+# arrays are summarized this many values at a time
+_ARRAY_BLOCK = 2 ** 20
+
+
+class Moments(object):
+    """count, mean and central moments of a stream of numbers,
+    accumulated in a single, numerically stable pass (Welford);
+    partial results from separate chunks combine exactly with merge"""
+    def __init__(self, values=()):
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0  # sum of squared deviations from the mean
+        self._m3 = 0.0  # sum of cubed deviations from the mean
+        self.extend(values)
+
+    def push(self, x):
+        """add a single value"""
+        n_prev = self.count
+        self.count = n = n_prev + 1
+        delta = x - self._mean
+        delta_n = delta / n
+        term = delta * delta_n * n_prev
+        self._mean += delta_n
+        self._m3 += term * delta_n * (n - 2) - 3 * delta_n * self._m2
+        self._m2 += term
+
+    def extend(self, values):
+        """add every value from an iterable (or a numpy array)"""
+        if algebra.is_array(values):
+            # a block at a time, so that temporaries stay small
+            # even for memory-mapped arrays larger than memory
+            values = values.ravel()
+            for start in range(0, len(values), _ARRAY_BLOCK):
+                block = values[start:start + _ARRAY_BLOCK]
+                self._merge_in(Moments.from_array(block))
+            return self
+        n, mean, m2, m3 = self.count, self._mean, self._m2, self._m3
+        for x in values:
+            n_prev = n
+            n += 1
+            delta = x - mean
+            delta_n = delta / n
+            term = delta * delta_n * n_prev
+            mean += delta_n
+            m3 += term * delta_n * (n - 2) - 3 * delta_n * m2
+            m2 += term
+        self.count, self._mean, self._m2, self._m3 = n, mean, m2, m3
+        return self
+
+    @staticmethod
+    def from_array(values):
+        """the moments of an array, computed by numpy"""
+        moments = Moments()
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values):
+            deviations = values - values.mean()
+            squared = deviations * deviations
+            moments.count = len(values)
+            moments._mean = float(values.mean())
+            moments._m2 = float(squared.sum())
+            moments._m3 = float(np.dot(squared, deviations))
+        return moments
+
+    def _merge_in(self, other):
+        """fold other into self (Chan et al.'s pairwise update)"""
+        n_a, n_b = self.count, other.count
+        if n_b == 0:
+            return
+        if n_a == 0:
+            self.count, self._mean = other.count, other._mean
+            self._m2, self._m3 = other._m2, other._m3
+            return
+        n = n_a + n_b
+        delta = other._mean - self._mean
+        self._m3 += (other._m3 +
+                     delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2 +
+                     3 * delta * (n_a * other._m2 - n_b * self._m2) / n)
+        self._m2 += other._m2 + delta ** 2 * n_a * n_b / n
+        self._mean += delta * n_b / n
+        self.count = n
+
+    def merge(self, other):
+        """a new Moments for the values seen by either self or other"""
+        merged = Moments()
+        merged._merge_in(self)
+        merged._merge_in(other)
+        return merged
+
+    @property
+    def mean(self):
+        if self.count == 0:
+            raise ZeroDivisionError("mean of no values")
+        return self._mean
+
+    @property
+    def variance(self):
+        """sample variance; assumes at least 2 values"""
+        return self._m2 / (self.count - 1)
+
+    @property
+    def standard_deviation(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def skew(self):
+        """population skewness g1 = m3 / m2 ** 1.5 (without the
+        small-sample adjustment); 0 for values with no deviation"""
+        if self._m2 == 0:
+            return 0.0
+        return math.sqrt(self.count) * self._m3 / self._m2 ** 1.5
+
+
+class CoMoments(object):
+    """Moments of two paired streams, plus their co-moment,
+    so covariance and correlation also come out of one pass"""
+    def __init__(self, pairs=()):
+        self.x = Moments()
+        self.y = Moments()
+        self._c = 0.0  # sum of products of deviations
+        self.extend(pairs)
+
+    @property
+    def count(self):
+        return self.x.count
+
+    def push(self, x_i, y_i):
+        """add a single (x, y) pair"""
+        self.extend([(x_i, y_i)])
+
+    def extend(self, pairs):
+        """add every (x, y) pair from an iterable"""
+        x, y = self.x, self.y
+        n, mean_x, mean_y = x.count, x._mean, y._mean
+        m2_x, m2_y, m3_x, m3_y, c = x._m2, y._m2, x._m3, y._m3, self._c
+        for x_i, y_i in pairs:
+            n_prev = n
+            n += 1
+            delta_x = x_i - mean_x
+            delta_y = y_i - mean_y
+            delta_x_n = delta_x / n
+            delta_y_n = delta_y / n
+            term_x = delta_x * delta_x_n * n_prev
+            term_y = delta_y * delta_y_n * n_prev
+            mean_x += delta_x_n
+            mean_y += delta_y_n
+            m3_x += term_x * delta_x_n * (n - 2) - 3 * delta_x_n * m2_x
+            m3_y += term_y * delta_y_n * (n - 2) - 3 * delta_y_n * m2_y
+            m2_x += term_x
+            m2_y += term_y
+            c += delta_x * (y_i - mean_y)
+        x.count = y.count = n
+        x._mean, y._mean, x._m2, y._m2 = mean_x, mean_y, m2_x, m2_y
+        x._m3, y._m3, self._c = m3_x, m3_y, c
+        return self
+
+    @staticmethod
+    def from_arrays(x, y):
+        """the co-moments of two numpy arrays, computed by numpy"""
+        co_moments = CoMoments()
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        co_moments.x = Moments.from_array(x)
+        co_moments.y = Moments.from_array(y)
+        if len(x):
+            co_moments._c = float(np.dot(x - x.mean(), y - y.mean()))
+        return co_moments
+
+    def merge(self, other):
+        """a new CoMoments for the pairs seen by either self or other"""
+        merged = CoMoments()
+        n_a, n_b = self.count, other.count
+        merged.x = self.x.merge(other.x)
+        merged.y = self.y.merge(other.y)
+        merged._c = self._c + other._c
+        if n_a and n_b:
+            n = n_a + n_b
+            merged._c += ((other.x._mean - self.x._mean) *
+                          (other.y._mean - self.y._mean) * n_a * n_b / n)
+        return merged
+
+    @property
+    def covariance(self):
+        """sample covariance; assumes at least 2 pairs"""
+        return self._c / (self.count - 1)
+
+    @property
+    def correlation(self):
+        """0 if either variable has no deviation"""
+        if self.x._m2 > 0 and self.y._m2 > 0:
+            return self._c / math.sqrt(self.x._m2 * self.y._m2)
+        else:
+            return 0
+
+
+class CovarianceMatrix(object):
+    """column means and the co-moment matrix of a stream of rows,
+    updated a block of rows at a time: each block is centered once and
+    its co-moments come from one blocked product (upper triangle only),
+    then merged into the running totals with Chan's formula"""
+    def __init__(self, rows=(), block_rows=4096, tile=64):
+        self.count = 0
+        self.means = None
+        self._c = None  # upper triangle of the co-moment matrix
+        self.block_rows = block_rows
+        self.tile = tile
+        self.extend(rows)
+
+    def _upper_comoments(self, centered):
+        """the upper triangle of transpose(centered) * centered"""
+        num_cols = centered.shape[1]
+        result = np.zeros((num_cols, num_cols))
+        starts = range(0, num_cols, self.tile)
+        for i in starts:
+            left = centered[:, i:i + self.tile]
+            for j in starts:
+                if j >= i:
+                    right = centered[:, j:j + self.tile]
+                    result[i:i + self.tile, j:j + self.tile] = \
+                        np.dot(left.T, right)
+        return np.triu(result)
+
+    def _merge_block(self, count, means, comoments):
+        if self.count == 0:
+            self.count, self.means, self._c = count, means, comoments
+            return
+        n = self.count + count
+        delta = means - self.means
+        self._c = (self._c + comoments +
+                   np.triu(np.outer(delta, delta)) * self.count * count / n)
+        self.means = self.means + delta * count / n
+        self.count = n
+
+    def push(self, row):
+        """add a single row"""
+        return self.extend([row])
+
+    def extend(self, rows):
+        """add every row from an iterable of rows (or a 2-d array)"""
+        if algebra.is_array(rows):
+            blocks = (rows[start:start + self.block_rows]
+                      for start in range(0, len(rows), self.block_rows))
+        else:
+            rows = iter(rows)
+            blocks = iter(lambda: list(islice(rows, self.block_rows)), [])
+        for block in blocks:
+            block = np.asarray(block, dtype=float)
+            if len(block):
+                block_means = block.mean(axis=0)
+                self._merge_block(len(block), block_means,
+                                  self._upper_comoments(block - block_means))
+        return self
+
+    def merge(self, other):
+        """a new CovarianceMatrix of the rows seen by self or other"""
+        merged = CovarianceMatrix(block_rows=self.block_rows, tile=self.tile)
+        for part in (self, other):
+            if part.count:
+                merged._merge_block(part.count, part.means, part._c)
+        return merged
+
+    def comoments(self):
+        """the full, symmetric co-moment matrix (0 x 0 with no rows)"""
+        if self._c is None:
+            return np.zeros((0, 0))
+        return self._c + np.triu(self._c, 1).T
+
+    def covariance(self):
+        """the sample covariance matrix; assumes at least 2 rows"""
+        return algebra.Matrix(self.comoments() / (self.count - 1))
+
+    def correlation(self):
+        """the correlation matrix; columns with no deviation
+        have correlation 0 with everything, themselves included"""
+        comoments = self.comoments()
+        deviations = np.sqrt(np.diag(comoments))
+        constant = deviations == 0
+        deviations[constant] = 1
+        result = comoments / np.outer(deviations, deviations)
+        result[constant, :] = 0
+        result[:, constant] = 0
+        np.fill_diagonal(result, np.where(constant, 0.0, 1.0))
+        return algebra.Matrix(result)
+
+
+def covariance_matrix(data):
+    """the num_columns x num_columns matrix whose (i, j)th entry
+    is the covariance of columns i and j of data"""
+    return CovarianceMatrix(data).covariance()
+
+
+def _is_sized(x):
+    return hasattr(x, '__len__')
+
+
+def _co_moments(x, y):
+    if algebra.is_array(x) and algebra.is_array(y):
+        return CoMoments.from_arrays(x, y)
+    return CoMoments(zip(x, y))
+
+
 def mean(x):
-    """mean"""
+    """mean; x may also be an iterator"""
+    if algebra.is_array(x) or not _is_sized(x):
+        return Moments(x).mean
     return sum(x) / len(x)
 
 
-def median(v):
-    """finds the middle-most value of v"""
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# order statistics by selection rather than sorting
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# partitions smaller than this are simply sorted
+_SMALL_PARTITION = 32
+
+
+def _median_of_three(values):
+    a, b, c = values[0], values[len(values) // 2], values[-1]
+    if a < b:
+        return b if b < c else max(a, c)
+    else:
+        return a if a < c else max(b, c)
+
+
+def select_many(x, ranks):
+    """returns {k: the k-th smallest value of x} for each (0-based) k
+    in ranks, partitioning x once for all of them (introselect):
+    expected O(n) work, falling back to sorting a partition
+    that has been split too many times"""
+    ranks = sorted(set(ranks))
+    if not ranks:
+        return {}
+    if ranks[0] < 0 or ranks[-1] >= len(x):
+        raise IndexError("rank out of range")
+    if algebra.is_array(x):
+        partitioned = np.partition(np.asarray(x).ravel(), ranks)
+        return {k: partitioned[k] for k in ranks}
+
+    max_depth = 2 * int(math.log(len(x) + 1, 2)) + 2
+    selected = {}
+    # each pending entry is (values, ranks within values, offset, depth)
+    pending = [(x, ranks, 0, 0)]
+    while pending:
+        values, wanted, offset, depth = pending.pop()
+        if len(values) <= _SMALL_PARTITION or depth > max_depth:
+            sorted_values = sorted(values)
+            for k in wanted:
+                selected[k + offset] = sorted_values[k]
+            continue
+
+        pivot = _median_of_three(values)
+        lows = [v for v in values if v < pivot]
+        highs = [v for v in values if v > pivot]
+        num_lows = len(lows)
+        num_below_highs = len(values) - len(highs)
+
+        low_ranks = [k for k in wanted if k < num_lows]
+        high_ranks = [k - num_below_highs for k in wanted
+                      if k >= num_below_highs]
+        for k in wanted:
+            if num_lows <= k < num_below_highs:
+                selected[k + offset] = pivot
+        if low_ranks:
+            pending.append((lows, low_ranks, offset, depth + 1))
+        if high_ranks:
+            pending.append((highs, high_ranks,
+                            offset + num_below_highs, depth + 1))
+    return selected
+
+
+def select(x, k):
+    """the k-th smallest (0-based) value of x, in expected linear time"""
+    return select_many(x, [k])[k]
+
+
+def _sketch_of(x):
+    """x itself if it is already a sketch, otherwise a sketch of x"""
+    return x if isinstance(x, KLLSketch) else KLLSketch(x)
+
+
+def median(v, approximate=False):
+    """finds the middle-most value of v;
+    with approximate, v may be any iterable (or a KLLSketch)
+    and the answer comes from a bounded-memory sketch"""
+    if approximate:
+        return _sketch_of(v).quantile(0.5)
     n = len(v)
-    sorted_v = sorted(v)
     midpoint = n // 2
 
     if n % 2 == 1:
-        return sorted_v[midpoint]
+        return select(v, midpoint)
     else:
         lo = midpoint - 1
         hi = midpoint
-        return (sorted_v[lo] + sorted_v[hi]) / 2
+        selected = select_many(v, [lo, hi])
+        return (selected[lo] + selected[hi]) / 2
+
+
+def _quantile_rank(x, p):
+    return int(p * len(x))
 
 
-def quantile(x, p):
+def quantile(x, p, approximate=False):
     """returns the p-th percentile value in x"""
-    p_index = int(p * len(x))
-    return sorted(x)[p_index]
+    if approximate:
+        return _sketch_of(x).quantile(p)
+    return select(x, _quantile_rank(x, p))
+
+
+def quantiles(x, ps, approximate=False):
+    """returns the list of p-th percentile values in x for each p in ps,
+    using a single partial sort"""
+    if approximate:
+        return _sketch_of(x).quantiles(ps)
+    ranks = [_quantile_rank(x, p) for p in ps]
+    selected = select_many(x, ranks)
+    return [selected[k] for k in ranks]
 
 
 def mode(x):
@@ -48,7 +446,9 @@ def data_range(elements):
 
 
 def variance(elements):
-    """assumes x has at least 2 elements"""
+    """assumes x has at least 2 elements; x may also be an iterator"""
+    if algebra.is_array(elements) or not _is_sized(elements):
+        return Moments(elements).variance
     n = len(elements)
     deviations = de_mean(elements)
     return algebra.sum_of_squares(deviations) / (n - 1)
@@ -58,10 +458,11 @@ def standard_deviation(x):
     return math.sqrt(variance(x))
 
 
-def interquartile_range(elements):
+def interquartile_range(elements, approximate=False):
     """the difference between
     the 75th percentile and 25th percentile"""
-    return quantile(elements, 0.75) - quantile(elements, 0.25)
+    first, third = quantiles(elements, [0.25, 0.75], approximate)
+    return third - first
 
 
 def de_mean(x):
@@ -73,15 +474,9 @@ def de_mean(x):
 
 def covariance(x, y):
     """how variables vary in tandem from their means"""
-    n = len(x)
-    return algebra.dot(de_mean(x), de_mean(y)) / (n - 1)
+    return _co_moments(x, y).covariance
 
 
 def correlation(x, y):
     """divide the standard deviation of both variables"""
-    stdev_x = standard_deviation(x)
-    stdev_y = standard_deviation(y)
-    if stdev_x > 0 and stdev_y > 0:
-        return covariance(x, y) / stdev_x / stdev_y
-    else:
-        return 0
+    return _co_moments(x, y).correlation
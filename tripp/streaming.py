@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""training rows streamed from disk in chunks, so that fitting never
+holds more than a chunk, a shuffle buffer and a few chunks of
+read-ahead in memory"""
+from itertools import islice
+import Queue
+import sys
+import threading
+import numpy as np
+from variates import RandomStream
+
+DEFAULT_CHUNK_ROWS = 4096
+DEFAULT_BUFFER_SIZE = 10000
+
+_DONE = object()
+
+
+def csv_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS, delimiter=',',
+               skip_header=False):
+    """the numeric rows of a delimited text file, as 2-d arrays of
+    up to chunk_rows rows each"""
+    with open(path) as f:
+        if skip_header:
+            next(f, None)
+        while True:
+            lines = list(islice(f, chunk_rows))
+            if not lines:
+                return
+            yield np.loadtxt(lines, delimiter=delimiter, ndmin=2)
+
+
+def store_chunks(store, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """the rows of a columnar.ColumnStore, as 2-d arrays"""
+    for start in range(0, len(store), chunk_rows):
+        yield store.rows(start, min(start + chunk_rows, len(store)))
+
+
+def read_ahead(iterable, depth=2):
+    """the items of iterable, produced on a background thread that
+    keeps up to depth of them ready"""
+    if not depth:
+        for item in iterable:
+            yield item
+        return
+
+    queue = Queue.Queue(depth)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                queue.put((None, item))
+                if stop.is_set():
+                    return
+            queue.put((None, _DONE))
+        except Exception:
+            queue.put((sys.exc_info(), None))
+
+    thread = threading.Thread(target=produce)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            error, item = queue.get()
+            if error is not None:
+                raise error[0], error[1], error[2]
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        # once stopped, the reader puts at most one more item, and
+        # emptying the queue makes room for it
+        stop.set()
+        while True:
+            try:
+                queue.get_nowait()
+            except Queue.Empty:
+                break
+
+
+def shuffle_buffer(items, buffer_size, stream):
+    """items in a random order, drawn from a buffer of buffer_size
+    of them; a full shuffle when buffer_size covers every item"""
+    buffer = list(islice(items, buffer_size))
+    indexes = iter(())
+    for item in items:
+        try:
+            i = next(indexes)
+        except StopIteration:
+            # draw the random indexes a buffer's worth at a time
+            indexes = iter(stream.choice(len(buffer), len(buffer)).tolist())
+            i = next(indexes)
+        yield buffer[i]
+        buffer[i] = item
+    for i in stream.permutation(len(buffer)).tolist():
+        yield buffer[i]
+
+
+class Source(object):
+    """a re-readable stream of (x_i, y_i) training rows
+
+    chunks() returns a fresh iterator of 2-d arrays each time it is
+    called (see csv_chunks and store_chunks). x_i is a list of the
+    x_columns (every column but y_column by default), preceded by a 1
+    if intercept; y_i is the y_column, or None without one. Iterating
+    a Source reads the rows in order; shuffled() reads them in a fresh
+    buffered shuffle for each epoch. Chunks are read on a background
+    thread, read_ahead of them in advance."""
+
+    def __init__(self, chunks, x_columns=None, y_column=None,
+                 intercept=False, buffer_size=DEFAULT_BUFFER_SIZE,
+                 seed=None, read_ahead=2):
+        self.chunks = chunks
+        self.x_columns = x_columns
+        self.y_column = y_column
+        self.intercept = intercept
+        self.buffer_size = buffer_size
+        self.seed = RandomStream().seed_value if seed is None else seed
+        self.read_ahead = read_ahead
+        self.epochs = 0
+
+    @classmethod
+    def from_csv(cls, path, chunk_rows=DEFAULT_CHUNK_ROWS, delimiter=',',
+                 skip_header=False, **kwargs):
+        return cls(lambda: csv_chunks(path, chunk_rows, delimiter,
+                                      skip_header), **kwargs)
+
+    @classmethod
+    def from_store(cls, store, chunk_rows=DEFAULT_CHUNK_ROWS, **kwargs):
+        return cls(lambda: store_chunks(store, chunk_rows), **kwargs)
+
+    def _split(self, chunk):
+        if self.x_columns is not None:
+            x = chunk[:, self.x_columns]
+        elif self.y_column is not None:
+            x = np.delete(chunk, self.y_column, axis=1)
+        else:
+            x = chunk
+        if self.intercept:
+            x = np.column_stack([np.ones(len(x)), x])
+        if self.y_column is None:
+            return x.tolist(), [None] * len(x)
+        return x.tolist(), chunk[:, self.y_column].tolist()
+
+    def __iter__(self):
+        for chunk in read_ahead(self.chunks(), self.read_ahead):
+            x, y = self._split(chunk)
+            for row in zip(x, y):
+                yield row
+
+    def shuffled(self, epoch=None):
+        """one pass over the rows in a buffered shuffle; each epoch
+        (by default, the next one) has its own order"""
+        if epoch is None:
+            epoch, self.epochs = self.epochs, self.epochs + 1
+        return shuffle_buffer(iter(self), self.buffer_size,
+                              RandomStream(self.seed, epoch))
+
+    def passes(self, num_epochs):
+        """the rows of num_epochs shuffled passes, one after another"""
+        for epoch in range(num_epochs):
+            for row in self.shuffled(epoch):
+                yield row
+
+    def first(self):
+        """the first (x_i, y_i) row"""
+        for row in self:
+            return row
+        raise ValueError("no rows to read")
+
+
+def is_source(data):
+    return hasattr(data, 'shuffled')
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""what the minimizers of gradient did, iteration by iteration
+
+Pass callback=Trace() (or any function of an Iteration) to a
+minimizer and it is called once per iteration, or per epoch for the
+stochastic minimizers. A callback with a stopped(reason) method is
+also told why the minimizer stopped. Without a callback nothing is
+timed or recorded."""
+from collections import namedtuple
+import csv
+import json
+
+Iteration = namedtuple('Iteration', ['iteration', 'value', 'step_size',
+                                     'gradient_norm', 'function_evaluations',
+                                     'gradient_evaluations', 'seconds'])
+
+# why a minimizer stopped
+CONVERGED = 'converged'
+MAX_ITERATIONS = 'max_iterations'
+NO_IMPROVEMENT = 'no_improvement'
+
+
+def notify_stopped(callback, reason):
+    stopped = getattr(callback, 'stopped', None)
+    if stopped is not None:
+        stopped(reason)
+
+
+class Trace(object):
+    """a callback that keeps every Iteration, and the stop reason
+
+    value is the loss reached by the iteration (for minimize_minibatch,
+    the total loss after the epoch; for minimize_stochastic, the total
+    loss at the start of the pass, which it computes anyway); step_size
+    is the multiple of the search direction taken, or the learning
+    rate; gradient_norm is the length of the gradient it started from
+    (summed over the epoch for the stochastic minimizers); the
+    evaluation counts are running totals; seconds is the wall time
+    the iteration took."""
+
+    def __init__(self):
+        self.iterations = []
+        self.stop_reason = None
+
+    def __call__(self, iteration):
+        self.iterations.append(iteration)
+
+    def stopped(self, reason):
+        self.stop_reason = reason
+
+    def __len__(self):
+        return len(self.iterations)
+
+    @property
+    def seconds(self):
+        """the wall time of all the iterations"""
+        return sum(iteration.seconds for iteration in self.iterations)
+
+    def values(self):
+        return [iteration.value for iteration in self.iterations]
+
+    def as_dict(self):
+        return {'stop_reason': self.stop_reason,
+                'seconds': self.seconds,
+                'iterations': [dict(zip(Iteration._fields, iteration))
+                               for iteration in self.iterations]}
+
+    def write_json(self, f):
+        json.dump(self.as_dict(), f)
+
+    def write_csv(self, f):
+        """one row per iteration, after a header of the field names"""
+        writer = csv.writer(f)
+        writer.writerow(Iteration._fields)
+        writer.writerows(self.iterations)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""bulk, seedable random draws
+
+Each RandomStream draws whole arrays at a time from its own
+Mersenne Twister state. Streams are identified by (seed, stream):
+the same pair always produces the same draws, and different stream
+numbers under one seed are independent, so worker i of a pool can
+use RandomStream(seed, i) and results are reproducible no matter
+which process (or how many) ran each stream.
+
+The module-level functions draw from a shared default stream, the
+way the functions of the random module do."""
+import os
+import struct
+import numpy as np
+
+
+def _entropy():
+    """a fresh 32-bit seed from the operating system"""
+    return struct.unpack('<I', os.urandom(4))[0]
+
+
+class RandomStream(object):
+    """an independent, reproducible source of random arrays"""
+    def __init__(self, seed=None, stream=0):
+        self.seed(seed, stream)
+
+    def seed(self, seed=None, stream=0):
+        """(re)start the stream identified by (seed, stream);
+        seed is an integer below 2 ** 32 (or a tuple of them)"""
+        self.seed_value = _entropy() if seed is None else seed
+        self.stream = stream
+        # seeding from the whole key (init_by_array) gives every
+        # stream number its own, thoroughly mixed generator state
+        self._state = np.random.RandomState(self.key)
+
+    @property
+    def key(self):
+        """the integers that identify this stream"""
+        seed = self.seed_value
+        return (list(seed) if isinstance(seed, tuple) else [seed]) + \
+            [self.stream]
+
+    def spawn(self, n):
+        """n further streams, independent of this one and of each other"""
+        return [RandomStream(tuple(self.key), i) for i in range(n)]
+
+    def uniform(self, low=0.0, high=1.0, size=None):
+        return self._state.uniform(low, high, size)
+
+    def bernoulli(self, p, size=None):
+        """1 with probability p, 0 otherwise"""
+        heads = self._state.random_sample(size) < p
+        if size is None:
+            return int(heads)
+        return heads.astype(np.int64)
+
+    def binomial(self, n, p, size=None):
+        """the number of successes in n Bernoulli(p) trials; numpy
+        uses BTPE (Kachitvichyanukul & Schmeiser) when n * p >= 30
+        and inversion otherwise, so each draw costs O(1), not O(n)"""
+        return self._state.binomial(n, p, size)
+
+    def normal(self, mu=0.0, sigma=1.0, size=None):
+        return self._state.normal(mu, sigma, size)
+
+    def beta(self, alpha, beta, size=None):
+        return self._state.beta(alpha, beta, size)
+
+    def choice(self, n, size=None):
+        """indexes drawn uniformly, with replacement, from range(n)"""
+        return self._state.randint(0, n, size)
+
+    def permutation(self, n):
+        return self._state.permutation(n)
+
+
+_default = RandomStream()
+seed = _default.seed
+uniform = _default.uniform
+bernoulli = _default.bernoulli
+binomial = _default.binomial
+normal = _default.normal
+beta = _default.beta